@@ -7,7 +7,7 @@ Script: pyt_files_append_folder_name.py
 Purpose: Rename files by appending the containing folder name before each file extension.
 When to use: Use when exported files should carry their folder or shoot name in the filename.
 Changes: Renames regular files directly inside the selected folder.
-Inputs: Folder path; optional --dry-run, --yes, and --include-hidden.
+Inputs: Folder path; optional --dry-run, --yes, --include-hidden, and --jobs.
 Environment variables: None.
 Dependencies: Python standard library only.
 Safety notes: Requires confirmation unless --yes is passed; skips symlinks and existing targets.
@@ -23,6 +23,7 @@ import logging
 from dataclasses import dataclass
 from pathlib import Path
 
+from pytransformer.core.batch import DEFAULT_JOBS, BatchRunner, add_jobs_argument
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -31,6 +32,7 @@ from pytransformer.core.common import (
     fail,
     is_hidden_path,
     require_existing_folder,
+    require_positive_int,
     sorted_directory_items,
 )
 
@@ -47,6 +49,7 @@ class RenameSummary:
     planned: int = 0
     skipped: int = 0
     failed: int = 0
+    cancelled: int = 0
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -61,6 +64,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--dry-run", action="store_true", help="Show planned renames without changing files.")
     parser.add_argument("--yes", action="store_true", help="Skip the interactive confirmation prompt.")
     parser.add_argument("--include-hidden", action="store_true", help="Include hidden dotfiles.")
+    add_jobs_argument(parser, help_text=f"Number of renames to run at once (default {DEFAULT_JOBS}).")
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
 
@@ -102,24 +106,37 @@ def build_rename_plan(folder: Path, *, include_hidden: bool) -> tuple[list[Renam
     return plans, skipped
 
 
-def apply_rename_plan(plans: list[RenamePlan], *, dry_run: bool) -> RenameSummary:
+def rename_file(plan: RenamePlan) -> bool:
+    """Rename one planned file, returning False when the target appeared after planning."""
+    if plan.target.exists():
+        return False
+    plan.source.rename(plan.target)
+    return True
+
+
+def apply_rename_plan(plans: list[RenamePlan], *, dry_run: bool, jobs: int = DEFAULT_JOBS) -> RenameSummary:
     summary = RenameSummary(planned=len(plans))
-    for plan in plans:
-        if dry_run:
+    if dry_run:
+        for plan in plans:
             logging.info("Would rename: %s -> %s", plan.source.name, plan.target.name)
-            continue
+        return summary
 
-        try:
-            if plan.target.exists():
-                summary.skipped += 1
-                logging.warning("Skipping %s because target now exists: %s", plan.source.name, plan.target.name)
-                continue
-            plan.source.rename(plan.target)
+    runner = BatchRunner(jobs=jobs, backend="thread")
+    for result in runner.run(rename_file, plans):
+        plan = result.item
+        if result.error is not None:
+            summary.failed += 1
+            logging.error("Failed to rename %s: %s", plan.source.name, result.error)
+        elif not result.value:
+            summary.skipped += 1
+            logging.warning("Skipping %s because target now exists: %s", plan.source.name, plan.target.name)
+        else:
             summary.renamed += 1
             logging.info("Renamed: %s -> %s", plan.source.name, plan.target.name)
-        except OSError as exc:
-            summary.failed += 1
-            logging.error("Failed to rename %s: %s", plan.source.name, exc)
+
+    if runner.interrupted:
+        summary.cancelled = runner.cancelled
+        logging.warning("Interrupted. Cancelled: %d", summary.cancelled)
     return summary
 
 
@@ -129,6 +146,7 @@ def main() -> int:
     configure_logging(quiet=args.quiet)
 
     try:
+        require_positive_int(args.jobs, label="Jobs")
         folder = require_existing_folder(args.folder, label="Input folder")
         plans, skipped = build_rename_plan(folder, include_hidden=args.include_hidden)
 
@@ -145,8 +163,8 @@ def main() -> int:
                 yes=args.yes,
             )
 
-        summary = apply_rename_plan(plans, dry_run=args.dry_run)
-        summary.skipped = skipped
+        summary = apply_rename_plan(plans, dry_run=args.dry_run, jobs=args.jobs)
+        summary.skipped += skipped
     except ScriptError as exc:
         return fail(str(exc), code=2)
 
@@ -159,6 +177,8 @@ def main() -> int:
             summary.skipped,
             summary.failed,
         )
+    if summary.cancelled:
+        return 130
     return 1 if summary.failed else 0
 
 
@@ -7,11 +7,11 @@ Script: pyt_image_to_webp.py
 Purpose: Convert one or more JPEG, PNG, or TIFF images to sibling WebP files.
 When to use: Use when source images should be prepared as WebP files for web publishing.
 Changes: Writes WebP files next to each original image using the same filename stem.
-Inputs: One or more JPEG, PNG, or TIFF image paths; optional WebP quality.
+Inputs: One or more JPEG, PNG, or TIFF image paths; optional WebP quality and --jobs.
 Environment variables: None.
 Dependencies: pillow.
 Safety notes: Validates images, applies EXIF orientation, preserves available ICC/resolution metadata,
-and avoids overwrites by default.
+and avoids overwrites by default; a failed image is reported without stopping the others.
 Example: pyt-image-to-webp --quality 98 image.jpg image.tif
 Expected result: Files named image.webp next to each source image.
 Related scripts: pyt_image_split.py, pyt_image_collage_slice.py, pyt_jpeg_strip_metadata.py.
@@ -20,10 +20,12 @@ Related scripts: pyt_image_split.py, pyt_image_collage_slice.py, pyt_jpeg_strip_
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 from pathlib import Path
 from typing import Any, Sequence
 
+from pytransformer.core.batch import BatchRunner, BatchSummary, add_jobs_argument
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -75,6 +77,7 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Replace existing WebP files.",
     )
+    add_jobs_argument(parser)
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -179,16 +182,25 @@ def run(args: argparse.Namespace) -> int:
     configure_logging(quiet=args.quiet, debug=args.debug)
     require_int_range(args.quality, label="WebP quality", minimum=1, maximum=100)
 
-    written_paths: list[Path] = []
-    for image_path in args.images:
-        output_path = process_image(image_path, overwrite=args.overwrite, quality=args.quality)
-        written_paths.append(output_path)
+    summary = BatchSummary()
+    runner = BatchRunner(jobs=args.jobs, backend="thread")
+    worker = functools.partial(process_image, overwrite=args.overwrite, quality=args.quality)
+    for result in runner.run(worker, args.images):
+        image_path = result.item
+        output_path = result.value
+        if output_path is None:
+            summary.failed += 1
+            logging.error("Failed to convert %s: %s", image_path, result.error)
+            continue
+        summary.written += 1
         logging.info("Converted %s to %s.", image_path, output_path)
-
-    for output_path in written_paths:
         print(output_path)
 
-    return 0
+    if runner.interrupted:
+        summary.cancelled = runner.cancelled
+        logging.warning("Interrupted. Cancelled: %d", summary.cancelled)
+        return 130
+    return 1 if summary.failed else 0
 
 
 def main(argv: Sequence[str] | None = None) -> int:
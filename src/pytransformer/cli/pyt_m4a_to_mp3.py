@@ -7,7 +7,8 @@ Script: pyt_m4a_to_mp3.py
 Purpose: Convert one or more M4A audio files into sibling MP3 files.
 When to use: Use when M4A recordings need to be shared or processed as MP3 files.
 Changes: Writes one MP3 file beside each original M4A through temporary output files.
-Inputs: One or more non-empty M4A file paths; optional --overwrite, --quality, --bitrate, --quiet, and --debug.
+Inputs: One or more non-empty M4A file paths; optional --overwrite, --quality, --bitrate, --jobs, --quiet, and
+--debug.
 Environment variables: None.
 Dependencies: FFmpeg available on PATH.
 Safety notes: Refuses to overwrite existing MP3 files unless --overwrite is passed; failed files do not stop
@@ -24,10 +25,10 @@ import logging
 import re
 import shutil
 import subprocess
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Sequence
 
+from pytransformer.core.batch import DEFAULT_JOBS, BatchRunner, BatchSummary, add_jobs_argument
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -50,14 +51,6 @@ SUPPORTED_BITRATES_KBPS = (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160,
 MAX_FFMPEG_ERROR_LENGTH = 2000
 
 
-@dataclass
-class ConversionSummary:
-    """Track successful and failed input conversions."""
-
-    converted: int = 0
-    failed: int = 0
-
-
 def build_parser() -> argparse.ArgumentParser:
     """Build the command-line parser."""
     parser = build_command_parser(
@@ -92,6 +85,7 @@ def build_parser() -> argparse.ArgumentParser:
         help="One or more M4A files to convert.",
     )
     parser.add_argument("--overwrite", action="store_true", help="Replace an existing sibling MP3 file.")
+    add_jobs_argument(parser, help_text=f"Number of FFmpeg conversions to run at once (default {DEFAULT_JOBS}).")
     parser.add_argument("--quiet", action="store_true", help="Only show warnings and errors.")
     parser.add_argument("--debug", action="store_true", help="Show debug logging.")
     return parser
@@ -245,28 +239,38 @@ def run(args: argparse.Namespace) -> int:
     args.bitrate = normalize_bitrate(args.bitrate) if args.bitrate is not None else None
     conversion_paths = validate_args(args)
     ffmpeg_path = require_ffmpeg()
-    summary = ConversionSummary()
+    summary = BatchSummary()
 
-    for m4a_path, output_path in conversion_paths:
+    def convert(paths: tuple[Path, Path]) -> Path:
+        m4a_path, output_path = paths
         logging.info("Converting %s to %s.", m4a_path, output_path)
-        try:
-            convert_m4a_to_mp3(
-                m4a_path,
-                output_path,
-                quality=args.quality,
-                bitrate=args.bitrate,
-                ffmpeg_path=ffmpeg_path,
-            )
-        except ScriptError as exc:
+        convert_m4a_to_mp3(
+            m4a_path,
+            output_path,
+            quality=args.quality,
+            bitrate=args.bitrate,
+            ffmpeg_path=ffmpeg_path,
+        )
+        return output_path
+
+    runner = BatchRunner(jobs=args.jobs, backend="thread")
+    for result in runner.run(convert, conversion_paths):
+        m4a_path, output_path = result.item
+        if result.error is not None:
             summary.failed += 1
-            logging.error("Failed to convert %s: %s", m4a_path, exc)
+            logging.error("Failed to convert %s: %s", m4a_path, result.error)
             continue
 
-        summary.converted += 1
+        summary.written += 1
         logging.info("MP3 saved: %s", output_path)
         print(output_path)
 
-    logging.info("Done. Converted: %d | Failed: %d", summary.converted, summary.failed)
+    if runner.interrupted:
+        summary.cancelled = runner.cancelled
+        logging.warning("Interrupted. Cancelled: %d", summary.cancelled)
+    logging.info("Done. Converted: %d | Failed: %d", summary.written, summary.failed)
+    if summary.cancelled:
+        return 130
     return 1 if summary.failed else 0
 
 
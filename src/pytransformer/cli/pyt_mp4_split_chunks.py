@@ -7,9 +7,11 @@ Script: pyt_mp4_split_chunks.py
 Purpose: Split one MP4 file into fixed-length MP4 chunks.
 When to use: Use when a long video needs smaller files for upload, review, or downstream processing.
 Changes: Creates a sibling output folder and writes chunk files into it.
-Inputs: MP4 file path; optional --seconds, --output-folder, and --overwrite.
+Inputs: MP4 file path; optional --seconds, --output-folder, --stream-copy, --jobs, --threads, --snap, --snap-window,
+--silence-threshold, --scene-threshold, and --overwrite.
 Environment variables: None.
-Dependencies: moviepy and its FFmpeg runtime.
+Dependencies: moviepy and its FFmpeg runtime; only FFmpeg and ffprobe on PATH with --stream-copy or --jobs above 1.
+--snap also needs FFmpeg on PATH.
 Safety notes: Existing chunk files are skipped unless --overwrite is passed.
 Example: pyt-mp4-split-chunks --seconds 30 "/path/to/video.mp4"
 Expected result: Numbered MP4 chunk files in <video>_chunks or the requested output folder.
@@ -19,13 +21,25 @@ Related scripts: pyt_mp4_transcribe.py, pyt_mp4_transcribe_batch.py.
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib
 import logging
 import math
+import os
+import shutil
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
+from typing import Any, Sequence
+
+from pytransformer.core.batch import BatchRunner, add_jobs_argument
+from pytransformer.core.boundaries import (
+    SnapSettings,
+    add_snap_arguments,
+    find_cut_candidates,
+    plan_chunk_ranges,
+    snap_settings_from_args,
+)
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -36,6 +50,7 @@ from pytransformer.core.common import (
     resolve_user_path,
     temporary_output_path,
 )
+from pytransformer.core.ffmpeg import FFMPEG_QUIET_ARGS, probe_duration, require_ffmpeg, run_ffmpeg
 
 VideoFileClip: Any | None
 MOVIEPY_IMPORT_ERROR: ImportError | None
@@ -58,6 +73,8 @@ else:
 
 MP4_EXTENSIONS = {".mp4"}
 DEFAULT_CHUNK_SECONDS = 30
+# Name pattern for the segment muxer's staging files; chunks are renamed once the number of segments is known.
+SEGMENT_PATTERN = "segment_%06d.mp4"
 
 
 @dataclass
@@ -67,12 +84,25 @@ class ChunkSummary:
     failed: int = 0
 
 
+@dataclass(frozen=True)
+class ChunkRange:
+    """One chunk to encode: its 1-based number, its start and end in seconds, and its output file."""
+
+    number: int
+    start: float
+    end: float
+    path: Path
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = build_command_parser(
         description="Split one MP4 file into fixed-length chunks.",
         examples=(
             'pyt-mp4-split-chunks --seconds 30 "/path/to/video.mp4"',
             'pyt-mp4-split-chunks --seconds 120 --output-folder "/path/to/chunks" "/path/to/video.mp4"',
+            'pyt-mp4-split-chunks --stream-copy --seconds 600 "/path/to/long-video.mp4"',
+            'pyt-mp4-split-chunks --jobs 4 --threads 2 --seconds 60 "/path/to/long-video.mp4"',
+            'pyt-mp4-split-chunks --snap silence --snap-window 10 --seconds 300 "/path/to/lecture.mp4"',
         ),
     )
     parser.add_argument("mp4_file", type=Path, help="Path to the MP4 file to split.")
@@ -89,6 +119,24 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Destination folder. Defaults to a sibling folder named <video>_chunks.",
     )
+    parser.add_argument(
+        "--stream-copy",
+        action="store_true",
+        help="Copy the audio and video streams into the chunks without re-encoding, using FFmpeg's segment muxer. "
+        "Much faster and lossless, but each cut moves to the next keyframe, so chunk lengths vary.",
+    )
+    add_jobs_argument(
+        parser,
+        help_text="Re-encode this many chunks at once, each in its own FFmpeg process that seeks straight to its "
+        "start (default 1, which encodes through moviepy).",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Encoder threads for each chunk. With --jobs above 1, defaults to the CPU count divided by --jobs so "
+        "the workers do not oversubscribe the cores.",
+    )
+    add_snap_arguments(parser)
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing chunk files.")
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
@@ -119,7 +167,40 @@ def validate_args(args: argparse.Namespace) -> tuple[Path, Path]:
     return video_path, output_folder
 
 
-def split_video(video_path: Path, output_folder: Path, *, chunk_seconds: int, overwrite: bool) -> ChunkSummary:
+def plan_chunks(
+    video_path: Path,
+    duration: float,
+    chunk_seconds: int,
+    snap: SnapSettings | None,
+    *,
+    ffmpeg_path: str | None = None,
+) -> list[tuple[float, float]]:
+    """Return the start and end of every chunk, with cuts moved to nearby silences or scene changes when snapping."""
+    if snap is None:
+        return plan_chunk_ranges(duration, chunk_seconds)
+    logging.info("Looking for %s cut points within %g seconds of each cut", snap.mode, snap.window)
+    candidates = find_cut_candidates(video_path, snap, ffmpeg_path=ffmpeg_path or require_ffmpeg())
+    logging.info("Found %d %s cut points", len(candidates), snap.mode)
+    return plan_chunk_ranges(duration, chunk_seconds, candidates, snap.window)
+
+
+def chunk_path_for(video_path: Path, output_folder: Path, chunk_number: int, digits: int) -> Path:
+    return output_folder / f"{video_path.stem}_chunk_{chunk_number:0{digits}d}.mp4"
+
+
+def default_encoder_threads(jobs: int) -> int:
+    return max(1, (os.cpu_count() or 1) // jobs)
+
+
+def split_video(
+    video_path: Path,
+    output_folder: Path,
+    *,
+    chunk_seconds: int,
+    overwrite: bool,
+    threads: int | None = None,
+    snap: SnapSettings | None = None,
+) -> ChunkSummary:
     video_clip_cls = VideoFileClip
     if video_clip_cls is None:
         raise ScriptError("moviepy is required. Install it with: pip install moviepy")
@@ -133,7 +214,8 @@ def split_video(video_path: Path, output_folder: Path, *, chunk_seconds: int, ov
         if not math.isfinite(duration) or duration <= 0:
             raise ScriptError(f"Could not determine a positive duration for: {video_path}")
 
-        total_chunks = int(duration // chunk_seconds) + int(duration % chunk_seconds > 0)
+        ranges = plan_chunks(video_path, duration, chunk_seconds, snap)
+        total_chunks = len(ranges)
         digits = len(str(total_chunks))
         logging.info("Video: %s", video_path)
         logging.info("Output folder: %s", output_folder)
@@ -144,11 +226,9 @@ def split_video(video_path: Path, output_folder: Path, *, chunk_seconds: int, ov
             total_chunks,
         )
 
-        for index in range(total_chunks):
+        for index, (start_time, end_time) in enumerate(ranges):
             chunk_number = index + 1
-            start_time = index * chunk_seconds
-            end_time = min((index + 1) * chunk_seconds, duration)
-            chunk_path = output_folder / f"{video_path.stem}_chunk_{chunk_number:0{digits}d}.mp4"
+            chunk_path = chunk_path_for(video_path, output_folder, chunk_number, digits)
 
             if chunk_path.exists() and not overwrite:
                 logging.warning("Skipping existing chunk: %s", chunk_path.name)
@@ -166,6 +246,7 @@ def split_video(video_path: Path, output_folder: Path, *, chunk_seconds: int, ov
                         str(temporary_path),
                         codec="libx264",
                         audio_codec="aac",
+                        threads=threads,
                         logger=None,
                     )
                 summary.saved += 1
@@ -183,19 +264,249 @@ def split_video(video_path: Path, output_folder: Path, *, chunk_seconds: int, ov
     return summary
 
 
+def build_encode_command(
+    ffmpeg_path: str, video_path: Path, output_path: Path, chunk: ChunkRange, threads: int
+) -> list[str]:
+    """Build the FFmpeg command that re-encodes one chunk.
+
+    -ss before -i seeks the input to the nearest earlier keyframe and decodes
+    only from there, discarding frames before the start, so the cut is frame
+    accurate without decoding the file from the beginning.
+    """
+    return [
+        ffmpeg_path,
+        *FFMPEG_QUIET_ARGS,
+        "-threads",
+        str(threads),
+        "-ss",
+        f"{chunk.start:.3f}",
+        "-i",
+        str(video_path),
+        "-t",
+        f"{chunk.end - chunk.start:.3f}",
+        "-map",
+        "0:v?",
+        "-map",
+        "0:a?",
+        "-c:v",
+        "libx264",
+        "-c:a",
+        "aac",
+        "-threads",
+        str(threads),
+        str(output_path),
+    ]
+
+
+def encode_chunk(ffmpeg_path: str, video_path: Path, chunk: ChunkRange, threads: int) -> Path:
+    with temporary_output_path(chunk.path) as temporary_path:
+        command = build_encode_command(ffmpeg_path, video_path, temporary_path, chunk, threads)
+        run_ffmpeg(command, action=f"Could not encode {chunk.path.name}")
+    return chunk.path
+
+
+def pending_chunks(
+    video_path: Path, output_folder: Path, ranges: Sequence[tuple[float, float]], overwrite: bool, summary: ChunkSummary
+) -> list[ChunkRange]:
+    """Return the chunks still to encode, counting existing chunk files as skipped unless overwrite is set."""
+    digits = len(str(len(ranges)))
+    pending: list[ChunkRange] = []
+    for index, (start, end) in enumerate(ranges):
+        chunk = ChunkRange(index + 1, start, end, chunk_path_for(video_path, output_folder, index + 1, digits))
+        if chunk.path.exists() and not overwrite:
+            logging.warning("Skipping existing chunk: %s", chunk.path.name)
+            summary.skipped += 1
+            continue
+        pending.append(chunk)
+    return pending
+
+
+def split_video_parallel(
+    video_path: Path,
+    output_folder: Path,
+    *,
+    chunk_seconds: int,
+    overwrite: bool,
+    jobs: int,
+    threads: int | None = None,
+    ffmpeg_path: str | None = None,
+    ffprobe_path: str | None = None,
+    snap: SnapSettings | None = None,
+) -> ChunkSummary:
+    """Re-encode chunks like split_video, with up to jobs FFmpeg processes running at once.
+
+    Each process seeks straight to its own chunk, so no worker decodes the
+    video from the start, and each encoder gets threads threads. Chunks are
+    logged as they finish, so log lines may be out of order.
+    """
+    resolved_ffmpeg_path = ffmpeg_path or require_ffmpeg()
+    duration = probe_duration(video_path, ffprobe_path=ffprobe_path)
+    ranges = plan_chunks(video_path, duration, chunk_seconds, snap, ffmpeg_path=resolved_ffmpeg_path)
+    encoder_threads = threads or default_encoder_threads(jobs)
+    summary = ChunkSummary()
+    logging.info("Video: %s", video_path)
+    logging.info("Output folder: %s", output_folder)
+    logging.info("Duration: %.2f seconds | Chunk length: %d seconds | Chunks: %d", duration, chunk_seconds, len(ranges))
+    logging.info("FFmpeg workers: %d | Threads per worker: %d", jobs, encoder_threads)
+
+    pending = pending_chunks(video_path, output_folder, ranges, overwrite, summary)
+    runner = BatchRunner(jobs=jobs, backend="thread", ordered=False)
+    worker = functools.partial(encode_chunk, resolved_ffmpeg_path, video_path, threads=encoder_threads)
+    for result in runner.run(worker, pending):
+        chunk = result.item
+        if result.error is not None:
+            summary.failed += 1
+            logging.error("Failed to save chunk %d/%d: %s", chunk.number, len(ranges), result.error)
+            continue
+        summary.saved += 1
+        logging.info("Saved chunk %d/%d: %s", chunk.number, len(ranges), chunk.path.name)
+    if runner.interrupted:
+        raise KeyboardInterrupt
+    return summary
+
+
+def build_segment_command(
+    ffmpeg_path: str,
+    video_path: Path,
+    pattern: Path,
+    chunk_seconds: int,
+    cut_times: Sequence[float] | None = None,
+) -> list[str]:
+    """Build the FFmpeg command that stream-copies video_path into segments named by pattern.
+
+    Segments are cut every chunk_seconds, or at cut_times when given; either
+    way each cut lands on the first keyframe at or after its time.
+    """
+    if cut_times is None:
+        split_args = ["-segment_time", str(chunk_seconds)]
+    else:
+        split_args = ["-segment_times", ",".join(f"{time:.3f}" for time in cut_times)]
+    return [
+        ffmpeg_path,
+        *FFMPEG_QUIET_ARGS,
+        "-i",
+        str(video_path),
+        "-map",
+        "0:v?",
+        "-map",
+        "0:a?",
+        "-c",
+        "copy",
+        "-f",
+        "segment",
+        *split_args,
+        "-reset_timestamps",
+        "1",
+        str(pattern),
+    ]
+
+
+def split_video_stream_copy(
+    video_path: Path,
+    output_folder: Path,
+    *,
+    chunk_seconds: int,
+    overwrite: bool,
+    ffmpeg_path: str | None = None,
+    ffprobe_path: str | None = None,
+    snap: SnapSettings | None = None,
+) -> ChunkSummary:
+    """Split video_path without re-encoding, cutting at the first keyframe after each chunk_seconds boundary.
+
+    FFmpeg reads the file once and writes every segment into a hidden staging
+    folder inside output_folder; the segments are then moved into their
+    numbered chunk names, skipping existing chunks unless overwrite is set.
+    With snap, the cut times are planned first and the keyframe search starts
+    from each snapped cut.
+    """
+    resolved_ffmpeg_path = ffmpeg_path or require_ffmpeg()
+    summary = ChunkSummary()
+    logging.info("Video: %s", video_path)
+    logging.info("Output folder: %s", output_folder)
+    logging.info("Chunk length: about %d seconds, cut at keyframes without re-encoding", chunk_seconds)
+    cut_times = None
+    if snap is not None:
+        duration = probe_duration(video_path, ffprobe_path=ffprobe_path)
+        ranges = plan_chunks(video_path, duration, chunk_seconds, snap, ffmpeg_path=resolved_ffmpeg_path)
+        cut_times = [end for _start, end in ranges[:-1]]
+    try:
+        staging = Path(tempfile.mkdtemp(prefix=f".{video_path.stem}-segments-", dir=output_folder))
+    except OSError as exc:
+        raise ScriptError(f"Could not prepare a staging folder in '{output_folder}': {exc}") from exc
+
+    try:
+        command = build_segment_command(
+            resolved_ffmpeg_path, video_path, staging / SEGMENT_PATTERN, chunk_seconds, cut_times
+        )
+        run_ffmpeg(command, action=f"Could not split '{video_path}'")
+        segments = sorted(staging.glob("segment_*.mp4"))
+        if not segments:
+            raise ScriptError(f"FFmpeg did not write any chunks for: {video_path}")
+        digits = len(str(len(segments)))
+        for index, segment in enumerate(segments):
+            chunk_number = index + 1
+            chunk_path = chunk_path_for(video_path, output_folder, chunk_number, digits)
+            if chunk_path.exists() and not overwrite:
+                logging.warning("Skipping existing chunk: %s", chunk_path.name)
+                summary.skipped += 1
+                continue
+            try:
+                with temporary_output_path(chunk_path) as temporary_path:
+                    shutil.move(segment, temporary_path)
+                summary.saved += 1
+                logging.info("Saved chunk %d/%d: %s", chunk_number, len(segments), chunk_path.name)
+            except (OSError, ScriptError) as exc:
+                summary.failed += 1
+                logging.error("Failed to save chunk %d/%d: %s", chunk_number, len(segments), exc)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return summary
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
     configure_logging(quiet=args.quiet)
 
-    if MOVIEPY_IMPORT_ERROR is not None:
+    if MOVIEPY_IMPORT_ERROR is not None and not args.stream_copy and args.jobs == 1:
         return fail("moviepy is required. Install it with: pip install moviepy", code=2)
 
     try:
+        require_positive_int(args.jobs, label="Jobs")
+        if args.threads is not None:
+            require_positive_int(args.threads, label="Threads")
+        if args.stream_copy and (args.jobs > 1 or args.threads is not None):
+            raise ScriptError("--jobs and --threads apply to re-encoded chunks; --stream-copy does not encode.")
         video_path, output_folder = validate_args(args)
-        summary = split_video(video_path, output_folder, chunk_seconds=args.seconds, overwrite=args.overwrite)
+        snap = snap_settings_from_args(args, chunk_seconds=args.seconds)
+        if args.stream_copy:
+            summary = split_video_stream_copy(
+                video_path, output_folder, chunk_seconds=args.seconds, overwrite=args.overwrite, snap=snap
+            )
+        elif args.jobs > 1:
+            summary = split_video_parallel(
+                video_path,
+                output_folder,
+                chunk_seconds=args.seconds,
+                overwrite=args.overwrite,
+                jobs=args.jobs,
+                threads=args.threads,
+                snap=snap,
+            )
+        else:
+            summary = split_video(
+                video_path,
+                output_folder,
+                chunk_seconds=args.seconds,
+                overwrite=args.overwrite,
+                threads=args.threads,
+                snap=snap,
+            )
     except ScriptError as exc:
         return fail(str(exc), code=2)
+    except KeyboardInterrupt:
+        return fail("Interrupted by user.", code=130)
 
     logging.info("Done. Saved: %d | Skipped: %d | Failed: %d", summary.saved, summary.skipped, summary.failed)
     return 1 if summary.failed else 0
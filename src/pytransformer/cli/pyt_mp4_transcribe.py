@@ -5,11 +5,13 @@
 """
 Script: pyt_mp4_transcribe.py
 Purpose: Transcribe speech from one MP4 file into a UTF-8 text file.
-When to use: Use for a single video when Google Web Speech API transcription is acceptable.
+When to use: Use for a single video, with Google Web Speech API or an offline Vosk model.
 Changes: Writes one .txt transcript file and uses a temporary WAV file during processing.
-Inputs: MP4 file path; optional --output, --overwrite, and --language.
+Inputs: MP4 file path; optional --output, --overwrite, --language, --audio-extractor, --engine, --model,
+--window-seconds, --window-jobs, and --retries.
 Environment variables: None.
-Dependencies: moviepy, SpeechRecognition, FFmpeg, and network access for Google Web Speech API.
+Dependencies: FFmpeg on PATH or moviepy; SpeechRecognition and network access for the default Google Web Speech API,
+or vosk and a downloaded model for --engine vosk.
 Safety notes: Refuses to overwrite an existing transcript unless --overwrite is passed.
 Example: pyt-mp4-transcribe --language en-US "/path/to/video.mp4"
 Expected result: A text transcript next to the MP4 or at --output.
@@ -22,7 +24,18 @@ import argparse
 import logging
 from pathlib import Path
 
-from pytransformer.core.audio import require_transcription_dependencies, transcribe_mp4_to_text
+from pytransformer.core.audio import (
+    EXTRACTOR_AUTO,
+    Recognizer,
+    WindowSettings,
+    add_audio_extractor_argument,
+    add_speech_engine_arguments,
+    add_window_arguments,
+    load_speech_engine,
+    require_transcription_dependencies,
+    transcribe_mp4_to_text,
+    window_settings_from_args,
+)
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -53,6 +66,9 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_LANGUAGE,
         help=f"Recognition language code (default {DEFAULT_LANGUAGE}).",
     )
+    add_audio_extractor_argument(parser)
+    add_speech_engine_arguments(parser)
+    add_window_arguments(parser)
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
 
@@ -69,9 +85,19 @@ def validate_args(args: argparse.Namespace) -> tuple[Path, Path]:
     return mp4_path, output_path
 
 
-def transcribe_mp4(mp4_path: Path, output_path: Path, *, language: str) -> None:
+def transcribe_mp4(
+    mp4_path: Path,
+    output_path: Path,
+    *,
+    language: str,
+    extractor: str = EXTRACTOR_AUTO,
+    windows: WindowSettings | None = None,
+    recognize: Recognizer | None = None,
+) -> None:
     logging.info("Extracting and transcribing audio: %s", mp4_path)
-    transcript = transcribe_mp4_to_text(mp4_path, language=language)
+    transcript = transcribe_mp4_to_text(
+        mp4_path, language=language, extractor=extractor, windows=windows, recognize=recognize
+    )
     with temporary_output_path(output_path) as temporary_path:
         temporary_path.write_text(transcript + "\n", encoding="utf-8")
     logging.info("Transcript saved: %s", output_path)
@@ -83,13 +109,24 @@ def main() -> int:
     configure_logging(quiet=args.quiet)
 
     try:
-        require_transcription_dependencies()
+        require_transcription_dependencies(args.audio_extractor, args.engine)
+        windows = window_settings_from_args(args)
         mp4_path, output_path = validate_args(args)
-        transcribe_mp4(mp4_path, output_path, language=args.language)
+        recognize = load_speech_engine(args.engine, language=args.language, model=args.model)
+        transcribe_mp4(
+            mp4_path,
+            output_path,
+            language=args.language,
+            extractor=args.audio_extractor,
+            windows=windows,
+            recognize=recognize,
+        )
     except ScriptError as exc:
         return fail(str(exc), code=2)
     except OSError as exc:
         return fail(str(exc), code=1)
+    except KeyboardInterrupt:
+        return fail("Interrupted by user.", code=130)
 
     return 0
 
@@ -6,11 +6,15 @@
 Script: pyt_mp4_transcribe_batch.py
 Purpose: Transcribe every MP4 file directly inside a folder into text files.
 When to use: Use for batch transcription of a flat folder of videos.
-Changes: Writes one .txt transcript per MP4 file, either beside each video or in --output-folder.
-Inputs: Folder path; optional --output-folder, --overwrite, --include-hidden, and --language.
+Changes: Writes one .txt transcript per MP4 file, either beside each video or in --output-folder, plus a
+.pyt-journal.jsonl job journal in --output-folder or at --journal.
+Inputs: Folder path; optional --output-folder, --overwrite, --include-hidden, --language, --audio-extractor, --engine,
+--model, --jobs, --window-seconds, --window-jobs, --retries, and --resume.
 Environment variables: None.
-Dependencies: moviepy, SpeechRecognition, FFmpeg, and network access for Google Web Speech API.
-Safety notes: Does not recurse, skips symlinks, and refuses to overwrite transcripts unless --overwrite is passed.
+Dependencies: FFmpeg on PATH or moviepy; SpeechRecognition and network access for the default Google Web Speech API,
+or vosk and a downloaded model for --engine vosk.
+Safety notes: Does not recurse, skips symlinks, and refuses to overwrite transcripts unless --overwrite is passed or
+--resume finds a journaled transcript that no longer matches its recorded hash.
 Example: pyt-mp4-transcribe-batch --output-folder "/path/to/transcripts" "/path/to/videos"
 Expected result: A transcript file for each MP4 that could be processed.
 Related scripts: pyt_mp4_transcribe.py, pyt_mp4_split_chunks.py.
@@ -19,11 +23,25 @@ Related scripts: pyt_mp4_transcribe.py, pyt_mp4_split_chunks.py.
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 
-from pytransformer.core.audio import require_transcription_dependencies, transcribe_mp4_to_text
+from pytransformer.core.audio import (
+    DEFAULT_ENGINE,
+    EXTRACTOR_AUTO,
+    Recognizer,
+    WindowSettings,
+    add_audio_extractor_argument,
+    add_speech_engine_arguments,
+    add_window_arguments,
+    load_speech_engine,
+    require_transcription_dependencies,
+    transcribe_mp4_to_text,
+    window_settings_from_args,
+)
+from pytransformer.core.batch import DEFAULT_JOBS, BatchRunner, BatchSummary, add_jobs_argument
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -36,16 +54,24 @@ from pytransformer.core.common import (
     sorted_directory_items,
     temporary_output_path,
 )
+from pytransformer.core.journal import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_WRITTEN,
+    JobJournal,
+    add_journal_arguments,
+    open_batch_journal,
+    plan_resume,
+)
 
 MP4_EXTENSIONS = {".mp4"}
 DEFAULT_LANGUAGE = "en-US"
 
 
 @dataclass
-class BatchSummary:
-    written: int = 0
-    skipped: int = 0
-    failed: int = 0
+class TranscriptOutcome:
+    transcript_path: Path
+    skipped: bool = False
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -54,6 +80,7 @@ def build_parser() -> argparse.ArgumentParser:
         examples=(
             'pyt-mp4-transcribe-batch --output-folder "/path/to/transcripts" "/path/to/videos"',
             'pyt-mp4-transcribe-batch --language en-US --overwrite "/path/to/videos"',
+            'pyt-mp4-transcribe-batch --resume "/path/to/videos"',
         ),
     )
     parser.add_argument("folder", type=Path, help="Folder containing MP4 files.")
@@ -70,6 +97,11 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_LANGUAGE,
         help=f"Recognition language code (default {DEFAULT_LANGUAGE}).",
     )
+    add_audio_extractor_argument(parser)
+    add_speech_engine_arguments(parser)
+    add_window_arguments(parser)
+    add_jobs_argument(parser, help_text=f"Number of MP4 files to transcribe concurrently (default {DEFAULT_JOBS}).")
+    add_journal_arguments(parser)
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
 
@@ -105,6 +137,57 @@ def output_path_for(mp4_path: Path, output_folder: Path | None) -> Path:
     return output_folder / f"{mp4_path.stem}.txt"
 
 
+def transcribe_file(
+    mp4_path: Path,
+    *,
+    output_folder: Path | None,
+    overwrite: bool,
+    language: str,
+    replace_outputs: frozenset[Path] = frozenset(),
+    extractor: str = EXTRACTOR_AUTO,
+    windows: WindowSettings | None = None,
+    recognize: Recognizer | None = None,
+) -> TranscriptOutcome:
+    overwrite = overwrite or mp4_path in replace_outputs
+    transcript_path = output_path_for(mp4_path, output_folder)
+    if transcript_path.exists() and not overwrite:
+        return TranscriptOutcome(transcript_path=transcript_path, skipped=True)
+
+    transcript_path = ensure_output_path(
+        transcript_path,
+        overwrite=overwrite,
+        input_paths=[mp4_path],
+        label="Transcript file",
+    )
+    logging.info("Transcribing: %s", mp4_path.name)
+    transcript = transcribe_mp4_to_text(
+        mp4_path, language=language, extractor=extractor, windows=windows, recognize=recognize
+    )
+    with temporary_output_path(transcript_path) as temporary_path:
+        temporary_path.write_text(transcript + "\n", encoding="utf-8")
+    return TranscriptOutcome(transcript_path=transcript_path)
+
+
+def journal_params(
+    output_folder: Path | None,
+    language: str,
+    windows: WindowSettings | None = None,
+    engine: str = DEFAULT_ENGINE,
+    model: Path | None = None,
+) -> dict[str, str | float | None]:
+    """Return the settings that must match for a journaled transcript to count as complete."""
+    params: dict[str, str | float | None] = {
+        "output_folder": str(output_folder) if output_folder is not None else None,
+        "language": language,
+    }
+    if windows is not None:
+        params["window_seconds"] = windows.seconds
+    if engine != DEFAULT_ENGINE:
+        params["engine"] = engine
+        params["model"] = str(model) if model is not None else None
+    return params
+
+
 def process_folder(
     folder: Path,
     *,
@@ -112,6 +195,14 @@ def process_folder(
     overwrite: bool,
     include_hidden: bool,
     language: str,
+    jobs: int = DEFAULT_JOBS,
+    journal: JobJournal | None = None,
+    resume: bool = False,
+    extractor: str = EXTRACTOR_AUTO,
+    windows: WindowSettings | None = None,
+    engine: str = DEFAULT_ENGINE,
+    model: Path | None = None,
+    recognize: Recognizer | None = None,
 ) -> BatchSummary:
     mp4_files = find_mp4_files(folder, include_hidden=include_hidden)
     summary = BatchSummary()
@@ -125,33 +216,56 @@ def process_folder(
     if output_folder is not None:
         logging.info("Transcript folder: %s", output_folder)
 
-    for mp4_path in mp4_files:
-        try:
-            transcript_path = output_path_for(mp4_path, output_folder)
-            if transcript_path.exists() and not overwrite:
-                summary.skipped += 1
-                logging.warning("Skipped %s: transcript already exists: %s", mp4_path.name, transcript_path)
-                continue
-
-            transcript_path = ensure_output_path(
-                transcript_path,
-                overwrite=overwrite,
-                input_paths=[mp4_path],
-                label="Transcript file",
-            )
-            logging.info("Transcribing: %s", mp4_path.name)
-            transcript = transcribe_mp4_to_text(mp4_path, language=language)
-            with temporary_output_path(transcript_path) as temporary_path:
-                temporary_path.write_text(transcript + "\n", encoding="utf-8")
-            summary.written += 1
-            logging.info("Saved transcript: %s", transcript_path)
-        except ScriptError as exc:
-            summary.failed += 1
-            logging.error("Failed %s: %s", mp4_path.name, exc)
-        except OSError as exc:
+    params = journal_params(output_folder, language, windows, engine, model)
+    pending = mp4_files
+    replace_outputs: frozenset[Path] = frozenset()
+    if journal is not None and resume:
+        plan = plan_resume(journal, mp4_files, params=params)
+        pending, replace_outputs = plan.pending, plan.replace_outputs
+        summary.skipped += len(plan.completed)
+        logging.info("Resuming from %s: %d already complete", journal.path, len(plan.completed))
+
+    if pending and recognize is None:
+        # Loading can mean reading a large model from disk, so it happens once and every worker shares the result.
+        recognize = load_speech_engine(engine, language=language, model=model)
+
+    # Transcription waits on FFmpeg and the speech API, so threads are enough.
+    runner = BatchRunner(jobs=jobs, backend="thread")
+    worker = functools.partial(
+        transcribe_file,
+        output_folder=output_folder,
+        overwrite=overwrite,
+        language=language,
+        replace_outputs=replace_outputs,
+        extractor=extractor,
+        windows=windows,
+        recognize=recognize,
+    )
+    for result in runner.run(worker, pending):
+        mp4_path = result.item
+        outcome = result.value
+        if outcome is None:
             summary.failed += 1
-            logging.error("Failed %s: %s", mp4_path.name, exc)
+            logging.error("Failed %s: %s", mp4_path.name, result.error)
+            if journal is not None:
+                journal.record(mp4_path, STATUS_FAILED, params=params, seconds=result.seconds, error=result.error)
+            continue
+        if outcome.skipped:
+            summary.skipped += 1
+            logging.warning("Skipped %s: transcript already exists: %s", mp4_path.name, outcome.transcript_path)
+            if journal is not None:
+                journal.record(mp4_path, STATUS_SKIPPED, params=params, output=outcome.transcript_path)
+            continue
+        summary.written += 1
+        logging.info("Saved transcript: %s", outcome.transcript_path)
+        if journal is not None:
+            journal.record(
+                mp4_path, STATUS_WRITTEN, params=params, seconds=result.seconds, output=outcome.transcript_path
+            )
 
+    if runner.interrupted:
+        summary.cancelled = runner.cancelled
+        logging.warning("Interrupted. Cancelled: %d", summary.cancelled)
     return summary
 
 
@@ -161,20 +275,35 @@ def main() -> int:
     configure_logging(quiet=args.quiet)
 
     try:
-        require_transcription_dependencies()
+        require_transcription_dependencies(args.audio_extractor, args.engine)
+        windows = window_settings_from_args(args)
         folder = require_existing_folder(args.folder, label="Input folder")
         output_folder = resolve_output_folder(args.output_folder)
-        summary = process_folder(
-            folder,
-            output_folder=output_folder,
-            overwrite=args.overwrite,
-            include_hidden=args.include_hidden,
-            language=args.language,
-        )
+        journal = open_batch_journal(args, output_folder)
+        try:
+            summary = process_folder(
+                folder,
+                output_folder=output_folder,
+                overwrite=args.overwrite,
+                include_hidden=args.include_hidden,
+                language=args.language,
+                jobs=args.jobs,
+                journal=journal,
+                resume=args.resume,
+                extractor=args.audio_extractor,
+                windows=windows,
+                engine=args.engine,
+                model=args.model,
+            )
+        finally:
+            if journal is not None:
+                journal.close()
     except ScriptError as exc:
         return fail(str(exc), code=2)
 
     logging.info("Done. Written: %d | Skipped: %d | Failed: %d", summary.written, summary.skipped, summary.failed)
+    if summary.cancelled:
+        return 130
     return 1 if summary.failed else 0
 
 
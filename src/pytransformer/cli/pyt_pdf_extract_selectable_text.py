@@ -6,24 +6,33 @@
 Script: pyt_pdf_extract_selectable_text.py
 Purpose: Extract selectable text from one PDF using a lightweight PDF parser.
 When to use: Use for text-layer PDFs when OCR is not needed.
-Changes: Writes one UTF-8 .txt file next to the PDF or to --output.
-Inputs: PDF file path; optional --output and --overwrite.
+Changes: Writes one UTF-8 .txt file next to the PDF or to --output; with --index, also updates a SQLite search index,
+and with --chunks, also writes a .chunks.jsonl file of overlapping text chunks.
+Inputs: PDF file path; optional --output, --overwrite, --password, --pages, --engine, --index, --chunks, --chunk-size,
+--chunk-overlap, and --chunk-unit.
 Environment variables: None.
-Dependencies: pypdf or PyPDF2.
+Dependencies: PyMuPDF, or pypdf or PyPDF2.
 Safety notes: Refuses to overwrite existing output unless --overwrite is passed.
 Example: pyt-pdf-extract-selectable-text "/path/to/file.pdf"
 Expected result: A .txt file containing page text separated by blank lines.
-Related scripts: pyt_pdf_extract_selectable_text_batch.py, pyt_pdf_extract_text.py, pyt_pdf_render_jpeg.py.
+Related scripts: pyt_pdf_extract_selectable_text_batch.py, pyt_pdf_extract_text.py, pyt_pdf_render_jpeg.py,
+pyt_pdf_search.py.
 """
 
 from __future__ import annotations
 
 import argparse
 import importlib
+import io
 import logging
 from pathlib import Path
 from typing import Any
 
+from pytransformer.core.chunking import (
+    add_chunk_arguments,
+    chunk_settings_from_args,
+    chunks_path_for,
+)
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -32,8 +41,19 @@ from pytransformer.core.common import (
     ensure_output_path,
     fail,
     require_existing_file,
-    temporary_output_path,
 )
+from pytransformer.core.pages import PageSelection, add_pages_argument
+from pytransformer.core.pdf_text import (
+    ENGINE_PYMUPDF,
+    ENGINE_PYPDF,
+    PymupdfTextReader,
+    add_engine_argument,
+    iter_page_text,
+    resolve_text_engine,
+    write_page_text,
+    write_text_file,
+)
+from pytransformer.core.text_index import PageSpool, TextIndex, add_index_argument
 
 PdfReader: Any | None
 PDF_IMPORT_ERROR: ImportError | None
@@ -63,12 +83,21 @@ def build_parser() -> argparse.ArgumentParser:
         examples=(
             'pyt-pdf-extract-selectable-text "/path/to/file.pdf"',
             'pyt-pdf-extract-selectable-text --output "/path/to/output.txt" --overwrite "/path/to/file.pdf"',
+            'pyt-pdf-extract-selectable-text --pages 1-3 "/path/to/large.pdf"',
+            'pyt-pdf-extract-selectable-text --pages=-3--1 "/path/to/large.pdf"',
+            'pyt-pdf-extract-selectable-text --engine pypdf "/path/to/file.pdf"',
+            'pyt-pdf-extract-selectable-text --index "/path/to/pages.sqlite" "/path/to/file.pdf"',
+            'pyt-pdf-extract-selectable-text --chunks --chunk-unit tokens --chunk-size 256 "/path/to/file.pdf"',
         ),
     )
     parser.add_argument("pdf_file", type=Path, help="Path to the input PDF.")
     parser.add_argument("-o", "--output", type=Path, help="Output .txt path. Defaults to <pdf>.txt.")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite the output file if it exists.")
     parser.add_argument("--password", default="", help="Password for encrypted PDFs.")
+    add_pages_argument(parser)
+    add_engine_argument(parser)
+    add_index_argument(parser)
+    add_chunk_arguments(parser)
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
 
@@ -85,8 +114,8 @@ def validate_args(args: argparse.Namespace) -> tuple[Path, Path]:
     return pdf_path, output_path
 
 
-def open_pdf_reader(pdf_path: Path, password: str) -> Any:
-    pdf_reader_cls = PdfReader
+def open_pdf_reader(pdf_path: Path, password: str, engine: str = ENGINE_PYPDF) -> Any:
+    pdf_reader_cls = PymupdfTextReader if engine == ENGINE_PYMUPDF else PdfReader
     if pdf_reader_cls is None:
         raise ScriptError("pypdf or PyPDF2 is required. Install one with: pip install pypdf")
 
@@ -111,20 +140,10 @@ def open_pdf_reader(pdf_path: Path, password: str) -> Any:
     return reader
 
 
-def extract_text(reader: Any) -> tuple[str, int]:
-    page_text: list[str] = []
-    empty_pages = 0
-
-    for page_number, page in enumerate(reader.pages, start=1):
-        try:
-            text = page.extract_text() or ""
-        except Exception as exc:
-            raise ScriptError(f"Could not extract text from page {page_number}: {exc}") from exc
-        if not text.strip():
-            empty_pages += 1
-        page_text.append(text.rstrip())
-
-    return "\n\n".join(page_text).rstrip() + "\n", empty_pages
+def extract_text(reader: Any, pages: PageSelection | None = None) -> tuple[str, int]:
+    buffer = io.StringIO()
+    empty_pages = write_page_text(iter_page_text(reader, pages), buffer)
+    return buffer.getvalue(), empty_pages
 
 
 def main() -> int:
@@ -133,21 +152,36 @@ def main() -> int:
     configure_logging(quiet=args.quiet)
 
     try:
-        require_pdf_dependency()
+        engine = resolve_text_engine(args.engine)
+        if engine == ENGINE_PYPDF:
+            require_pdf_dependency()
         pdf_path, output_path = validate_args(args)
-        reader = open_pdf_reader(pdf_path, args.password)
+        chunks = chunk_settings_from_args(args)
+        index = TextIndex.open(args.index) if args.index is not None else None
+        spool = PageSpool.create() if index is not None else None
         try:
-            text, empty_pages = extract_text(reader)
+            reader = open_pdf_reader(pdf_path, args.password, engine)
+            try:
+                empty_pages = write_text_file(reader, output_path, args.pages, spool, chunks, str(pdf_path))
+                if index is not None and spool is not None:
+                    index.replace_document(pdf_path, spool, page_count=len(reader.pages))
+            finally:
+                close_resource(reader)
         finally:
-            close_resource(reader)
-        with temporary_output_path(output_path) as temporary_path:
-            temporary_path.write_text(text, encoding="utf-8")
+            if spool is not None:
+                spool.discard()
+            if index is not None:
+                index.close()
     except ScriptError as exc:
         return fail(str(exc), code=2)
     except OSError as exc:
         return fail(str(exc), code=1)
 
     logging.info("Text saved: %s", output_path)
+    if spool is not None:
+        logging.info("Indexed pages: %d in %s", spool.pages, args.index)
+    if chunks is not None:
+        logging.info("Chunks saved: %s (%s)", chunks_path_for(output_path), chunks.describe())
     if empty_pages:
         logging.warning("Pages with no extractable text: %d", empty_pages)
     return 0
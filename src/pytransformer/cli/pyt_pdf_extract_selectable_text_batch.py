@@ -4,27 +4,47 @@
 
 """
 Script: pyt_pdf_extract_selectable_text_batch.py
-Purpose: Extract selectable text from every PDF directly inside a folder.
+Purpose: Extract selectable text from every PDF inside a folder, optionally including subfolders.
 When to use: Use for batch conversion of text-layer PDFs when OCR is not needed.
-Changes: Writes one UTF-8 .txt file per PDF beside each PDF or in --output-folder.
-Inputs: Folder path; optional --output-folder, --overwrite, --include-hidden, and --password.
+Changes: Writes one UTF-8 .txt file per PDF beside each PDF or in --output-folder, plus a .pyt-journal.jsonl
+job journal in --output-folder or at --journal, with --incremental a .pyt-manifest.json manifest, with --index a
+SQLite search index, and with --chunks a .chunks.jsonl file of overlapping text chunks beside each .txt file.
+Inputs: Folder path; optional --output-folder, --recursive, --incremental, --overwrite, --include-hidden, --password,
+--pages, --engine, --index, --chunks, --chunk-size, --chunk-overlap, --chunk-unit, --jobs, --timeout, and --resume.
 Environment variables: None.
-Dependencies: pypdf or PyPDF2.
-Safety notes: Does not recurse, skips symlinks, and refuses to overwrite output unless --overwrite is passed.
+Dependencies: PyMuPDF, or pypdf or PyPDF2.
+Safety notes: Recurses only with --recursive, skips symlinks, and refuses to overwrite output unless --overwrite is
+passed, --resume finds a journaled output that no longer matches its recorded hash, or --incremental finds that the
+PDF behind a manifest output changed.
 Example: pyt-pdf-extract-selectable-text-batch --output-folder "/path/to/text" "/path/to/pdfs"
 Expected result: One .txt file for each PDF that could be processed.
-Related scripts: pyt_pdf_extract_selectable_text.py, pyt_pdf_extract_text.py, pyt_pdf_render_jpeg.py.
+Related scripts: pyt_pdf_extract_selectable_text.py, pyt_pdf_extract_text.py, pyt_pdf_render_jpeg.py,
+pyt_pdf_search.py.
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from pytransformer.core.batch import (
+    DEFAULT_JOBS,
+    BatchRunner,
+    BatchSummary,
+    add_jobs_argument,
+    add_timeout_argument,
+)
+from pytransformer.core.chunking import (
+    ChunkSettings,
+    add_chunk_arguments,
+    chunk_settings_from_args,
+)
 from pytransformer.core.common import (
     ScriptError,
     build_command_parser,
@@ -36,8 +56,34 @@ from pytransformer.core.common import (
     require_existing_folder,
     resolve_user_path,
     sorted_directory_items,
-    temporary_output_path,
 )
+from pytransformer.core.journal import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_WRITTEN,
+    JobJournal,
+    add_journal_arguments,
+    open_batch_journal,
+    plan_resume,
+)
+from pytransformer.core.manifest import (
+    DEFAULT_MANIFEST_NAME,
+    IncrementalManifest,
+    SourceState,
+    plan_incremental,
+    source_state,
+)
+from pytransformer.core.pages import PageSelection, add_pages_argument
+from pytransformer.core.pdf_text import (
+    ENGINE_PYMUPDF,
+    ENGINE_PYPDF,
+    PymupdfTextReader,
+    add_engine_argument,
+    resolve_text_engine,
+    spool_page_text,
+    write_text_file,
+)
+from pytransformer.core.text_index import PageSpool, TextIndex, add_index_argument
 
 PdfReader: Any | None
 PDF_IMPORT_ERROR: ImportError | None
@@ -62,19 +108,31 @@ PDF_EXTENSIONS = {".pdf"}
 
 
 @dataclass
-class BatchSummary:
-    written: int = 0
-    skipped: int = 0
-    failed: int = 0
+class PdfBatchSummary(BatchSummary):
+    empty_pages: int = 0
+
+
+@dataclass
+class PdfOutcome:
+    output_path: Path
     empty_pages: int = 0
+    skipped: bool = False
+    source: SourceState | None = None
+    page_count: int = 0
+    index_spool: PageSpool | None = None
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = build_command_parser(
-        description="Extract selectable text from PDFs directly inside a folder.",
+        description="Extract selectable text from PDFs inside a folder, optionally including subfolders.",
         examples=(
             'pyt-pdf-extract-selectable-text-batch --output-folder "/path/to/text" "/path/to/pdfs"',
             'pyt-pdf-extract-selectable-text-batch --overwrite --password "secret" "/path/to/pdfs"',
+            'pyt-pdf-extract-selectable-text-batch --resume --jobs 4 "/path/to/pdfs"',
+            'pyt-pdf-extract-selectable-text-batch --jobs 4 --timeout 120 "/path/to/pdfs"',
+            'pyt-pdf-extract-selectable-text-batch --recursive --incremental --output-folder "/path/to/text" "/share"',
+            'pyt-pdf-extract-selectable-text-batch --recursive --incremental --index "/path/to/pages.sqlite" "/share"',
+            'pyt-pdf-extract-selectable-text-batch --chunks --chunk-size 2000 --chunk-overlap 400 "/path/to/pdfs"',
         ),
     )
     parser.add_argument("folder", type=Path, help="Folder containing PDF files.")
@@ -84,9 +142,30 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Folder for text output. Defaults to writing each .txt beside its PDF.",
     )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Include PDFs in subfolders. Output mirrors the folder structure inside --output-folder.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only extract PDFs that are new or whose size, mtime, or content changed since the last incremental "
+        f"run, as tracked in {DEFAULT_MANIFEST_NAME} in the output folder.",
+    )
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing output files.")
     parser.add_argument("--include-hidden", action="store_true", help="Include hidden PDF files.")
     parser.add_argument("--password", default="", help="Password to try for encrypted PDFs.")
+    add_pages_argument(parser)
+    add_engine_argument(parser)
+    add_index_argument(parser)
+    add_chunk_arguments(parser)
+    add_jobs_argument(parser, help_text=f"Number of PDFs to extract in parallel processes (default {DEFAULT_JOBS}).")
+    add_timeout_argument(
+        parser, help_text="Stop and fail any PDF that takes longer than this many seconds. Defaults to no limit."
+    )
+    add_journal_arguments(parser)
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors.")
     return parser
 
@@ -96,7 +175,11 @@ def require_pdf_dependency() -> None:
         raise ScriptError("pypdf or PyPDF2 is required. Install one with: pip install pypdf")
 
 
-def find_pdf_files(folder: Path, *, include_hidden: bool) -> list[Path]:
+def find_pdf_files(
+    folder: Path, *, include_hidden: bool, recursive: bool = False, skip_folder: Path | None = None
+) -> list[Path]:
+    if recursive:
+        return walk_pdf_files(folder, include_hidden=include_hidden, skip_folder=skip_folder)
     pdf_files: list[Path] = []
     for item in sorted_directory_items(folder):
         if not include_hidden and is_hidden_path(item):
@@ -108,6 +191,45 @@ def find_pdf_files(folder: Path, *, include_hidden: bool) -> list[Path]:
     return pdf_files
 
 
+def walk_pdf_files(folder: Path, *, include_hidden: bool, skip_folder: Path | None = None) -> list[Path]:
+    """Find PDFs in folder and its subfolders, each folder's files first, then its subfolders, by name.
+
+    Uses one scandir per folder so large trees are listed without a stat call
+    per file. Symlinks are never followed, skip_folder (an output folder
+    inside the input tree) is not entered, and unreadable subfolders are
+    logged and skipped.
+    """
+    pdf_files: list[Path] = []
+    pending = [folder]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name.casefold())
+        except OSError as exc:
+            if current == folder:
+                raise ScriptError(f"Could not read folder '{folder}': {exc}") from exc
+            logging.warning("Skipped unreadable folder %s: %s", current, exc)
+            continue
+        subfolders: list[Path] = []
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    path = Path(entry.path)
+                    if path != skip_folder:
+                        subfolders.append(path)
+                elif entry.is_file(follow_symlinks=False) and Path(entry.name).suffix.lower() in PDF_EXTENSIONS:
+                    pdf_files.append(Path(entry.path))
+            except OSError:
+                continue
+        pending.extend(reversed(subfolders))
+    return pdf_files
+
+
 def resolve_output_folder(path: Path | None) -> Path | None:
     if path is None:
         return None
@@ -121,14 +243,17 @@ def resolve_output_folder(path: Path | None) -> Path | None:
     return output_folder
 
 
-def output_path_for(pdf_path: Path, output_folder: Path | None) -> Path:
+def output_path_for(pdf_path: Path, output_folder: Path | None, input_root: Path | None = None) -> Path:
+    """Return the .txt path for a PDF; with input_root, the path below it is mirrored inside output_folder."""
     if output_folder is None:
         return pdf_path.with_suffix(".txt")
+    if input_root is not None:
+        return output_folder / pdf_path.parent.relative_to(input_root) / f"{pdf_path.stem}.txt"
     return output_folder / f"{pdf_path.stem}.txt"
 
 
-def open_pdf_reader(pdf_path: Path, password: str) -> Any:
-    pdf_reader_cls = PdfReader
+def open_pdf_reader(pdf_path: Path, password: str, engine: str = ENGINE_PYPDF) -> Any:
+    pdf_reader_cls = PymupdfTextReader if engine == ENGINE_PYMUPDF else PdfReader
     if pdf_reader_cls is None:
         raise ScriptError("pypdf or PyPDF2 is required. Install one with: pip install pypdf")
 
@@ -153,18 +278,123 @@ def open_pdf_reader(pdf_path: Path, password: str) -> Any:
     return reader
 
 
-def extract_text(reader: Any) -> tuple[str, int]:
-    page_text: list[str] = []
+def read_source_state(pdf_path: Path, record_source: bool) -> SourceState | None:
+    if not record_source:
+        return None
+    try:
+        return source_state(pdf_path)
+    except OSError as exc:
+        raise ScriptError(f"Could not read PDF: {exc}") from exc
+
+
+def process_pdf(
+    pdf_path: Path,
+    *,
+    output_folder: Path | None,
+    overwrite: bool,
+    password: str,
+    pages: PageSelection | None = None,
+    engine: str = ENGINE_PYPDF,
+    input_root: Path | None = None,
+    record_source: bool = False,
+    replace_outputs: frozenset[Path] = frozenset(),
+    index_path: Path | None = None,
+    chunks: ChunkSettings | None = None,
+) -> PdfOutcome:
+    overwrite = overwrite or pdf_path in replace_outputs
+    planned_output_path = output_path_for(pdf_path, output_folder, input_root)
+    output_path: Path | None = None
+    if planned_output_path.exists() and not overwrite:
+        # The source state is still reported so an incremental run adopts outputs written before the manifest.
+        source = read_source_state(pdf_path, record_source)
+        if index_path is None or index_has_document(index_path, pdf_path):
+            return PdfOutcome(output_path=planned_output_path, skipped=True, source=source)
+    else:
+        output_path = ensure_output_path(
+            planned_output_path,
+            overwrite=overwrite,
+            input_paths=[pdf_path],
+            label="Output file",
+        )
+        source = read_source_state(pdf_path, record_source)
+    reader = open_pdf_reader(pdf_path, password, engine)
+    spool: PageSpool | None = None
     empty_pages = 0
-    for page_number, page in enumerate(reader.pages, start=1):
-        try:
-            text = page.extract_text() or ""
-        except Exception as exc:
-            raise ScriptError(f"Could not extract text from page {page_number}: {exc}") from exc
-        if not text.strip():
-            empty_pages += 1
-        page_text.append(text.rstrip())
-    return "\n\n".join(page_text).rstrip() + "\n", empty_pages
+    try:
+        # Pages for the index go to a spool file, so the worker hands back a path rather than the whole text.
+        spool = PageSpool.create() if index_path is not None else None
+        if output_path is not None:
+            empty_pages = write_text_file(reader, output_path, pages, spool, chunks, str(pdf_path))
+        elif spool is not None:
+            # The existing output is kept; the PDF is only read for an index that does not have it yet.
+            spool_page_text(reader, spool, pages)
+        page_count = len(reader.pages) if spool is not None else 0
+    except BaseException:
+        if spool is not None:
+            spool.discard()
+        raise
+    finally:
+        if spool is not None:
+            spool.close()
+        close_resource(reader)
+    return PdfOutcome(
+        output_path=output_path or planned_output_path,
+        empty_pages=empty_pages,
+        skipped=output_path is None,
+        source=source,
+        page_count=page_count,
+        index_spool=spool,
+    )
+
+
+def index_has_document(index_path: Path, pdf_path: Path) -> bool:
+    with TextIndex.open(index_path, create=False) as index:
+        return index.has_document(pdf_path)
+
+
+def index_outcome(index: TextIndex | None, pdf_path: Path, outcome: PdfOutcome) -> None:
+    """Move the pages a worker spooled into the index, then remove the spool."""
+    if outcome.index_spool is None:
+        return
+    try:
+        if index is not None:
+            index.replace_document(pdf_path, outcome.index_spool, page_count=outcome.page_count)
+    finally:
+        outcome.index_spool.discard()
+
+
+def journal_params(
+    output_folder: Path | None,
+    pages: PageSelection | None = None,
+    engine: str = ENGINE_PYPDF,
+    recursive: bool = False,
+    index_path: Path | None = None,
+    chunks: ChunkSettings | None = None,
+) -> dict[str, str | bool | None]:
+    """Return the settings that must match for a journaled or manifest result to count as complete.
+
+    The search index and chunk settings only appear when they are used, so
+    adding --index or --chunks redoes PDFs extracted without them, and older
+    journals still match.
+    """
+    params: dict[str, str | bool | None] = {
+        "output_folder": str(output_folder) if output_folder is not None else None,
+        "pages": pages.spec if pages is not None else None,
+        "engine": engine,
+        "recursive": recursive,
+    }
+    if index_path is not None:
+        params["index"] = str(index_path)
+    if chunks is not None:
+        params["chunks"] = chunks.describe()
+    return params
+
+
+def display_path(path: Path, root: Path | None) -> str:
+    """Name a file in logs by its path below root, which is just its name for a flat folder."""
+    if root is not None and path.is_relative_to(root):
+        return str(path.relative_to(root))
+    return path.name
 
 
 def process_folder(
@@ -174,9 +404,19 @@ def process_folder(
     overwrite: bool,
     include_hidden: bool,
     password: str,
-) -> BatchSummary:
-    pdf_files = find_pdf_files(folder, include_hidden=include_hidden)
-    summary = BatchSummary()
+    pages: PageSelection | None = None,
+    engine: str = ENGINE_PYPDF,
+    recursive: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    timeout: float | None = None,
+    journal: JobJournal | None = None,
+    resume: bool = False,
+    manifest: IncrementalManifest | None = None,
+    index: TextIndex | None = None,
+    chunks: ChunkSettings | None = None,
+) -> PdfBatchSummary:
+    pdf_files = find_pdf_files(folder, include_hidden=include_hidden, recursive=recursive, skip_folder=output_folder)
+    summary = PdfBatchSummary()
 
     if not pdf_files:
         logging.info("No PDF files found in: %s", folder)
@@ -184,40 +424,97 @@ def process_folder(
 
     logging.info("Input folder: %s", folder)
     logging.info("PDF files: %d", len(pdf_files))
+    logging.info("Text engine: %s", engine)
     if output_folder is not None:
         logging.info("Output folder: %s", output_folder)
+    if index is not None:
+        logging.info("Search index: %s", index.path)
+    if chunks is not None:
+        logging.info("Chunks: %s", chunks.describe())
+
+    input_root = folder if recursive else None
+    output_root = output_folder or folder
+    params = journal_params(output_folder, pages, engine, recursive, index.path if index is not None else None, chunks)
+    pending = pdf_files
+    replace_outputs: frozenset[Path] = frozenset()
+    if journal is not None and resume:
+        plan = plan_resume(journal, pdf_files, params=params)
+        pending, replace_outputs = plan.pending, plan.replace_outputs
+        summary.skipped += len(plan.completed)
+        logging.info("Resuming from %s: %d already complete", journal.path, len(plan.completed))
+    if manifest is not None:
+        manifest.retain(pdf_files)
+        incremental = plan_incremental(
+            manifest,
+            pending,
+            output_for=lambda pdf_path: output_path_for(pdf_path, output_folder, input_root),
+            params=params,
+        )
+        pending, replace_outputs = incremental.pending, replace_outputs | incremental.replace_outputs
+        summary.skipped += len(incremental.unchanged)
+        logging.info(
+            "Incremental run (%s): %d unchanged, %d to extract", manifest.path, len(incremental.unchanged), len(pending)
+        )
 
-    for pdf_path in pdf_files:
-        try:
-            planned_output_path = output_path_for(pdf_path, output_folder)
-            if planned_output_path.exists() and not overwrite:
+    # pypdf is pure Python and PyMuPDF holds the GIL while it extracts, so parallel runs use processes rather than
+    # threads. With a timeout, each PDF runs in a worker process that can be stopped when it stalls.
+    runner = BatchRunner(jobs=jobs, backend="process", timeout=timeout)
+    worker = functools.partial(
+        process_pdf,
+        output_folder=output_folder,
+        overwrite=overwrite,
+        password=password,
+        pages=pages,
+        engine=engine,
+        input_root=input_root,
+        record_source=manifest is not None,
+        replace_outputs=replace_outputs,
+        index_path=index.path if index is not None else None,
+        chunks=chunks,
+    )
+    try:
+        for result in runner.run(worker, pending):
+            pdf_path = result.item
+            pdf_name = display_path(pdf_path, folder)
+            outcome = result.value
+            if outcome is None:
+                summary.failed += 1
+                logging.error("Failed %s: %s", pdf_name, result.error)
+                if journal is not None:
+                    journal.record(pdf_path, STATUS_FAILED, params=params, seconds=result.seconds, error=result.error)
+                continue
+            if outcome.skipped:
                 summary.skipped += 1
-                logging.warning("Skipped %s: output already exists: %s", pdf_path.name, planned_output_path)
+                logging.warning("Skipped %s: output already exists: %s", pdf_name, outcome.output_path)
+                if outcome.index_spool is not None:
+                    index_outcome(index, pdf_path, outcome)
+                    logging.info("Indexed existing output: %s", display_path(outcome.output_path, output_root))
+                if journal is not None:
+                    journal.record(pdf_path, STATUS_SKIPPED, params=params, output=outcome.output_path)
+                if manifest is not None and outcome.source is not None:
+                    manifest.record(pdf_path, outcome.source, output=outcome.output_path, params=params)
                 continue
-
-            output_path = ensure_output_path(
-                planned_output_path,
-                overwrite=overwrite,
-                input_paths=[pdf_path],
-                label="Output file",
-            )
-            reader = open_pdf_reader(pdf_path, password)
-            try:
-                text, empty_pages = extract_text(reader)
-            finally:
-                close_resource(reader)
-            with temporary_output_path(output_path) as temporary_path:
-                temporary_path.write_text(text, encoding="utf-8")
-            summary.empty_pages += empty_pages
+            summary.empty_pages += outcome.empty_pages
             summary.written += 1
-            logging.info("Saved text: %s", output_path.name)
-        except ScriptError as exc:
-            summary.failed += 1
-            logging.error("Failed %s: %s", pdf_path.name, exc)
-        except OSError as exc:
-            summary.failed += 1
-            logging.error("Failed %s: %s", pdf_path.name, exc)
-
+            logging.info("Saved text: %s", display_path(outcome.output_path, output_root))
+            if journal is not None:
+                journal.record(
+                    pdf_path, STATUS_WRITTEN, params=params, seconds=result.seconds, output=outcome.output_path
+                )
+            index_outcome(index, pdf_path, outcome)
+            if manifest is not None and outcome.source is not None:
+                manifest.record(pdf_path, outcome.source, output=outcome.output_path, params=params)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+    if runner.interrupted:
+        summary.cancelled = runner.cancelled
+        logging.warning("Interrupted. Cancelled: %d", summary.cancelled)
+    elif index is not None:
+        removed = index.remove_missing(folder)
+        if removed:
+            logging.info("Removed %d deleted PDF(s) from the search index", removed)
     return summary
 
 
@@ -227,16 +524,40 @@ def main() -> int:
     configure_logging(quiet=args.quiet)
 
     try:
-        require_pdf_dependency()
+        engine = resolve_text_engine(args.engine)
+        if engine == ENGINE_PYPDF:
+            require_pdf_dependency()
         folder = require_existing_folder(args.folder, label="Input folder")
+        chunks = chunk_settings_from_args(args)
         output_folder = resolve_output_folder(args.output_folder)
-        summary = process_folder(
-            folder,
-            output_folder=output_folder,
-            overwrite=args.overwrite,
-            include_hidden=args.include_hidden,
-            password=args.password,
+        manifest = (
+            IncrementalManifest.open((output_folder or folder) / DEFAULT_MANIFEST_NAME) if args.incremental else None
         )
+        journal = open_batch_journal(args, output_folder)
+        index = TextIndex.open(args.index) if args.index is not None else None
+        try:
+            summary = process_folder(
+                folder,
+                output_folder=output_folder,
+                overwrite=args.overwrite,
+                include_hidden=args.include_hidden,
+                password=args.password,
+                pages=args.pages,
+                engine=engine,
+                recursive=args.recursive,
+                jobs=args.jobs,
+                timeout=args.timeout,
+                journal=journal,
+                resume=args.resume,
+                manifest=manifest,
+                index=index,
+                chunks=chunks,
+            )
+        finally:
+            if index is not None:
+                index.close()
+            if journal is not None:
+                journal.close()
     except ScriptError as exc:
         return fail(str(exc), code=2)
 
@@ -247,6 +568,8 @@ def main() -> int:
         summary.failed,
         summary.empty_pages,
     )
+    if summary.cancelled:
+        return 130
     return 1 if summary.failed else 0
 
 
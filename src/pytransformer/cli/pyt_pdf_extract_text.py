@@ -5,12 +5,16 @@
 
 """
 Script: pyt_pdf_extract_text.py
-Purpose: Extract text from one PDF, with optional OCR fallback for image-only pages.
+Purpose: Extract text from one PDF, with optional OCR fallback for image-only pages and garbled text layers.
 When to use: Use when a PDF may contain scanned pages or when stronger extraction is needed than the lightweight parser.
-Changes: Writes one UTF-8 .txt file and one extraction log file next to the PDF.
-Inputs: PDF file path; optional --output, --overwrite, --password, --no-ocr, and --ocr-dpi.
+Changes: Writes one UTF-8 .txt file, or a .jsonl file of page records with --format jsonl, and one extraction log
+file next to the PDF; with --chunks, also writes a .chunks.jsonl file of overlapping text chunks, and with --index,
+updates a SQLite search index.
+Inputs: PDF file path; optional --output, --format, --overwrite, --password, --no-ocr, --ocr-dpi, --fixed-ocr-dpi,
+--ocr-backend, --ocr-language, --ocr-workers, --ocr-config, --ocr-cache, --ocr-cache-size, --pages, --jobs, --index,
+--chunks, --chunk-size, --chunk-overlap, --chunk-unit, --profile, and --profile-top.
 Environment variables: None.
-Dependencies: PyMuPDF; optional pillow, pytesseract, and a system Tesseract install for OCR fallback.
+Dependencies: PyMuPDF; a system Tesseract install for OCR fallback, used directly or through pillow and pytesseract.
 Safety notes: Refuses to overwrite existing output unless --overwrite is passed.
 Example: pyt-pdf-extract-text --no-ocr -o "/path/to/output.txt" "/path/to/file.pdf"
 Expected result: A text file containing extracted page text, with OCR used when enabled and available.
@@ -20,14 +24,61 @@ Related scripts: pyt_pdf_extract_selectable_text.py, pyt_pdf_extract_selectable_
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
+import functools
 import importlib
+import json
 import logging
+import os
 import sys
-from dataclasses import dataclass
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any
-
-from pytransformer.core.common import ScriptError, build_command_parser, temporary_output_path
+from typing import Any, Iterable, Iterator, Sequence, TextIO
+
+from pytransformer.core.batch import DEFAULT_JOBS, BatchRunner, add_jobs_argument
+from pytransformer.core.chunking import (
+    ChunkSettings,
+    ChunkWriter,
+    add_chunk_arguments,
+    chunk_settings_from_args,
+    chunks_path_for,
+    open_chunk_writer,
+)
+from pytransformer.core.common import ScriptError, build_command_parser, require_positive_int, temporary_output_path
+from pytransformer.core.ocr_cache import (
+    DEFAULT_CACHE_LIMIT_MB,
+    OcrCache,
+    ocr_cache_key,
+    page_image_digest,
+    pixmap_digest,
+)
+from pytransformer.core.ocr_pool import (
+    GrayImage,
+    TesseractPool,
+    build_tesseract_command,
+    find_tesseract,
+    load_tesserocr,
+    run_tesseract_command,
+)
+from pytransformer.core.page_classifier import (
+    PAGE_KIND_GARBLED,
+    PageProfile,
+    adaptive_ocr_dpi,
+    classify_page,
+)
+from pytransformer.core.pages import add_pages_argument, selected_page_indexes
+from pytransformer.core.pdf_text import worker_document
+from pytransformer.core.profiling import (
+    PageTimer,
+    ProfileReport,
+    add_profile_arguments,
+    timed,
+    validate_profile_args,
+)
+from pytransformer.core.text_index import PageSpool, TextIndex, add_index_argument
 
 fitz: Any | None
 FITZ_IMPORT_ERROR: ImportError | None
@@ -48,6 +99,29 @@ OCR_IMPORT_ATTEMPTED = False
 
 
 DEFAULT_OCR_DPI = 300
+OCR_BACKEND_AUTO = "auto"
+OCR_BACKEND_TESSERACT = "tesseract"
+OCR_BACKEND_PYTESSERACT = "pytesseract"
+OCR_BACKEND_POOL = "pool"
+OCR_BACKENDS = (OCR_BACKEND_AUTO, OCR_BACKEND_TESSERACT, OCR_BACKEND_PYTESSERACT, OCR_BACKEND_POOL)
+GRAYSCALE_OCR_BACKENDS = (OCR_BACKEND_TESSERACT, OCR_BACKEND_POOL)
+DEFAULT_OCR_WORKERS = os.cpu_count() or 1
+# Rendered pages waiting for pooled OCR, per worker; bounds memory on long scanned documents.
+OCR_PAGES_QUEUED_PER_WORKER = 4
+MAX_PAGES_PER_TASK = 16
+PAGE_TEXT = "text"
+PAGE_OCR = "ocr"
+PAGE_EMPTY = "empty"
+PAGE_FAILED = "failed"
+NO_TEXT_LAYER = "has no text layer"
+FORMAT_TEXT = "text"
+FORMAT_JSONL = "jsonl"
+OUTPUT_FORMATS = (FORMAT_TEXT, FORMAT_JSONL)
+OUTPUT_SUFFIXES = {FORMAT_TEXT: ".txt", FORMAT_JSONL: ".jsonl"}
+# PyMuPDF block type for text; image blocks are left out of the JSONL layout.
+TEXT_BLOCK = 0
+# Stages timed for each page, in the order --profile reports them.
+PROFILE_STAGES = ("load", "text", "classify", "cache", "render", "ocr", "layout", "write")
 
 
 class TextExtractionError(RuntimeError):
@@ -61,6 +135,41 @@ class ExtractionSummary:
     ocr_pages: int = 0
     empty_pages: int = 0
     failed_pages: int = 0
+    cached_ocr_pages: int = 0
+
+
+@dataclass
+class OcrSettings:
+    """OCR fallback options shared by every page, including page-range worker processes."""
+
+    dpi: int = DEFAULT_OCR_DPI
+    fixed_dpi: bool = False
+    backend: str = OCR_BACKEND_PYTESSERACT
+    language: str | None = None
+    config: str = ""
+    cache: OcrCache | None = None
+    pool: TesseractPool | None = None
+
+
+@dataclass
+class PageResult:
+    """Text and extraction outcome for one page, logged and written by the main process."""
+
+    page_number: int
+    text: str = ""
+    status: str = PAGE_TEXT
+    message: str = ""
+    level: int = logging.INFO
+    cached: bool = False
+    pending: concurrent.futures.Future[str] | None = None
+    cache_key: str | None = None
+    reason: str = NO_TEXT_LAYER
+    ocr_dpi: int | None = None
+    seconds: float = 0.0
+    width: float | None = None
+    height: float | None = None
+    blocks: list[tuple[float, float, float, float, str]] = field(default_factory=list)
+    timer: PageTimer | None = None
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -69,6 +178,12 @@ def build_parser() -> argparse.ArgumentParser:
         examples=(
             'pyt-pdf-extract-text "/path/to/file.pdf"',
             'pyt-pdf-extract-text --no-ocr --output "/path/to/output.txt" "/path/to/file.pdf"',
+            'pyt-pdf-extract-text --jobs 4 "/path/to/scanned.pdf"',
+            'pyt-pdf-extract-text --pages 1-3,-1 "/path/to/large.pdf"',
+            'pyt-pdf-extract-text --format jsonl "/path/to/file.pdf"',
+            'pyt-pdf-extract-text --chunks --chunk-unit tokens --chunk-size 256 "/path/to/scanned.pdf"',
+            'pyt-pdf-extract-text --index "/path/to/pages.sqlite" "/path/to/scanned.pdf"',
+            'pyt-pdf-extract-text --profile "/path/to/timings.csv" "/path/to/slow.pdf"',
         ),
     )
     parser.add_argument("pdf_file", type=Path, help="Input PDF file.")
@@ -76,7 +191,14 @@ def build_parser() -> argparse.ArgumentParser:
         "-o",
         "--output",
         type=Path,
-        help="Output text file. Defaults to a .txt file next to the PDF.",
+        help="Output file. Defaults to a .txt file, or .jsonl with --format jsonl, next to the PDF.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=FORMAT_TEXT,
+        help="'text' writes plain page text; 'jsonl' writes one JSON record per page with its text blocks, "
+        "bounding boxes, OCR use, and timing (default text).",
     )
     parser.add_argument("--overwrite", action="store_true", help="Overwrite the output text file if it exists.")
     parser.add_argument("--password", default="", help="Password for encrypted PDFs.")
@@ -85,8 +207,47 @@ def build_parser() -> argparse.ArgumentParser:
         "--ocr-dpi",
         type=int,
         default=DEFAULT_OCR_DPI,
-        help=f"OCR render DPI for image-only pages (default {DEFAULT_OCR_DPI}).",
+        help=f"Highest OCR render DPI. Scanned pages render at their images' own resolution up to this "
+        f"(default {DEFAULT_OCR_DPI}).",
     )
+    parser.add_argument(
+        "--fixed-ocr-dpi",
+        action="store_true",
+        help="Render every OCR page at --ocr-dpi instead of matching the scan's resolution.",
+    )
+    parser.add_argument(
+        "--ocr-backend",
+        choices=OCR_BACKENDS,
+        default=OCR_BACKEND_AUTO,
+        help="OCR path: 'tesseract' pipes a grayscale render straight to the Tesseract executable, 'pytesseract' "
+        "goes through Pillow, 'pool' keeps --ocr-workers Tesseract workers alive for the whole document, and "
+        "'auto' prefers tesseract when it is on PATH (default auto).",
+    )
+    parser.add_argument(
+        "--ocr-workers",
+        type=int,
+        default=DEFAULT_OCR_WORKERS,
+        help=f"Persistent Tesseract workers for --ocr-backend pool (default {DEFAULT_OCR_WORKERS}, the CPU count).",
+    )
+    parser.add_argument("--ocr-language", help="Tesseract language code(s), such as eng or eng+deu.")
+    parser.add_argument("--ocr-config", default="", help="Extra Tesseract configuration flags, such as '--psm 6'.")
+    parser.add_argument(
+        "--ocr-cache",
+        type=Path,
+        help="Folder for cached OCR results, reused when the same page is OCRed again with the same settings.",
+    )
+    parser.add_argument(
+        "--ocr-cache-size",
+        type=int,
+        default=DEFAULT_CACHE_LIMIT_MB,
+        help=f"Maximum OCR cache size in MB before the least recently used entries are removed "
+        f"(default {DEFAULT_CACHE_LIMIT_MB}).",
+    )
+    add_pages_argument(parser)
+    add_jobs_argument(parser, help_text=f"Number of worker processes extracting page ranges (default {DEFAULT_JOBS}).")
+    add_index_argument(parser)
+    add_chunk_arguments(parser)
+    add_profile_arguments(parser)
     parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors to the console.")
     return parser
 
@@ -118,9 +279,9 @@ def setup_logger(log_path: Path, quiet: bool) -> logging.Logger:
     return logger
 
 
-def build_paths(args: argparse.Namespace) -> tuple[Path, Path, Path]:
+def build_paths(args: argparse.Namespace, output_suffix: str = ".txt") -> tuple[Path, Path, Path]:
     pdf_path = args.pdf_file.expanduser().resolve()
-    output_path = args.output.expanduser().resolve() if args.output else pdf_path.with_suffix(".txt")
+    output_path = args.output.expanduser().resolve() if args.output else pdf_path.with_suffix(output_suffix)
     log_path = pdf_path.with_name(f"{pdf_path.stem}_extract.log")
 
     if not pdf_path.exists():
@@ -192,6 +353,28 @@ def ocr_dependency_message() -> str:
     return "missing " + " and ".join(missing)
 
 
+def resolve_ocr_backend(choice: str) -> str:
+    if choice == OCR_BACKEND_AUTO:
+        return OCR_BACKEND_TESSERACT if find_tesseract() is not None else OCR_BACKEND_PYTESSERACT
+    return choice
+
+
+def ocr_backend_available(backend: str) -> bool:
+    if backend == OCR_BACKEND_TESSERACT:
+        return find_tesseract() is not None
+    if backend == OCR_BACKEND_POOL:
+        return load_tesserocr() or find_tesseract() is not None
+    return ocr_available()
+
+
+def ocr_backend_message(backend: str) -> str:
+    if backend == OCR_BACKEND_TESSERACT:
+        return "the tesseract executable was not found on PATH"
+    if backend == OCR_BACKEND_POOL:
+        return "neither tesserocr nor the tesseract executable is available"
+    return ocr_dependency_message()
+
+
 def open_pdf(pdf_path: Path, password: str) -> Any:
     fitz_module = fitz
     if fitz_module is None:
@@ -242,7 +425,58 @@ def pixmap_to_image(pix: Any) -> Any:
     return converted
 
 
-def ocr_page(page: Any, dpi: int) -> str:
+def pixmap_to_gray_image(pix: Any, dpi: int) -> GrayImage:
+    """Take a single-channel pixmap's samples as a packed grayscale image, dropping any row padding."""
+    if pix.n != 1:
+        raise TextExtractionError(f"Direct Tesseract OCR needs a grayscale render; got {pix.n} channels.")
+    samples = bytes(pix.samples)
+    stride = getattr(pix, "stride", pix.width)
+    if stride != pix.width:
+        samples = b"".join(samples[row * stride : row * stride + pix.width] for row in range(pix.height))
+    return GrayImage(width=pix.width, height=pix.height, samples=samples, dpi=dpi)
+
+
+def pixmap_to_pgm(pix: Any) -> bytes:
+    """Wrap a single-channel pixmap in a binary PGM header without re-encoding its samples."""
+    return pixmap_to_gray_image(pix, 0).to_pgm()
+
+
+def run_tesseract(image_data: bytes, *, dpi: int, language: str | None, config: str) -> str:
+    """OCR an in-memory image by streaming it to the tesseract executable over stdin."""
+    tesseract_path = find_tesseract()
+    if tesseract_path is None:
+        raise TextExtractionError(f"OCR fallback is unavailable: {ocr_backend_message(OCR_BACKEND_TESSERACT)}.")
+    command = build_tesseract_command(tesseract_path, "stdin", dpi=dpi, language=language, config=config)
+    try:
+        return run_tesseract_command(command, input_data=image_data)
+    except ScriptError as exc:
+        raise TextExtractionError(str(exc)) from exc
+
+
+def render_ocr_pixmap(page: Any, dpi: int, backend: str) -> Any:
+    if backend in GRAYSCALE_OCR_BACKENDS and fitz is not None:
+        # One byte per pixel instead of three, and no alpha for Tesseract to flatten.
+        return page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    return page.get_pixmap(dpi=dpi, alpha=False)
+
+
+def ocr_page(
+    page: Any,
+    dpi: int,
+    *,
+    language: str | None = None,
+    config: str = "",
+    pix: Any | None = None,
+    backend: str = OCR_BACKEND_PYTESSERACT,
+    timer: PageTimer | None = None,
+) -> str:
+    if backend in GRAYSCALE_OCR_BACKENDS:
+        if pix is None:
+            with timed(timer, "render"):
+                pix = render_ocr_pixmap(page, dpi, backend)
+        with timed(timer, "ocr"):
+            return run_tesseract(pixmap_to_pgm(pix), dpi=dpi, language=language, config=config)
+
     load_ocr_dependencies()
     if not ocr_available():
         raise TextExtractionError(f"OCR fallback is unavailable: {ocr_dependency_message()}.")
@@ -250,12 +484,361 @@ def ocr_page(page: Any, dpi: int) -> str:
     if ocr_engine is None:
         raise TextExtractionError(f"OCR fallback is unavailable: {ocr_dependency_message()}.")
 
-    pix = page.get_pixmap(dpi=dpi, alpha=False)
-    image = pixmap_to_image(pix)
+    if pix is None:
+        with timed(timer, "render"):
+            pix = render_ocr_pixmap(page, dpi, backend)
+    options: dict[str, str] = {}
+    if language:
+        options["lang"] = language
+    if config:
+        options["config"] = config
+    with timed(timer, "ocr"):
+        image = pixmap_to_image(pix)
+        try:
+            return ocr_engine.image_to_string(image, **options)
+        finally:
+            image.close()
+
+
+def lookup_cached_ocr(
+    page: Any, ocr: OcrSettings, timer: PageTimer | None = None
+) -> tuple[str | None, str | None, Any | None]:
+    """Return cached text, the page's cache key, and any pixmap rendered to compute that key.
+
+    Pages with embedded images are keyed by their raw streams, so a cache hit
+    skips rendering entirely. Other pages are keyed by their rendered pixmap.
+    """
+    cache = ocr.cache
+    if cache is None:
+        return None, None, None
+    pix = None
+    source = "images"
+    with timed(timer, "cache"):
+        digest = page_image_digest(page)
+    if digest is None:
+        with timed(timer, "render"):
+            pix = render_ocr_pixmap(page, ocr.dpi, ocr.backend)
+        source = "pixmap"
+        with timed(timer, "cache"):
+            digest = pixmap_digest(pix)
+    key = ocr_cache_key(
+        digest, source=source, dpi=ocr.dpi, language=ocr.language, config=ocr.config, backend=ocr.backend
+    )
+    with timed(timer, "cache"):
+        return cache.get(key), key, pix
+
+
+def run_page_ocr(page: Any, ocr: OcrSettings, timer: PageTimer | None = None) -> tuple[str, bool]:
+    """OCR one page, reusing a cached result when the page content and settings are unchanged.
+
+    Returns the text and whether it came from the cache.
+    """
+    cached, key, pix = lookup_cached_ocr(page, ocr, timer)
+    if cached is not None:
+        return cached, True
+    text = ocr_page(page, ocr.dpi, language=ocr.language, config=ocr.config, pix=pix, backend=ocr.backend, timer=timer)
+    if ocr.cache is not None and key is not None:
+        with timed(timer, "cache"):
+            ocr.cache.put(key, text)
+    return text, False
+
+
+def queue_page_ocr(
+    page: Any, page_number: int, pool: TesseractPool, ocr: OcrSettings, timer: PageTimer | None = None
+) -> PageResult:
+    """Render a page in grayscale and hand it to the worker pool; the writer waits for the text."""
+    cached, key, pix = lookup_cached_ocr(page, ocr, timer)
+    if cached is not None:
+        return PageResult(page_number, cached, PAGE_OCR, cached=True, ocr_dpi=ocr.dpi)
+    if pix is None:
+        with timed(timer, "render"):
+            pix = render_ocr_pixmap(page, ocr.dpi, ocr.backend)
+    future = pool.submit(pixmap_to_gray_image(pix, ocr.dpi))
+    return PageResult(page_number, status=PAGE_OCR, pending=future, cache_key=key, ocr_dpi=ocr.dpi)
+
+
+def resolve_pending_ocr(results: Iterable[PageResult], ocr: OcrSettings, *, window: int) -> Iterator[PageResult]:
+    """Yield results in page order, waiting on pooled OCR while keeping at most window pages queued."""
+    queued: deque[PageResult] = deque()
+
+    def finish(result: PageResult) -> PageResult:
+        if result.pending is None:
+            return result
+        waiting = time.perf_counter()
+        try:
+            result.text = result.pending.result()
+        except Exception as exc:
+            return PageResult(
+                result.page_number, status=PAGE_FAILED, message=f"OCR failed: {exc}", reason=result.reason
+            )
+        if ocr.cache is not None and result.cache_key is not None:
+            ocr.cache.put(result.cache_key, result.text)
+        result.pending = None
+        waited = time.perf_counter() - waiting
+        result.seconds += waited
+        if result.timer is not None:
+            result.timer.add("ocr", waited)
+        return result
+
+    for result in results:
+        queued.append(result)
+        while queued and (len(queued) > window or queued[0].pending is None or queued[0].pending.done()):
+            yield finish(queued.popleft())
+    while queued:
+        yield finish(queued.popleft())
+
+
+def ocr_reason(profile: PageProfile) -> str:
+    if profile.kind == PAGE_KIND_GARBLED:
+        return "has a garbled text layer"
+    if profile.text.strip():
+        return "is a full-page scan with only a stray text layer"
+    return NO_TEXT_LAYER
+
+
+def page_ocr_settings(profile: PageProfile, ocr: OcrSettings) -> OcrSettings:
+    """Render at the scan's own resolution, capped at the configured DPI, unless the DPI is fixed."""
+    if ocr.fixed_dpi:
+        return ocr
+    return replace(ocr, dpi=adaptive_ocr_dpi(profile.native_dpi, ocr.dpi))
+
+
+def page_text_blocks(page: Any) -> list[tuple[float, float, float, float, str]]:
+    """Return the page's text blocks in reading order as (x0, y0, x1, y1, text), in PDF points."""
+    return [
+        (round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2), text.rstrip())
+        for x0, y0, x1, y1, text, _number, block_type in page.get_text("blocks")
+        if block_type == TEXT_BLOCK and text.strip()
+    ]
+
+
+def extract_page(
+    page: Any,
+    page_number: int,
+    *,
+    use_ocr: bool,
+    ocr: OcrSettings,
+    layout: bool = False,
+    timer: PageTimer | None = None,
+) -> PageResult:
+    """Extract and time one page; with layout, also record its size and, for text-layer pages, its text blocks.
+
+    OCR output has no block positions, so OCR pages are recorded without blocks.
+    Each stage's time is added to timer, or to a new timer for the page.
+    """
+    started = time.perf_counter()
+    if timer is None:
+        timer = PageTimer(page_number)
+    result = extract_page_text(page, page_number, use_ocr=use_ocr, ocr=ocr, timer=timer)
+    if layout and result.status != PAGE_FAILED:
+        try:
+            with timer.stage("layout"):
+                result.width, result.height = round(page.rect.width, 2), round(page.rect.height, 2)
+                if result.status == PAGE_TEXT:
+                    result.blocks = page_text_blocks(page)
+        except Exception as exc:
+            result = PageResult(page_number, status=PAGE_FAILED, message=f"Could not read page layout: {exc}")
+    result.seconds = time.perf_counter() - started
+    result.timer = timer
+    return result
+
+
+def extract_page_text(
+    page: Any, page_number: int, *, use_ocr: bool, ocr: OcrSettings, timer: PageTimer | None = None
+) -> PageResult:
+    """Extract one page, sending it to OCR when the classifier finds no usable text layer.
+
+    Pages whose garbled or stray text layer cannot be replaced by OCR keep
+    that text layer.
+    """
     try:
-        return ocr_engine.image_to_string(image)
-    finally:
-        image.close()
+        if not use_ocr:
+            with timed(timer, "text"):
+                text = page.get_text("text") or ""
+            if text.strip():
+                return PageResult(page_number, text)
+            return PageResult(page_number, text, PAGE_EMPTY, "OCR fallback disabled.")
+
+        with timed(timer, "classify"):
+            profile = classify_page(page)
+        if not profile.needs_ocr:
+            return PageResult(page_number, profile.text)
+        reason = ocr_reason(profile)
+        if ocr.pool is not None:
+            result = queue_page_ocr(page, page_number, ocr.pool, page_ocr_settings(profile, ocr), timer)
+            result.reason = reason
+            return result
+        if ocr_backend_available(ocr.backend):
+            page_ocr = page_ocr_settings(profile, ocr)
+            text, cached = run_page_ocr(page, page_ocr, timer)
+            return PageResult(page_number, text, PAGE_OCR, cached=cached, reason=reason, ocr_dpi=page_ocr.dpi)
+        message = f"OCR fallback unavailable: {ocr_backend_message(ocr.backend)}."
+        status = PAGE_TEXT if profile.text.strip() else PAGE_EMPTY
+        return PageResult(page_number, profile.text, status, message, logging.WARNING, reason=reason)
+    except Exception as exc:
+        return PageResult(page_number, status=PAGE_FAILED, message=str(exc))
+
+
+def iter_page_results(
+    doc: Any, page_indexes: Iterable[int], *, use_ocr: bool, ocr: OcrSettings, layout: bool = False
+) -> Iterator[PageResult]:
+    """Load and extract only the listed pages, so a short selection never touches the rest of the document."""
+    for page_index in page_indexes:
+        page_number = page_index + 1
+        timer = PageTimer(page_number)
+        try:
+            with timer.stage("load"):
+                page = doc.load_page(page_index)
+        except Exception as exc:
+            yield PageResult(page_number, status=PAGE_FAILED, message=str(exc), timer=timer)
+            continue
+        yield extract_page(page, page_number, use_ocr=use_ocr, ocr=ocr, layout=layout, timer=timer)
+
+
+def page_ranges(page_count: int, jobs: int) -> list[tuple[int, int]]:
+    """Split pages into small contiguous ranges so output can stream while workers stay busy."""
+    size = max(1, min(MAX_PAGES_PER_TASK, page_count // (jobs * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def extract_page_range(
+    page_indexes: tuple[int, ...],
+    *,
+    pdf_path: Path,
+    password: str,
+    use_ocr: bool,
+    ocr: OcrSettings,
+    layout: bool = False,
+) -> list[PageResult]:
+    """Extract a run of pages in a worker process using that worker's own document handle."""
+    doc = worker_document(pdf_path, password, open_pdf)
+    return list(iter_page_results(doc, page_indexes, use_ocr=use_ocr, ocr=ocr, layout=layout))
+
+
+def iter_parallel_page_results(
+    pdf_path: Path,
+    password: str,
+    page_indexes: Sequence[int],
+    *,
+    jobs: int,
+    use_ocr: bool,
+    ocr: OcrSettings,
+    layout: bool = False,
+) -> Iterator[PageResult]:
+    """Yield page results in page order while worker processes extract later ranges."""
+    runner = BatchRunner(jobs=jobs, backend="process", ordered=True)
+    worker = functools.partial(
+        extract_page_range,
+        pdf_path=pdf_path,
+        password=password,
+        use_ocr=use_ocr,
+        ocr=ocr,
+        layout=layout,
+    )
+    tasks = [tuple(page_indexes[start:stop]) for start, stop in page_ranges(len(page_indexes), jobs)]
+    for result in runner.run(worker, tasks):
+        if result.value is not None:
+            yield from result.value
+            continue
+        for page_index in result.item:
+            yield PageResult(page_index + 1, status=PAGE_FAILED, message=str(result.error))
+    if runner.interrupted:
+        raise KeyboardInterrupt
+
+
+def log_page_result(result: PageResult, total_pages: int, logger: logging.Logger) -> None:
+    logger.info("Processed page %d/%d", result.page_number, total_pages)
+    if result.status == PAGE_OCR and result.cached:
+        logger.info("Page %d %s; reused cached OCR text.", result.page_number, result.reason)
+    elif result.status == PAGE_OCR:
+        logger.info("Page %d %s; used OCR fallback at %s DPI.", result.page_number, result.reason, result.ocr_dpi)
+    elif result.status == PAGE_EMPTY:
+        logger.log(result.level, "Page %d %s; %s", result.page_number, result.reason, result.message)
+    elif result.status == PAGE_TEXT and result.message:
+        logger.log(result.level, "Page %d %s; kept it. %s", result.page_number, result.reason, result.message)
+    elif result.status == PAGE_FAILED:
+        logger.error("Error on page %d: %s", result.page_number, result.message)
+
+
+def page_record(result: PageResult) -> dict[str, Any]:
+    """Describe one page as a JSONL record: its text, layout blocks, OCR use, and extraction time."""
+    record: dict[str, Any] = {
+        "page": result.page_number,
+        "status": result.status,
+        "ocr": result.status == PAGE_OCR,
+        "ocr_dpi": result.ocr_dpi if result.status == PAGE_OCR else None,
+        "ocr_cached": result.cached,
+        "seconds": round(result.seconds, 6),
+        "width": result.width,
+        "height": result.height,
+        "text": result.text,
+        "blocks": [{"bbox": [x0, y0, x1, y1], "text": text} for x0, y0, x1, y1, text in result.blocks],
+    }
+    if result.status == PAGE_FAILED:
+        record["error"] = result.message
+    return record
+
+
+def write_page_results(
+    results: Iterable[PageResult],
+    output_path: Path,
+    summary: ExtractionSummary,
+    *,
+    logger: logging.Logger,
+    page_count: int | None = None,
+    output_format: str = FORMAT_TEXT,
+    chunk_writer: ChunkWriter | None = None,
+    profile: ProfileReport | None = None,
+    index_pages: PageSpool | None = None,
+) -> None:
+    """Write each page as it arrives, as plain text or as one JSONL record per page.
+
+    Failed pages are left out of text output but get a record with their error
+    in JSONL, so every selected page has exactly one line there. With a
+    chunk_writer, every written page is also passed on for chunking, and with
+    index_pages, every page with text is spooled for the search index. With a
+    profile, each page's stage timings, including the write, are added to it.
+    """
+    with temporary_output_path(output_path) as temporary_path:
+        with temporary_path.open("w", encoding="utf-8") as out_file:
+            for result in results:
+                log_page_result(result, page_count or summary.total_pages, logger)
+                timer = None
+                if profile is not None and result.timer is not None:
+                    timer = result.timer
+                    profile.add(timer)
+                with timed(timer, "write"):
+                    write_page_result(result, out_file, summary, output_format, chunk_writer, index_pages)
+
+
+def write_page_result(
+    result: PageResult,
+    out_file: TextIO,
+    summary: ExtractionSummary,
+    output_format: str,
+    chunk_writer: ChunkWriter | None,
+    index_pages: PageSpool | None = None,
+) -> None:
+    if output_format == FORMAT_JSONL:
+        out_file.write(json.dumps(page_record(result), ensure_ascii=False))
+        out_file.write("\n")
+    if result.status == PAGE_FAILED:
+        summary.failed_pages += 1
+        return
+    if result.status == PAGE_OCR:
+        summary.ocr_pages += 1
+        summary.cached_ocr_pages += result.cached
+    elif result.status == PAGE_EMPTY:
+        summary.empty_pages += 1
+    if chunk_writer is not None:
+        chunk_writer.add_page(result.page_number, result.text.rstrip())
+    if index_pages is not None and result.text.strip():
+        index_pages.append((result.page_number, result.text.rstrip()))
+    if output_format == FORMAT_TEXT:
+        out_file.write(result.text)
+        if not result.text.endswith("\n"):
+            out_file.write("\n")
+    summary.processed_pages += 1
 
 
 def extract_text_from_pdf(
@@ -266,53 +849,108 @@ def extract_text_from_pdf(
     use_ocr: bool,
     ocr_dpi: int,
     logger: logging.Logger,
+    jobs: int = DEFAULT_JOBS,
+    pdf_path: Path | None = None,
+    password: str = "",
+    ocr_language: str | None = None,
+    ocr_config: str = "",
+    ocr_cache: OcrCache | None = None,
+    ocr_backend: str = OCR_BACKEND_PYTESSERACT,
+    ocr_workers: int = 1,
+    fixed_ocr_dpi: bool = False,
+    page_indexes: Sequence[int] | None = None,
+    output_format: str = FORMAT_TEXT,
+    chunks: ChunkSettings | None = None,
+    profile: ProfileReport | None = None,
+    index_pages: PageSpool | None = None,
 ) -> ExtractionSummary:
-    summary = ExtractionSummary(total_pages=doc.page_count)
+    """Extract every page to output_path, in page order.
+
+    With jobs above one and a pdf_path, page ranges are extracted by worker
+    processes that each open their own document, and finished pages are
+    written as soon as every earlier page is ready. With the pool OCR backend,
+    pages are read in this process and OCR runs on persistent Tesseract
+    workers, again written in page order. Unless fixed_ocr_dpi is set,
+    ocr_dpi is the ceiling and scanned pages render at their own resolution.
+    page_indexes limits extraction to those 0-based pages. With the jsonl
+    output_format, each page is written as a record with its text blocks.
+    With chunks, the page text is also cut into overlapping chunks as it is
+    written, into the output's .chunks.jsonl file. With index_pages, each
+    page with text is spooled for the search index. With a profile, every
+    page's stage timings are collected into it.
+    """
+    if page_indexes is None:
+        page_indexes = range(doc.page_count)
+    summary = ExtractionSummary(total_pages=len(page_indexes))
     if output_path.exists() and not overwrite:
         raise TextExtractionError(f"Output already exists: {output_path}. Pass --overwrite to replace it.")
 
+    ocr = OcrSettings(
+        dpi=ocr_dpi,
+        fixed_dpi=fixed_ocr_dpi,
+        backend=ocr_backend,
+        language=ocr_language,
+        config=ocr_config,
+        cache=ocr_cache,
+    )
+    results: Iterator[PageResult]
+    layout = output_format == FORMAT_JSONL
+    if jobs > 1 and pdf_path is not None:
+        results = iter_parallel_page_results(
+            pdf_path, password, page_indexes, jobs=jobs, use_ocr=use_ocr, ocr=ocr, layout=layout
+        )
+    else:
+        if use_ocr and ocr_backend == OCR_BACKEND_POOL and ocr_backend_available(OCR_BACKEND_POOL):
+            try:
+                ocr.pool = TesseractPool(ocr_workers, language=ocr_language, config=ocr_config)
+            except ScriptError as exc:
+                raise TextExtractionError(str(exc)) from exc
+            logger.info("OCR worker pool: %d %s worker(s)", ocr_workers, ocr.pool.mode)
+        results = iter_page_results(doc, page_indexes, use_ocr=use_ocr, ocr=ocr, layout=layout)
+        if ocr.pool is not None:
+            results = resolve_pending_ocr(results, ocr, window=ocr_workers * OCR_PAGES_QUEUED_PER_WORKER)
+
     try:
-        with temporary_output_path(output_path) as temporary_path:
-            with temporary_path.open("w", encoding="utf-8") as out_file:
-                for page_index in range(doc.page_count):
-                    page_number = page_index + 1
-                    logger.info("Processing page %d/%d", page_number, doc.page_count)
-
-                    try:
-                        page = doc.load_page(page_index)
-                        text = page.get_text("text") or ""
-
-                        if not text.strip():
-                            if use_ocr and ocr_available():
-                                logger.info("Page %d has no text layer; running OCR fallback.", page_number)
-                                text = ocr_page(page, ocr_dpi)
-                                summary.ocr_pages += 1
-                            elif use_ocr:
-                                logger.warning(
-                                    "Page %d has no text layer; OCR fallback unavailable: %s.",
-                                    page_number,
-                                    ocr_dependency_message(),
-                                )
-                                summary.empty_pages += 1
-                            else:
-                                logger.info("Page %d has no text layer; OCR fallback disabled.", page_number)
-                                summary.empty_pages += 1
-
-                        out_file.write(text)
-                        if not text.endswith("\n"):
-                            out_file.write("\n")
-                        summary.processed_pages += 1
-                    except Exception as exc:
-                        logger.error("Error on page %d: %s", page_number, exc)
-                        summary.failed_pages += 1
+        with contextlib.ExitStack() as stack:
+            chunk_writer: ChunkWriter | None = None
+            if chunks is not None:
+                document = str(pdf_path if pdf_path is not None else output_path)
+                chunk_writer = stack.enter_context(open_chunk_writer(output_path, chunks, document))
+            write_page_results(
+                results,
+                output_path,
+                summary,
+                logger=logger,
+                page_count=doc.page_count,
+                output_format=output_format,
+                chunk_writer=chunk_writer,
+                profile=profile,
+                index_pages=index_pages,
+            )
     except ScriptError as exc:
         raise TextExtractionError(str(exc)) from exc
     except OSError as exc:
         raise TextExtractionError(f"Failed writing '{output_path}': {exc}") from exc
+    finally:
+        if ocr.pool is not None:
+            ocr.pool.close(cancel=sys.exc_info()[0] is not None)
 
     return summary
 
 
+def build_ocr_cache(args: argparse.Namespace) -> OcrCache | None:
+    if args.ocr_cache is None or args.no_ocr:
+        return None
+    if args.ocr_cache_size <= 0:
+        raise TextExtractionError(f"OCR cache size must be positive. Got {args.ocr_cache_size}")
+    cache = OcrCache(args.ocr_cache, max_bytes=args.ocr_cache_size * 1024 * 1024)
+    try:
+        cache.prepare()
+    except ScriptError as exc:
+        raise TextExtractionError(str(exc)) from exc
+    return cache
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
@@ -323,9 +961,31 @@ def main() -> int:
 
     logger = None
     doc = None
+    index = None
+    spool = None
 
     try:
-        pdf_path, output_path, log_path = build_paths(args)
+        try:
+            require_positive_int(args.jobs, label="Jobs")
+            require_positive_int(args.ocr_workers, label="OCR workers")
+        except ScriptError as exc:
+            raise TextExtractionError(str(exc)) from exc
+        if args.ocr_backend == OCR_BACKEND_POOL and args.jobs > 1:
+            raise TextExtractionError("--ocr-backend pool runs its own workers; use it with --jobs 1.")
+        pdf_path, output_path, log_path = build_paths(args, OUTPUT_SUFFIXES[args.format])
+        try:
+            chunks = chunk_settings_from_args(args)
+            validate_profile_args(args)
+        except ScriptError as exc:
+            raise TextExtractionError(str(exc)) from exc
+        profile = ProfileReport(PROFILE_STAGES) if args.profile is not None else None
+        ocr_cache = build_ocr_cache(args)
+        if args.index is not None:
+            try:
+                index = TextIndex.open(args.index)
+                spool = PageSpool.create()
+            except ScriptError as exc:
+                raise TextExtractionError(str(exc)) from exc
         logger = setup_logger(log_path, args.quiet)
         use_ocr = not args.no_ocr
 
@@ -335,6 +995,12 @@ def main() -> int:
 
         doc = open_pdf(pdf_path, args.password)
         logger.info("Opened PDF '%s' (%d pages)", pdf_path, doc.page_count)
+        try:
+            page_indexes = selected_page_indexes(args.pages, doc.page_count)
+        except ScriptError as exc:
+            raise TextExtractionError(str(exc)) from exc
+        if args.pages is not None:
+            logger.info("Selected pages: %s (%d of %d)", args.pages.spec, len(page_indexes), doc.page_count)
         summary = extract_text_from_pdf(
             doc,
             output_path,
@@ -342,16 +1008,50 @@ def main() -> int:
             use_ocr=use_ocr,
             ocr_dpi=args.ocr_dpi,
             logger=logger,
+            jobs=args.jobs,
+            pdf_path=pdf_path,
+            password=args.password,
+            ocr_language=args.ocr_language,
+            ocr_config=args.ocr_config,
+            ocr_cache=ocr_cache,
+            ocr_backend=resolve_ocr_backend(args.ocr_backend),
+            ocr_workers=args.ocr_workers,
+            fixed_ocr_dpi=args.fixed_ocr_dpi,
+            page_indexes=page_indexes,
+            output_format=args.format,
+            chunks=chunks,
+            profile=profile,
+            index_pages=spool,
         )
+        if index is not None and spool is not None:
+            try:
+                index.replace_document(pdf_path, spool, page_count=doc.page_count)
+            except ScriptError as exc:
+                raise TextExtractionError(str(exc)) from exc
+        if profile is not None:
+            try:
+                profile.write(args.profile)
+            except ScriptError as exc:
+                raise TextExtractionError(str(exc)) from exc
     except TextExtractionError as exc:
         if logger is None:
             print(f"Error: {exc}", file=sys.stderr)
         else:
             logger.error("%s", exc)
         return 1
+    except KeyboardInterrupt:
+        if logger is None:
+            print("Error: Interrupted by user.", file=sys.stderr)
+        else:
+            logger.error("Interrupted by user. No output was written.")
+        return 130
     finally:
         if doc is not None:
             doc.close()
+        if spool is not None:
+            spool.discard()
+        if index is not None:
+            index.close()
 
     logger.info(
         "Extraction complete. Processed: %d/%d | OCR pages: %d | Empty pages: %d | Failed pages: %d",
@@ -361,7 +1061,16 @@ def main() -> int:
         summary.empty_pages,
         summary.failed_pages,
     )
+    if ocr_cache is not None:
+        logger.info("OCR cache: %s | Reused pages: %d", ocr_cache.folder, summary.cached_ocr_pages)
     logger.info("Output: '%s'", output_path)
+    if spool is not None:
+        logger.info("Indexed pages: %d in '%s'", spool.pages, args.index)
+    if chunks is not None:
+        logger.info("Chunks: '%s' (%s)", chunks_path_for(output_path), chunks.describe())
+    if profile is not None:
+        profile.log_summary(args.profile_top, logger)
+        logger.info("Profile: '%s'", args.profile)
     return 1 if summary.failed_pages else 0
 
 
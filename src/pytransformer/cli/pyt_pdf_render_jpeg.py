@@ -4,12 +4,13 @@
 
 """
 Script: pyt_pdf_render_jpeg.py
-Purpose: Convert every page of one PDF into high-resolution JPEG images.
+Purpose: Convert every page, or a --pages selection, of one PDF into high-resolution JPEG images.
 When to use: Use when PDF pages need image files for review, OCR, or image workflows.
-Changes: Creates or updates an output folder containing page_*.jpg files.
-Inputs: PDF file path; optional --output-folder, --dpi, --quality, --overwrite, and --password.
+Changes: Creates or updates an output folder containing page_*.jpg files, or one subfolder per --variant.
+Inputs: PDF file path; optional --output-folder, --dpi, --quality, --variant, --memory-budget, --overwrite, --password,
+--pages, --jobs, --profile, and --profile-top.
 Environment variables: None.
-Dependencies: PyMuPDF.
+Dependencies: PyMuPDF; Pillow for WebP variants.
 Safety notes: Existing JPEG files are skipped unless --overwrite is passed.
 Example: pyt-pdf-render-jpeg --dpi 300 --quality 95 --output-folder "/path/to/output" "/path/to/file.pdf"
 Expected result: Numbered JPEG files rendered from the PDF pages.
@@ -19,14 +20,27 @@ Related scripts: pyt_pdf_extract_text.py, pyt_pdf_extract_selectable_text.py, py
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib
 import logging
+import struct
+import zlib
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-
-from pytransformer.core.common import build_command_parser, temporary_output_path
+from typing import Any, Sequence
+
+from pytransformer.core.batch import DEFAULT_JOBS, BatchRunner, add_jobs_argument
+from pytransformer.core.common import ScriptError, build_command_parser, require_positive_int, temporary_output_path
+from pytransformer.core.pages import add_pages_argument, selected_page_indexes
+from pytransformer.core.pdf_text import worker_document
+from pytransformer.core.profiling import (
+    PageTimer,
+    ProfileReport,
+    add_profile_arguments,
+    timed,
+    validate_profile_args,
+)
 
 fitz: Any | None
 FITZ_IMPORT_ERROR: ImportError | None
@@ -43,6 +57,19 @@ else:
 VALID_EXT = {".pdf"}
 DEFAULT_DPI = 300
 DEFAULT_QUALITY = 95
+# Parallel renders split the pages into this many interleaved subsets per job, so pages that are slow to render,
+# which tend to sit together, are spread over the workers and progress is reported as subsets finish.
+SUBSETS_PER_JOB = 4
+PAGE_SAVED = "saved"
+IMAGE_FORMATS = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+IMAGE_FORMAT_ALIASES = {"jpg": "jpeg"}
+PAGE_FAILED = "failed"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COMPRESSION_LEVEL = 6
+BYTES_PER_MB = 1024 * 1024
+# Stages timed for each page, in the order --profile reports them; "bands" covers rendering and writing a banded PNG.
+PROFILE_STAGES = ("load", "render", "bands", "scale", "save")
 
 
 class ConversionError(RuntimeError):
@@ -56,6 +83,26 @@ class ConversionSummary:
     failed: int = 0
 
 
+@dataclass
+class PageOutcome:
+    page_number: int
+    status: str
+    message: str = ""
+    name: str = ""
+    # Stage timings for the whole page, carried by the first outcome of each page only.
+    timer: PageTimer | None = None
+
+
+@dataclass(frozen=True)
+class RenderVariant:
+    """One output per page: a resolution, an image format, and a quality, written to its own folder."""
+
+    dpi: int
+    image_format: str
+    quality: int = DEFAULT_QUALITY
+    folder: str | None = None
+
+
 def setup_logger(quiet: bool) -> None:
     logging.basicConfig(
         level=logging.ERROR if quiet else logging.INFO,
@@ -71,6 +118,10 @@ def build_parser() -> argparse.ArgumentParser:
         examples=(
             'pyt-pdf-render-jpeg --dpi 300 "/path/to/file.pdf"',
             'pyt-pdf-render-jpeg --quality 95 --output-folder "/path/to/pages" "/path/to/file.pdf"',
+            'pyt-pdf-render-jpeg --pages 1,-1 "/path/to/file.pdf"',
+            'pyt-pdf-render-jpeg --jobs 4 --dpi 300 "/path/to/large.pdf"',
+            'pyt-pdf-render-jpeg --variant 300:jpeg:95 --variant 72:webp:80 "/path/to/file.pdf"',
+            'pyt-pdf-render-jpeg --profile "/path/to/timings.csv" "/path/to/slow.pdf"',
         ),
     )
     parser.add_argument("pdf_file", type=Path, help="Path to the input PDF.")
@@ -87,9 +138,31 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_QUALITY,
         help=f"JPEG quality 1-100 (default {DEFAULT_QUALITY}).",
     )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        type=variant_argument,
+        metavar="DPI:FORMAT[:QUALITY]",
+        help="Write an extra resolution and format, such as 72:webp:80, into a DPI_FORMAT subfolder. Repeat for "
+        "several outputs; each page is rendered once at the highest DPI and downscaled for the others. Replaces "
+        "--dpi and --quality. Formats: jpeg, png, webp.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Render pages whose image would exceed this many MB in horizontal bands streamed into PNG output, so "
+        "peak memory stays near the budget for any page size. Use with a png --variant; JPEG and WebP cannot be "
+        "written in bands, so those outputs fail for pages over the budget. Defaults to no limit.",
+    )
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing images if present.")
     parser.add_argument("--quiet", action="store_true", help="Only print errors.")
     parser.add_argument("--password", default="", help="Password for encrypted PDFs.")
+    add_pages_argument(parser)
+    add_jobs_argument(
+        parser, help_text=f"Number of worker processes rendering pages in parallel (default {DEFAULT_JOBS})."
+    )
+    add_profile_arguments(parser)
     return parser
 
 
@@ -156,49 +229,446 @@ def save_pixmap_jpeg(pix: Any, out_path: Path, quality: int) -> None:
         pix.save(str(out_path), quality=quality)
 
 
+def variant_argument(value: str) -> RenderVariant:
+    try:
+        return parse_variant(value)
+    except ConversionError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def parse_variant(value: str) -> RenderVariant:
+    """Parse a --variant value such as ``300:jpeg:95``, ``72:webp:80``, or ``150:png``."""
+    parts = value.split(":")
+    if len(parts) not in (2, 3):
+        raise ConversionError(f"Invalid variant {value!r}; use DPI:FORMAT or DPI:FORMAT:QUALITY, such as 72:webp:80.")
+    image_format = IMAGE_FORMAT_ALIASES.get(parts[1].lower(), parts[1].lower())
+    if image_format not in IMAGE_FORMATS:
+        expected = ", ".join(IMAGE_FORMATS)
+        raise ConversionError(f"Variant format must be one of {expected}. Got {parts[1]!r}.")
+    try:
+        dpi = int(parts[0])
+        quality = int(parts[2]) if len(parts) == 3 else DEFAULT_QUALITY
+    except ValueError as exc:
+        raise ConversionError(f"Variant DPI and quality must be whole numbers. Got {value!r}.") from exc
+    if dpi <= 0:
+        raise ConversionError(f"Variant DPI must be positive. Got {dpi}")
+    if not (1 <= quality <= 100):
+        raise ConversionError(f"Variant quality must be between 1 and 100. Got {quality}")
+    return RenderVariant(dpi, image_format, quality, folder=f"{dpi}dpi_{image_format}")
+
+
+def default_variants(dpi: int, quality: int) -> tuple[RenderVariant, ...]:
+    """The output written when no --variant is given: page_N.jpg files directly in the output folder."""
+    return (RenderVariant(dpi, "jpeg", quality),)
+
+
+def load_pillow_image() -> Any:
+    try:
+        return importlib.import_module("PIL.Image")
+    except ImportError as exc:
+        raise ConversionError("WebP output needs Pillow. Install it with: pip install pillow") from exc
+
+
+def page_output_path(dest_dir: Path, page_index: int, digits: int, variant: RenderVariant | None = None) -> Path:
+    folder = dest_dir / variant.folder if variant is not None and variant.folder else dest_dir
+    extension = IMAGE_FORMATS[variant.image_format] if variant is not None else ".jpg"
+    return folder / f"page_{page_index + 1:0{digits}d}{extension}"
+
+
+def output_label(path: Path, variant: RenderVariant) -> str:
+    return f"{variant.folder}/{path.name}" if variant.folder else path.name
+
+
+def downscale_pixmap(pix: Any, scale: float) -> Any:
+    """Return a smaller copy of pix; exact halvings use MuPDF's box-filtered shrink, other ratios its scaler."""
+    fitz_module = fitz
+    if fitz_module is None:
+        raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+    width = max(1, round(pix.width * scale))
+    height = max(1, round(pix.height * scale))
+    factor = pix.width / width
+    if factor.is_integer() and int(factor).bit_count() == 1 and pix.height / height == factor:
+        shrunk = fitz_module.Pixmap(pix)
+        shrunk.shrink(int(factor).bit_length() - 1)
+        return shrunk
+    return fitz_module.Pixmap(pix, width, height)
+
+
+def save_variant(pix: Any, out_path: Path, variant: RenderVariant) -> None:
+    if variant.image_format == "jpeg":
+        save_pixmap_jpeg(pix, out_path, variant.quality)
+    elif variant.image_format == "png":
+        pix.save(str(out_path), output="png")
+    else:
+        image = load_pillow_image().frombytes("RGB", (pix.width, pix.height), pix.samples, "raw", "RGB", pix.stride)
+        try:
+            image.save(out_path, format="WEBP", quality=variant.quality)
+        finally:
+            image.close()
+
+
+def pixmap_size(page: Any, dpi: int) -> tuple[int, int]:
+    """Return the width and height in pixels of the page rendered at dpi, without rendering it."""
+    fitz_module = fitz
+    if fitz_module is None:
+        raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+    irect = (page.rect * fitz_module.Matrix(dpi / 72.0, dpi / 72.0)).irect
+    return irect.width, irect.height
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def write_png_in_bands(page: Any, out_path: Path, dpi: int, memory_budget: int) -> None:
+    """Render page at dpi as horizontal bands and stream them into an RGB PNG at out_path.
+
+    Each band is rendered with a clip rectangle and fed to zlib row by row
+    straight from the pixmap's buffer, so only one band's pixels are in
+    memory at a time. MuPDF snaps each clip to whole device pixels, so the
+    bands join without gaps or overlaps.
+    """
+    fitz_module = fitz
+    if fitz_module is None:
+        raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+    zoom = dpi / 72.0
+    matrix = fitz_module.Matrix(zoom, zoom)
+    width, height = pixmap_size(page, dpi)
+    row_bytes = width * 3
+    rows_per_band = max(1, memory_budget // row_bytes)
+    rect = page.rect
+    pixels_per_meter = round(dpi / 0.0254)
+    compressor = zlib.compressobj(PNG_COMPRESSION_LEVEL)
+    with out_path.open("wb") as handle:
+        handle.write(PNG_SIGNATURE)
+        handle.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        handle.write(png_chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1)))
+        for top in range(0, height, rows_per_band):
+            bottom = min(height, top + rows_per_band)
+            clip = fitz_module.Rect(rect.x0, rect.y0 + top / zoom, rect.x1, rect.y0 + bottom / zoom)
+            band = page.get_pixmap(matrix=matrix, clip=clip, alpha=False)
+            if (band.width, band.height, band.n) != (width, bottom - top, 3):
+                raise ConversionError(
+                    f"Band render returned {band.width}x{band.height} pixels; expected {width}x{bottom - top}."
+                )
+            # A view of our own over PyMuPDF's cached one, so releasing it leaves the pixmap's view intact.
+            samples = memoryview(band.samples_mv)
+            stride = band.stride
+            for row in range(band.height):
+                # Filter type 0 (None): each row is a zero byte followed by its RGB samples.
+                data = compressor.compress(b"\x00") + compressor.compress(
+                    samples[row * stride : row * stride + row_bytes]
+                )
+                if data:
+                    handle.write(png_chunk(b"IDAT", data))
+            samples.release()
+            del band
+        handle.write(png_chunk(b"IDAT", compressor.flush()))
+        handle.write(png_chunk(b"IEND", b""))
+
+
+def render_page_in_bands(
+    page: Any,
+    page_number: int,
+    targets: Sequence[tuple[RenderVariant, Path]],
+    memory_budget: int,
+    timer: PageTimer | None = None,
+) -> list[PageOutcome]:
+    """Write each target of a page that is too large to render whole within the memory budget.
+
+    Targets that fit are rendered whole at their own DPI. Larger PNG targets
+    are streamed in bands; larger JPEG and WebP targets fail, because their
+    encoders need the whole image at once.
+    """
+    outcomes: list[PageOutcome] = []
+    for variant, out_path in targets:
+        label = output_label(out_path, variant)
+        try:
+            width, height = pixmap_size(page, variant.dpi)
+            if width * height * 3 <= memory_budget:
+                fitz_module = fitz
+                if fitz_module is None:
+                    raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+                zoom = variant.dpi / 72.0
+                with timed(timer, "render"):
+                    pix = page.get_pixmap(matrix=fitz_module.Matrix(zoom, zoom), alpha=False)
+                with timed(timer, "save"), temporary_output_path(out_path) as temporary_path:
+                    save_variant(pix, temporary_path, variant)
+            elif variant.image_format == "png":
+                with timed(timer, "bands"), temporary_output_path(out_path) as temporary_path:
+                    write_png_in_bands(page, temporary_path, variant.dpi, memory_budget)
+            else:
+                needed = width * height * 3 / BYTES_PER_MB
+                raise ConversionError(
+                    f"A {width}x{height} image needs about {needed:.0f} MB, more than --memory-budget allows, and "
+                    f"{variant.image_format} cannot be written in bands. Use a png --variant or a lower DPI."
+                )
+        except Exception as exc:
+            outcomes.append(PageOutcome(page_number, PAGE_FAILED, str(exc), label))
+            continue
+        outcomes.append(PageOutcome(page_number, PAGE_SAVED, name=label))
+    return outcomes
+
+
+def render_page(
+    doc: Any,
+    page_index: int,
+    targets: Sequence[tuple[RenderVariant, Path]],
+    memory_budget_mb: int | None = None,
+) -> list[PageOutcome]:
+    """Render one page once, at the highest target DPI, and write every target from that render.
+
+    Lower-DPI targets are downscaled from the same pixmap instead of being
+    rendered again. With a memory budget, a page whose render would exceed it
+    is handed to render_page_in_bands instead. Failures are reported on the
+    outcomes instead of raised. The first outcome carries the page's stage
+    timings.
+    """
+    timer = PageTimer(page_index + 1)
+    outcomes = render_page_targets(doc, page_index, targets, memory_budget_mb, timer)
+    if outcomes:
+        outcomes[0].timer = timer
+    return outcomes
+
+
+def render_page_targets(
+    doc: Any,
+    page_index: int,
+    targets: Sequence[tuple[RenderVariant, Path]],
+    memory_budget_mb: int | None,
+    timer: PageTimer,
+) -> list[PageOutcome]:
+    page_number = page_index + 1
+    top_dpi = max(variant.dpi for variant, _out_path in targets)
+    try:
+        fitz_module = fitz
+        if fitz_module is None:
+            raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+        with timer.stage("load"):
+            page = doc.load_page(page_index)
+        if memory_budget_mb is not None:
+            memory_budget = memory_budget_mb * BYTES_PER_MB
+            width, height = pixmap_size(page, top_dpi)
+            if width * height * 3 > memory_budget:
+                return render_page_in_bands(page, page_number, targets, memory_budget, timer)
+        zoom = top_dpi / 72.0
+        with timer.stage("render"):
+            pix = page.get_pixmap(matrix=fitz_module.Matrix(zoom, zoom), alpha=False)
+    except Exception as exc:
+        return [
+            PageOutcome(page_number, PAGE_FAILED, str(exc), output_label(out_path, variant))
+            for variant, out_path in targets
+        ]
+
+    outcomes: list[PageOutcome] = []
+    for variant, out_path in targets:
+        label = output_label(out_path, variant)
+        try:
+            image = pix
+            if variant.dpi != top_dpi:
+                with timer.stage("scale"):
+                    image = downscale_pixmap(pix, variant.dpi / top_dpi)
+            with timer.stage("save"), temporary_output_path(out_path) as temporary_path:
+                save_variant(image, temporary_path, variant)
+        except Exception as exc:
+            outcomes.append(PageOutcome(page_number, PAGE_FAILED, str(exc), label))
+            continue
+        outcomes.append(PageOutcome(page_number, PAGE_SAVED, name=label))
+    return outcomes
+
+
+def render_page_subset(
+    tasks: tuple[tuple[int, tuple[int, ...]], ...],
+    *,
+    pdf_path: Path,
+    password: str,
+    dest_dir: Path,
+    variants: tuple[RenderVariant, ...],
+    digits: int,
+    memory_budget_mb: int | None = None,
+) -> list[PageOutcome]:
+    """Render a subset of pages in a worker process using that worker's own document handle."""
+    doc = worker_document(pdf_path, password, open_pdf)
+    outcomes: list[PageOutcome] = []
+    for page_index, variant_ids in tasks:
+        targets = [
+            (variants[variant_id], page_output_path(dest_dir, page_index, digits, variants[variant_id]))
+            for variant_id in variant_ids
+        ]
+        outcomes.extend(render_page(doc, page_index, targets, memory_budget_mb))
+    return outcomes
+
+
+def record_page_outcome(
+    outcome: PageOutcome, summary: ConversionSummary, total_pages: int, profile: ProfileReport | None = None
+) -> None:
+    if profile is not None and outcome.timer is not None:
+        profile.add(outcome.timer)
+    if outcome.status == PAGE_FAILED:
+        logging.error("Failed to convert page %d (%s): %s", outcome.page_number, outcome.name, outcome.message)
+        summary.failed += 1
+        return
+    summary.saved += 1
+    logging.info("Saved %s (%d of %d)", outcome.name, outcome.page_number, total_pages)
+
+
+def pages_to_render(
+    dest_dir: Path,
+    page_indexes: Sequence[int],
+    digits: int,
+    overwrite: bool,
+    summary: ConversionSummary,
+    variants: Sequence[RenderVariant],
+) -> list[tuple[int, tuple[int, ...]]]:
+    """Pair each page with the variants it still needs, counting existing files as skipped unless overwrite is set.
+
+    Pages whose files all exist are left out, so they are never rendered.
+    """
+    pending: list[tuple[int, tuple[int, ...]]] = []
+    for idx in page_indexes:
+        variant_ids: list[int] = []
+        for variant_id, variant in enumerate(variants):
+            out_path = page_output_path(dest_dir, idx, digits, variant)
+            if out_path.exists() and not overwrite:
+                logging.warning("Skipping existing file: %s", output_label(out_path, variant))
+                summary.skipped += 1
+                continue
+            variant_ids.append(variant_id)
+        if variant_ids:
+            pending.append((idx, tuple(variant_ids)))
+    return pending
+
+
+def prepare_variant_folders(dest_dir: Path, variants: Sequence[RenderVariant]) -> None:
+    for variant in variants:
+        if variant.folder is None:
+            continue
+        try:
+            (dest_dir / variant.folder).mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise ConversionError(
+                f"Could not create destination directory: {dest_dir / variant.folder} ({exc})"
+            ) from exc
+
+
+def log_render_settings(variants: Sequence[RenderVariant]) -> None:
+    for variant in variants:
+        if variant.folder is None:
+            logging.info("Rendering at ~%d DPI, JPEG quality %d", variant.dpi, variant.quality)
+        elif variant.image_format == "png":
+            logging.info("Output %s: ~%d DPI, lossless PNG", variant.folder, variant.dpi)
+        else:
+            logging.info(
+                "Output %s: ~%d DPI, %s quality %d", variant.folder, variant.dpi, variant.image_format, variant.quality
+            )
+
+
 def convert_pdf_to_images(
     doc: Any,
     dest_dir: Path,
     dpi: int,
     quality: int,
     overwrite: bool,
+    page_indexes: Sequence[int] | None = None,
+    variants: Sequence[RenderVariant] | None = None,
+    memory_budget_mb: int | None = None,
+    profile: ProfileReport | None = None,
 ) -> ConversionSummary:
-    fitz_module = fitz
-    if fitz_module is None:
-        raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+    """Render pages to page_N.jpg files; page_indexes limits rendering to those 0-based pages.
 
-    zoom = dpi / 72.0
-    matrix = fitz_module.Matrix(zoom, zoom)
+    With variants, each page is rendered once and written in every variant's
+    folder, format, and resolution instead; dpi and quality are then unused.
+    With a profile, each rendered page's stage timings are added to it.
+    """
+    if fitz is None:
+        raise ConversionError("PyMuPDF is required. Install it with: pip install pymupdf")
+    if variants is None:
+        variants = default_variants(dpi, quality)
 
     total_pages = doc.page_count
+    # File names are padded for the whole document so a partial render sorts with a full one.
     digits = len(str(total_pages))
     summary = ConversionSummary()
+    if page_indexes is None:
+        page_indexes = range(total_pages)
 
-    logging.info("Pages to process: %d", total_pages)
-    logging.info("Rendering at ~%d DPI, JPEG quality %d", dpi, quality)
+    logging.info("Pages to process: %d", len(page_indexes))
+    log_render_settings(variants)
+    prepare_variant_folders(dest_dir, variants)
 
-    for idx in range(total_pages):
-        page_num = idx + 1
-        out_path = dest_dir / f"page_{page_num:0{digits}d}.jpg"
+    for idx, variant_ids in pages_to_render(dest_dir, page_indexes, digits, overwrite, summary, variants):
+        targets = [
+            (variants[variant_id], page_output_path(dest_dir, idx, digits, variants[variant_id]))
+            for variant_id in variant_ids
+        ]
+        for outcome in render_page(doc, idx, targets, memory_budget_mb):
+            record_page_outcome(outcome, summary, total_pages, profile)
 
-        if out_path.exists() and not overwrite:
-            logging.warning("Skipping existing file: %s", out_path.name)
-            summary.skipped += 1
-            continue
+    return summary
 
-        try:
-            page = doc.load_page(idx)
-            pix = page.get_pixmap(matrix=matrix, alpha=False)
-            with temporary_output_path(out_path) as temporary_path:
-                save_pixmap_jpeg(pix, temporary_path, quality)
-        except Exception as exc:
-            logging.error("Failed to convert page %d: %s", page_num, exc)
-            summary.failed += 1
-            continue
 
-        summary.saved += 1
-        logging.info("Saved %s (%d of %d)", out_path.name, page_num, total_pages)
+def convert_pdf_to_images_parallel(
+    pdf_path: Path,
+    password: str,
+    total_pages: int,
+    dest_dir: Path,
+    dpi: int,
+    quality: int,
+    overwrite: bool,
+    page_indexes: Sequence[int] | None = None,
+    *,
+    jobs: int,
+    variants: Sequence[RenderVariant] | None = None,
+    memory_budget_mb: int | None = None,
+    profile: ProfileReport | None = None,
+) -> ConversionSummary:
+    """Render pages like convert_pdf_to_images, in worker processes that each open the PDF themselves.
 
+    Pages are dealt into interleaved subsets (1, 1+n, 1+2n, ...), and results
+    are logged as each subset finishes, so log lines are not in page order.
+    Existing files are skipped up front, before any work is sent to workers.
+    """
+    variants = tuple(variants) if variants is not None else default_variants(dpi, quality)
+    digits = len(str(total_pages))
+    summary = ConversionSummary()
+    if page_indexes is None:
+        page_indexes = range(total_pages)
+
+    logging.info("Pages to process: %d", len(page_indexes))
+    log_render_settings(variants)
+    logging.info("Worker processes: %d", jobs)
+    prepare_variant_folders(dest_dir, variants)
+
+    pending = pages_to_render(dest_dir, page_indexes, digits, overwrite, summary, variants)
+    subset_count = min(len(pending), jobs * SUBSETS_PER_JOB)
+    subsets = [tuple(pending[start::subset_count]) for start in range(subset_count)]
+    runner = BatchRunner(jobs=jobs, backend="process", ordered=False)
+    worker = functools.partial(
+        render_page_subset,
+        pdf_path=pdf_path,
+        password=password,
+        dest_dir=dest_dir,
+        variants=variants,
+        digits=digits,
+        memory_budget_mb=memory_budget_mb,
+    )
+    for result in runner.run(worker, subsets):
+        outcomes = result.value
+        if outcomes is None:
+            outcomes = [
+                PageOutcome(
+                    idx + 1,
+                    PAGE_FAILED,
+                    str(result.error),
+                    output_label(page_output_path(dest_dir, idx, digits, variants[variant_id]), variants[variant_id]),
+                )
+                for idx, variant_ids in result.item
+                for variant_id in variant_ids
+            ]
+        for outcome in outcomes:
+            record_page_outcome(outcome, summary, total_pages, profile)
+    if runner.interrupted:
+        raise KeyboardInterrupt
     return summary
 
 
@@ -225,15 +695,68 @@ def main() -> int:
         else:
             dest_dir = args.output_folder.expanduser().resolve()
         validate_inputs(pdf_path, dest_dir, args.quality, args.dpi)
+        try:
+            require_positive_int(args.jobs, label="Jobs")
+            if args.memory_budget is not None:
+                require_positive_int(args.memory_budget, label="Memory budget")
+            validate_profile_args(args)
+        except ScriptError as exc:
+            raise ConversionError(str(exc)) from exc
+        profile = ProfileReport(PROFILE_STAGES) if args.profile is not None else None
+        variants = tuple(args.variant) if args.variant else None
+        if variants is not None:
+            folders = [variant.folder for variant in variants]
+            if len(set(folders)) != len(folders):
+                raise ConversionError("Each --variant needs a different DPI and format.")
+            if any(variant.image_format == "webp" for variant in variants):
+                load_pillow_image()
 
         logging.info("PDF: %s", pdf_path)
         logging.info("Output directory: %s", dest_dir)
 
         doc = open_pdf(pdf_path, args.password)
-        summary = convert_pdf_to_images(doc, dest_dir, args.dpi, args.quality, args.overwrite)
+        try:
+            page_indexes = selected_page_indexes(args.pages, doc.page_count)
+        except ScriptError as exc:
+            raise ConversionError(str(exc)) from exc
+        if args.jobs > 1:
+            summary = convert_pdf_to_images_parallel(
+                pdf_path,
+                args.password,
+                doc.page_count,
+                dest_dir,
+                args.dpi,
+                args.quality,
+                args.overwrite,
+                page_indexes,
+                jobs=args.jobs,
+                variants=variants,
+                memory_budget_mb=args.memory_budget,
+                profile=profile,
+            )
+        else:
+            summary = convert_pdf_to_images(
+                doc,
+                dest_dir,
+                args.dpi,
+                args.quality,
+                args.overwrite,
+                page_indexes,
+                variants,
+                args.memory_budget,
+                profile=profile,
+            )
+        if profile is not None:
+            try:
+                profile.write(args.profile)
+            except ScriptError as exc:
+                raise ConversionError(str(exc)) from exc
     except ConversionError as exc:
         logging.error("%s", exc)
         return 1
+    except KeyboardInterrupt:
+        logging.error("Interrupted by user.")
+        return 130
     finally:
         if doc is not None:
             doc.close()
@@ -244,6 +767,9 @@ def main() -> int:
         summary.skipped,
         summary.failed,
     )
+    if profile is not None:
+        profile.log_summary(args.profile_top)
+        logging.info("Profile: %s", args.profile)
     return 1 if summary.failed else 0
 
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""
+Script: pyt_pdf_search.py
+Purpose: Search the page text of PDFs added to a SQLite full-text index by the PDF text extractors.
+When to use: Use to find which PDFs and pages mention a word or phrase after extracting text with --index.
+Changes: Read-only; prints matching pages to standard output.
+Inputs: Index database path and a query; optional --limit and --raw.
+Environment variables: None.
+Dependencies: None beyond Python's sqlite3 module built with FTS5.
+Safety notes: Does not modify the index or any PDF.
+Example: pyt-pdf-search "/path/to/pages.sqlite" "quarterly revenue"
+Expected result: One line per matching page, best match first, as path, page number, and an excerpt.
+Related scripts: pyt_pdf_extract_selectable_text.py, pyt_pdf_extract_selectable_text_batch.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from pytransformer.core.common import ScriptError, build_command_parser, fail, require_positive_int
+from pytransformer.core.text_index import SearchHit, TextIndex
+
+DEFAULT_LIMIT = 20
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = build_command_parser(
+        description="Search PDF page text in an index built with --index.",
+        examples=(
+            'pyt-pdf-search "/path/to/pages.sqlite" "quarterly revenue"',
+            'pyt-pdf-search --limit 100 "/path/to/pages.sqlite" "invoice"',
+            'pyt-pdf-search --raw "/path/to/pages.sqlite" \'"net income" OR ebitda\'',
+        ),
+    )
+    parser.add_argument("index", type=Path, help="Path to the SQLite search index.")
+    parser.add_argument("query", help="Words that must all appear on a matching page, in any order.")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help=f"Maximum number of pages to print (default {DEFAULT_LIMIT}).",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help='Pass the query to SQLite FTS5 unchanged, for "exact phrases", OR, NOT, NEAR(), and prefix* searches.',
+    )
+    return parser
+
+
+def print_hits(hits: list[SearchHit]) -> None:
+    if not hits:
+        print("No matching pages.")
+        return
+    for hit in hits:
+        print(f"{hit.path}:{hit.page_number}: {hit.snippet}")
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    try:
+        require_positive_int(args.limit, label="Limit")
+        with TextIndex.open(args.index, create=False) as index:
+            hits = index.search(args.query, limit=args.limit, raw=args.raw)
+    except ScriptError as exc:
+        return fail(str(exc), code=2)
+
+    print_hits(hits)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,38 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2026 Paul Tocatlian
 
-"""Audio extraction and transcription helpers for PyTransformer MP4 commands."""
+"""Audio extraction, speech engine registry, and transcription helpers for PyTransformer MP4 commands."""
 
 from __future__ import annotations
 
+import argparse
+import functools
 import importlib
+import importlib.util
+import json
+import logging
+import shutil
 import tempfile
+import time
+import wave
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from pytransformer.core.common import ScriptError
+from pytransformer.core.batch import BatchRunner
+from pytransformer.core.boundaries import (
+    DEFAULT_SILENCE_THRESHOLD_DB,
+    DEFAULT_SNAP_WINDOW,
+    SNAP_SILENCE,
+    SnapSettings,
+    find_cut_candidates,
+    plan_chunk_ranges,
+)
+from pytransformer.core.common import ScriptError, require_positive_int
+from pytransformer.core.ffmpeg import FFMPEG_COMMAND, FFMPEG_QUIET_ARGS, require_ffmpeg, run_ffmpeg
 
 sr: Any | None
-AudioFileClip: Any | None
 SPEECH_RECOGNITION_IMPORT_ERROR: ImportError | None
-MOVIEPY_IMPORT_ERROR: ImportError | None
 
 try:
     sr = importlib.import_module("speech_recognition")
@@ -25,41 +42,220 @@ except ImportError as exc:
 else:
     SPEECH_RECOGNITION_IMPORT_ERROR = None
 
-try:
-    moviepy_editor = importlib.import_module("moviepy.editor")
-except ImportError as first_import_error:
-    try:
-        moviepy_module = importlib.import_module("moviepy")
-    except ImportError:
-        AudioFileClip = None
-        MOVIEPY_IMPORT_ERROR = first_import_error
-    else:
-        AudioFileClip = moviepy_module.AudioFileClip
-        MOVIEPY_IMPORT_ERROR = None
-else:
-    AudioFileClip = moviepy_editor.AudioFileClip
-    MOVIEPY_IMPORT_ERROR = None
+EXTRACTOR_AUTO = "auto"
+EXTRACTOR_FFMPEG = "ffmpeg"
+EXTRACTOR_MOVIEPY = "moviepy"
+AUDIO_EXTRACTORS = (EXTRACTOR_AUTO, EXTRACTOR_FFMPEG, EXTRACTOR_MOVIEPY)
+# Speech engines work on 16 kHz mono 16-bit PCM; anything richer only makes the temporary WAV larger.
+SPEECH_SAMPLE_RATE = 16000
+UNRECOGNIZED_TEXT = "Speech recognition could not understand the audio."
+ENGINE_GOOGLE = "google"
+ENGINE_VOSK = "vosk"
+DEFAULT_ENGINE = ENGINE_GOOGLE
+# Frames handed to Vosk per call: a quarter second at 16 kHz.
+VOSK_READ_FRAMES = 4000
+# Google Web Speech rejects or times out on long requests, so windows stay well under a minute by default.
+MIN_WINDOW_SECONDS = 5.0
+DEFAULT_WINDOW_JOBS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 1.0
+
+# Takes one WAV file and returns its text, or "" when no speech is understood; raises RecognitionRequestError for
+# failures worth retrying.
+Recognizer = Callable[[Path], str]
+
+
+class RecognitionRequestError(ScriptError):
+    """A speech service request failed in a way that may succeed if it is sent again."""
+
+
+@dataclass(frozen=True)
+class SpeechEngine:
+    """A speech recognition backend: whether it is installed, and how to load it once into a Recognizer.
+
+    load takes the recognition language and the --model path and does any
+    slow setup, such as reading a model from disk, before returning.
+    """
+
+    description: str
+    missing_message: str
+    available: Callable[[], bool]
+    load: Callable[[str, Path | None], Recognizer]
+
+
+@dataclass(frozen=True)
+class WindowSettings:
+    seconds: float
+    jobs: int = DEFAULT_WINDOW_JOBS
+    retries: int = DEFAULT_RETRIES
+    retry_delay: float = DEFAULT_RETRY_DELAY
+    silence_threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB
+
+    @property
+    def snap_window(self) -> float:
+        """How far a window edge may move to land in a silence; a quarter window at most, so no window collapses."""
+        return min(DEFAULT_SNAP_WINDOW, self.seconds / 4)
+
+
+def add_audio_extractor_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--audio-extractor",
+        choices=AUDIO_EXTRACTORS,
+        default=EXTRACTOR_AUTO,
+        help="How to pull the audio out of each MP4: one direct FFmpeg run, or moviepy. auto, the default, uses "
+        "FFmpeg when it is on PATH.",
+    )
+
+
+def add_speech_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--engine",
+        choices=tuple(SPEECH_ENGINES),
+        default=DEFAULT_ENGINE,
+        help=f"Speech recognition engine (default {DEFAULT_ENGINE}). "
+        + " ".join(f"'{name}': {engine.description}." for name, engine in SPEECH_ENGINES.items()),
+    )
+    parser.add_argument(
+        "--model",
+        type=Path,
+        help="Model folder for offline engines, such as an unpacked Vosk model. The model is loaded once per run.",
+    )
+
 
+def add_window_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        metavar="SECONDS",
+        help="Split the audio into windows of about this many seconds, cut at pauses when FFmpeg is on PATH, and "
+        "transcribe the windows concurrently. Defaults to sending the whole recording in one request.",
+    )
+    parser.add_argument(
+        "--window-jobs",
+        type=int,
+        default=DEFAULT_WINDOW_JOBS,
+        help=f"Number of windows of one recording to transcribe at once (default {DEFAULT_WINDOW_JOBS}).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"How many times to resend a window whose request failed (default {DEFAULT_RETRIES}).",
+    )
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=DEFAULT_RETRY_DELAY,
+        metavar="SECONDS",
+        help=f"Wait before the first retry, doubled for each later one (default {DEFAULT_RETRY_DELAY:g}).",
+    )
 
-def require_transcription_dependencies() -> None:
+
+def window_settings_from_args(args: argparse.Namespace) -> WindowSettings | None:
+    """Return validated window settings, or None when --window-seconds was not passed."""
+    if args.window_seconds is None:
+        return None
+    if not args.window_seconds >= MIN_WINDOW_SECONDS:
+        raise ScriptError(
+            f"Window length must be at least {MIN_WINDOW_SECONDS:g} seconds. Got {args.window_seconds:g}."
+        )
+    require_positive_int(args.window_jobs, label="Window jobs")
+    if args.retries < 0:
+        raise ScriptError(f"Retries must be 0 or more. Got {args.retries}.")
+    if not args.retry_delay >= 0:
+        raise ScriptError(f"Retry delay must be 0 or more. Got {args.retry_delay:g}.")
+    return WindowSettings(args.window_seconds, args.window_jobs, args.retries, args.retry_delay)
+
+
+def resolve_audio_extractor(extractor: str) -> str:
+    """Resolve auto to ffmpeg when it is on PATH, else moviepy, and check the chosen extractor is available."""
+    if extractor == EXTRACTOR_AUTO:
+        extractor = EXTRACTOR_FFMPEG if shutil.which(FFMPEG_COMMAND) is not None else EXTRACTOR_MOVIEPY
+    if extractor == EXTRACTOR_FFMPEG:
+        require_ffmpeg()
+    elif importlib.util.find_spec("moviepy") is None:
+        raise ScriptError(
+            "FFmpeg on PATH or moviepy is required to extract audio. Install moviepy with: pip install moviepy"
+        )
+    return extractor
+
+
+def speech_engine(name: str) -> SpeechEngine:
+    engine = SPEECH_ENGINES.get(name)
+    if engine is None:
+        raise ScriptError(f"Unknown speech engine '{name}'. Choose from: {', '.join(SPEECH_ENGINES)}.")
+    return engine
+
+
+def require_transcription_dependencies(extractor: str = EXTRACTOR_AUTO, engine: str = DEFAULT_ENGINE) -> None:
     """Raise a clear error when MP4 transcription dependencies are missing."""
-    if MOVIEPY_IMPORT_ERROR is not None:
-        raise ScriptError("moviepy is required. Install it with: pip install moviepy")
-    if SPEECH_RECOGNITION_IMPORT_ERROR is not None:
-        raise ScriptError("SpeechRecognition is required. Install it with: pip install SpeechRecognition")
+    resolve_audio_extractor(extractor)
+    speech = speech_engine(engine)
+    if not speech.available():
+        raise ScriptError(speech.missing_message)
+
 
+def load_speech_engine(name: str, *, language: str, model: Path | None = None) -> Recognizer:
+    """Load the engine called name once and return a Recognizer that can be shared across files and threads."""
+    return speech_engine(name).load(language, model)
 
-def extract_wav(mp4_path: Path, wav_path: Path) -> None:
-    """Extract MP4 audio into a temporary WAV file for speech recognition."""
-    audio_clip_cls = AudioFileClip
-    if audio_clip_cls is None:
-        raise ScriptError("moviepy is required. Install it with: pip install moviepy")
 
+def load_audio_file_clip() -> Any:
+    """Import moviepy's AudioFileClip on first use; moviepy pulls in numpy and imageio, so it is not imported early."""
+    try:
+        return importlib.import_module("moviepy.editor").AudioFileClip
+    except ImportError as first_import_error:
+        try:
+            return importlib.import_module("moviepy").AudioFileClip
+        except ImportError:
+            raise ScriptError("moviepy is required. Install it with: pip install moviepy") from first_import_error
+
+
+def build_extract_command(ffmpeg_path: str, mp4_path: Path, wav_path: Path) -> list[str]:
+    """Build the FFmpeg command that decodes the first audio stream straight to 16 kHz mono 16-bit WAV."""
+    return [
+        ffmpeg_path,
+        *FFMPEG_QUIET_ARGS,
+        "-i",
+        str(mp4_path),
+        "-map",
+        "0:a:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(SPEECH_SAMPLE_RATE),
+        "-c:a",
+        "pcm_s16le",
+        "-f",
+        "wav",
+        str(wav_path),
+    ]
+
+
+def extract_wav(mp4_path: Path, wav_path: Path, *, extractor: str = EXTRACTOR_AUTO) -> None:
+    """Extract MP4 audio into a 16 kHz mono WAV file for speech recognition.
+
+    The ffmpeg extractor decodes in a single FFmpeg run without loading any
+    Python media libraries; the moviepy extractor writes the same format.
+    """
+    if resolve_audio_extractor(extractor) == EXTRACTOR_FFMPEG:
+        command = build_extract_command(require_ffmpeg(), mp4_path, wav_path)
+        run_ffmpeg(command, action=f"Could not extract audio from '{mp4_path}'")
+        return
+
+    audio_clip_cls = load_audio_file_clip()
     clip: Any | None = None
     try:
         try:
             clip = audio_clip_cls(str(mp4_path))
-            clip.write_audiofile(str(wav_path), codec="pcm_s16le", logger=None)
+            clip.write_audiofile(
+                str(wav_path),
+                fps=SPEECH_SAMPLE_RATE,
+                nbytes=2,
+                codec="pcm_s16le",
+                ffmpeg_params=["-ac", "1"],
+                logger=None,
+            )
         except Exception as exc:
             raise ScriptError(f"Could not extract audio from '{mp4_path}': {exc}") from exc
     finally:
@@ -67,8 +263,8 @@ def extract_wav(mp4_path: Path, wav_path: Path) -> None:
             clip.close()
 
 
-def transcribe_wav(wav_path: Path, *, language: str) -> str:
-    """Transcribe a WAV file with Google Web Speech API."""
+def transcribe_wav(wav_path: Path, *, language: str, unrecognized: str = UNRECOGNIZED_TEXT) -> str:
+    """Transcribe a WAV file with Google Web Speech API, returning unrecognized when no speech is understood."""
     recognition_module = sr
     if recognition_module is None:
         raise ScriptError("SpeechRecognition is required. Install it with: pip install SpeechRecognition")
@@ -83,17 +279,197 @@ def transcribe_wav(wav_path: Path, *, language: str) -> str:
     try:
         return recognizer.recognize_google(audio_data, language=language)
     except recognition_module.UnknownValueError:
-        return "Google Speech Recognition could not understand the audio."
+        return unrecognized
     except recognition_module.RequestError as exc:
-        raise ScriptError(f"Google Speech Recognition request failed: {exc}") from exc
+        raise RecognitionRequestError(f"Google Speech Recognition request failed: {exc}") from exc
+    except Exception as exc:
+        raise RecognitionRequestError(f"Google Speech Recognition failed: {exc}") from exc
+
+
+def google_available() -> bool:
+    return SPEECH_RECOGNITION_IMPORT_ERROR is None
+
+
+def load_google_recognizer(language: str, _model: Path | None) -> Recognizer:
+    return functools.partial(transcribe_wav, language=language, unrecognized="")
+
+
+def vosk_available() -> bool:
+    return importlib.util.find_spec("vosk") is not None
+
+
+def load_vosk_recognizer(_language: str, model_path: Path | None) -> Recognizer:
+    """Load a Vosk model from disk; the model language is fixed, so --language does not apply."""
+    if model_path is None:
+        raise ScriptError("The vosk engine needs --model pointing at an unpacked Vosk model folder.")
+    if not model_path.is_dir():
+        raise ScriptError(f"Vosk model folder not found: {model_path}")
+    vosk = importlib.import_module("vosk")
+    vosk.SetLogLevel(-1)
+    logging.info("Loading Vosk model: %s", model_path)
+    try:
+        model = vosk.Model(str(model_path))
     except Exception as exc:
-        raise ScriptError(f"Google Speech Recognition failed: {exc}") from exc
+        raise ScriptError(f"Could not load Vosk model '{model_path}': {exc}") from exc
+    return functools.partial(transcribe_wav_vosk, vosk=vosk, model=model)
+
+
+def transcribe_wav_vosk(wav_path: Path, *, vosk: Any, model: Any) -> str:
+    """Transcribe a 16-bit mono WAV file offline with a loaded Vosk model.
+
+    The model is shared; each call gets its own recognizer, so calls can run
+    in parallel threads.
+    """
+    texts: list[str] = []
+    try:
+        with wave.open(str(wav_path), "rb") as reader:
+            recognizer = vosk.KaldiRecognizer(model, reader.getframerate())
+            while data := reader.readframes(VOSK_READ_FRAMES):
+                # A true result marks the end of an utterance, whose text must be collected before the next one.
+                if recognizer.AcceptWaveform(data):
+                    texts.append(json.loads(recognizer.Result()).get("text", ""))
+        texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    except Exception as exc:
+        raise ScriptError(f"Vosk could not transcribe '{wav_path}': {exc}") from exc
+    return " ".join(text for text in texts if text)
+
+
+SPEECH_ENGINES: dict[str, SpeechEngine] = {
+    ENGINE_GOOGLE: SpeechEngine(
+        description="Google Web Speech API, needs network access",
+        missing_message="SpeechRecognition is required. Install it with: pip install SpeechRecognition",
+        available=google_available,
+        load=load_google_recognizer,
+    ),
+    ENGINE_VOSK: SpeechEngine(
+        description="offline Vosk, needs --model",
+        missing_message="Vosk is required for --engine vosk. Install it with: pip install vosk",
+        available=vosk_available,
+        load=load_vosk_recognizer,
+    ),
+}
+
+
+def wav_duration(wav_path: Path) -> float:
+    try:
+        with wave.open(str(wav_path), "rb") as reader:
+            return reader.getnframes() / reader.getframerate()
+    except (OSError, EOFError, wave.Error) as exc:
+        raise ScriptError(f"Could not read extracted audio '{wav_path}': {exc}") from exc
+
+
+def plan_audio_windows(wav_path: Path, settings: WindowSettings) -> list[tuple[float, float]]:
+    """Return the (start, end) of each window covering wav_path, with cuts moved into nearby pauses.
+
+    Pauses are found by one streamed FFmpeg silencedetect pass. Without FFmpeg
+    on PATH the windows are cut at fixed lengths.
+    """
+    duration = wav_duration(wav_path)
+    if duration <= settings.seconds:
+        return [(0.0, duration)]
+    silences: list[tuple[float, float]] = []
+    ffmpeg_path = shutil.which(FFMPEG_COMMAND)
+    if ffmpeg_path is not None:
+        snap = SnapSettings(SNAP_SILENCE, settings.snap_window, settings.silence_threshold_db)
+        silences = find_cut_candidates(wav_path, snap, ffmpeg_path=ffmpeg_path)
+    return plan_chunk_ranges(duration, settings.seconds, silences, window=settings.snap_window)
+
+
+def write_window_wav(source_path: Path, window_path: Path, start: float, end: float) -> None:
+    """Copy the frames between start and end seconds of source_path into a WAV file of their own."""
+    with wave.open(str(source_path), "rb") as reader, wave.open(str(window_path), "wb") as writer:
+        writer.setparams(reader.getparams())
+        first_frame = round(start * reader.getframerate())
+        reader.setpos(first_frame)
+        writer.writeframes(reader.readframes(round(end * reader.getframerate()) - first_frame))
+
+
+def recognize_with_retries(recognize: Recognizer, wav_path: Path, *, retries: int, retry_delay: float) -> str:
+    """Call recognize, resending after a RecognitionRequestError with a delay that doubles each time."""
+    attempt = 0
+    while True:
+        try:
+            return recognize(wav_path)
+        except RecognitionRequestError as exc:
+            if attempt >= retries:
+                raise
+            delay = retry_delay * 2**attempt
+            attempt += 1
+            logging.warning("Retrying %s in %.1f s (%d of %d): %s", wav_path.name, delay, attempt, retries, exc)
+            time.sleep(delay)
+
+
+def transcribe_window(
+    numbered_window: tuple[int, tuple[float, float]],
+    *,
+    source_path: Path,
+    work_folder: Path,
+    recognize: Recognizer,
+    settings: WindowSettings,
+) -> str:
+    number, (start, end) = numbered_window
+    window_path = work_folder / f"window_{number:05d}.wav"
+    try:
+        write_window_wav(source_path, window_path, start, end)
+        return recognize_with_retries(
+            recognize, window_path, retries=settings.retries, retry_delay=settings.retry_delay
+        )
+    finally:
+        window_path.unlink(missing_ok=True)
+
+
+def transcribe_windows(wav_path: Path, recognize: Recognizer, settings: WindowSettings, *, work_folder: Path) -> str:
+    """Transcribe wav_path window by window, settings.jobs at a time, and join the texts in time order.
+
+    Each window is written to work_folder only while it is being recognized,
+    so disk use stays bounded by the number of windows in flight. A window
+    that still fails after its retries fails the whole recording.
+    """
+    windows = plan_audio_windows(wav_path, settings)
+    logging.info("Transcribing %s in %d windows", wav_path.name, len(windows))
+    worker = functools.partial(
+        transcribe_window, source_path=wav_path, work_folder=work_folder, recognize=recognize, settings=settings
+    )
+    # Recognition waits on the speech service, so threads are enough.
+    runner = BatchRunner(jobs=min(settings.jobs, len(windows)), backend="thread")
+    texts: list[str] = []
+    for result in runner.run(worker, enumerate(windows, start=1)):
+        _number, (start, end) = result.item
+        if result.error is not None:
+            raise ScriptError(
+                f"Could not transcribe {start:.1f}-{end:.1f} s of '{wav_path}': {result.error}"
+            ) from result.error
+        text = (result.value or "").strip()
+        if text:
+            texts.append(text)
+    if runner.interrupted:
+        raise KeyboardInterrupt
+    return " ".join(texts)
+
 
+def transcribe_mp4_to_text(
+    mp4_path: Path,
+    *,
+    language: str,
+    extractor: str = EXTRACTOR_AUTO,
+    windows: WindowSettings | None = None,
+    recognize: Recognizer | None = None,
+) -> str:
+    """Extract and transcribe MP4 audio, cleaning up temporary files automatically.
 
-def transcribe_mp4_to_text(mp4_path: Path, *, language: str) -> str:
-    """Extract and transcribe MP4 audio, cleaning up temporary files automatically."""
-    require_transcription_dependencies()
+    recognize is a Recognizer from load_speech_engine, loaded once by the
+    caller and reused for every file; without one, Google Web Speech is used.
+    With window settings, the audio is transcribed in concurrent windows
+    instead of all at once.
+    """
+    if recognize is None:
+        require_transcription_dependencies(extractor)
+        recognize = load_speech_engine(ENGINE_GOOGLE, language=language)
     with tempfile.TemporaryDirectory(prefix="pyt-audio-") as temp_dir:
         wav_path = Path(temp_dir) / f"{mp4_path.stem}.wav"
-        extract_wav(mp4_path, wav_path)
-        return transcribe_wav(wav_path, language=language)
+        extract_wav(mp4_path, wav_path, extractor=extractor)
+        if windows is None:
+            transcript = recognize(wav_path)
+        else:
+            transcript = transcribe_windows(wav_path, recognize, windows, work_folder=Path(temp_dir))
+        return transcript or UNRECOGNIZED_TEXT
@@ -0,0 +1,458 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Bounded parallel batch execution shared by PyTransformer batch commands."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import concurrent.futures
+import inspect
+import multiprocessing
+import multiprocessing.connection
+import queue
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+from pytransformer.core.common import ScriptError, require_positive_int
+
+BACKENDS = ("thread", "process", "asyncio")
+DEFAULT_JOBS = 1
+# How long a timed-out worker gets to clean up its temporary output after SIGTERM before it is killed.
+TERMINATE_GRACE_SECONDS = 2.0
+
+ItemT = TypeVar("ItemT")
+ValueT = TypeVar("ValueT")
+
+
+@dataclass
+class BatchResult(Generic[ItemT, ValueT]):
+    """Outcome of running a batch worker on one input item."""
+
+    index: int
+    item: ItemT
+    value: ValueT | None = None
+    error: BaseException | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """Counters reported by batch commands at the end of a run."""
+
+    written: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: int = 0
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser, *, help_text: str | None = None) -> None:
+    """Add the shared --jobs option used by commands that can process items in parallel."""
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=help_text or f"Number of items to process in parallel (default {DEFAULT_JOBS}).",
+    )
+
+
+def add_timeout_argument(parser: argparse.ArgumentParser, *, help_text: str | None = None) -> None:
+    """Add the shared --timeout option that stops and fails any single item running longer than the limit."""
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help=help_text or "Fail any single item that runs longer than this many seconds. Defaults to no limit.",
+    )
+
+
+def _call_worker(worker: Callable[[Any], Any], item: Any) -> tuple[Any, BaseException | None, float]:
+    """Run one item and capture its result; module-level so process pools can pickle it."""
+    started = time.perf_counter()
+    try:
+        value = worker(item)
+    except Exception as exc:
+        return None, exc, time.perf_counter() - started
+    return value, None, time.perf_counter() - started
+
+
+def _exit_worker(_signum: int, _frame: object) -> None:
+    raise SystemExit(1)
+
+
+def _serve_items(connection: multiprocessing.connection.Connection, worker: Callable[[Any], Any]) -> None:
+    """Run items sent by the parent in a killable worker process until it sends None."""
+    # Ctrl-C is handled by the parent. SIGTERM unwinds the worker so temporary outputs are removed.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_worker)
+    while (item := connection.recv()) is not None:
+        value, error, seconds = _call_worker(worker, item)
+        try:
+            connection.send((value, error, seconds))
+        except Exception as exc:
+            connection.send((None, RuntimeError(f"Could not return the result: {exc}"), seconds))
+
+
+class _WorkerProcess:
+    """One worker process with its own pipe, so a single stuck item can be stopped without the others."""
+
+    def __init__(self, context: Any, worker: Callable[[Any], Any]) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve_items, args=(child_connection, worker), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.task: tuple[int, Any] | None = None
+        self.started = 0.0
+
+    def assign(self, index: int, item: Any) -> None:
+        self.task = (index, item)
+        self.started = time.monotonic()
+        self.connection.send(item)
+
+    def stop(self, *, force: bool = False) -> None:
+        if not force and self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.process.join(TERMINATE_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(TERMINATE_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class BatchRunner:
+    """Run a worker over items with bounded in-flight work and per-item error isolation.
+
+    Results are yielded as ``BatchResult`` objects, either in input order or as
+    soon as each item finishes. A worker exception is captured on its result so
+    one bad item never stops the batch. Ctrl-C stops scheduling new work,
+    cancels queued items, and ends the run with ``interrupted`` set.
+
+    With a ``timeout``, the process backend runs each worker in its own
+    process. An item running longer than the timeout gets a ``TimeoutError``
+    result, and its process is stopped and replaced.
+    """
+
+    def __init__(
+        self,
+        *,
+        jobs: int = DEFAULT_JOBS,
+        backend: str = "thread",
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        require_positive_int(jobs, label="Jobs")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown batch backend: {backend}")
+        if timeout is not None and backend != "process":
+            raise ValueError("Per-item timeouts need the process backend.")
+        if timeout is not None and not timeout > 0:
+            raise ScriptError(f"Timeout must be positive. Got {timeout:g}.")
+        if max_in_flight is not None:
+            require_positive_int(max_in_flight, label="Maximum in-flight items")
+        self.jobs = jobs
+        self.backend = backend
+        self.ordered = ordered
+        self.max_in_flight = max(max_in_flight or jobs * 2, jobs)
+        self.timeout = timeout
+        self.interrupted = False
+        self.cancelled = 0
+
+    def run(
+        self,
+        worker: Callable[[ItemT], ValueT],
+        items: Iterable[ItemT],
+    ) -> Iterator[BatchResult[ItemT, ValueT]]:
+        self.interrupted = False
+        self.cancelled = 0
+        indexed_items = enumerate(items)
+        if self.timeout is not None:
+            return self._run_killable(worker, indexed_items, self.timeout)
+        if self.jobs == 1 and self.backend != "asyncio":
+            return self._run_inline(worker, indexed_items)
+        if self.backend == "asyncio":
+            return self._run_asyncio(worker, indexed_items)
+        return self._run_pool(worker, indexed_items)
+
+    def _interrupt(self, unfinished: int, remaining: Iterator[Any]) -> None:
+        self.interrupted = True
+        self.cancelled = unfinished + sum(1 for _ in remaining)
+
+    def _run_inline(
+        self,
+        worker: Callable[[ItemT], ValueT],
+        indexed_items: Iterator[tuple[int, ItemT]],
+    ) -> Iterator[BatchResult[ItemT, ValueT]]:
+        for index, item in indexed_items:
+            try:
+                value, error, seconds = _call_worker(worker, item)
+            except KeyboardInterrupt:
+                self._interrupt(1, indexed_items)
+                return
+            yield BatchResult(index=index, item=item, value=value, error=error, seconds=seconds)
+
+    def _run_pool(
+        self,
+        worker: Callable[[ItemT], ValueT],
+        indexed_items: Iterator[tuple[int, ItemT]],
+    ) -> Iterator[BatchResult[ItemT, ValueT]]:
+        executor: concurrent.futures.Executor
+        if self.backend == "process":
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs)
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs)
+
+        futures: dict[concurrent.futures.Future[Any], tuple[int, ItemT]] = {}
+        buffered: dict[int, BatchResult[ItemT, ValueT]] = {}
+        next_index = 0
+        submitted = 0
+        exhausted = False
+        try:
+            while True:
+                # In ordered mode, finished results waiting on a slower predecessor
+                # still count against the window so memory stays bounded.
+                while not exhausted:
+                    window = submitted - next_index if self.ordered else len(futures)
+                    if window >= self.max_in_flight:
+                        break
+                    try:
+                        index, item = next(indexed_items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    futures[executor.submit(_call_worker, worker, item)] = (index, item)
+                    submitted += 1
+
+                if not futures:
+                    break
+
+                done, _pending = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda finished: futures[finished][0]):
+                    index, item = futures.pop(future)
+                    result: BatchResult[ItemT, ValueT] = self._collect(future, index, item)
+                    if self.ordered:
+                        buffered[index] = result
+                    else:
+                        yield result
+
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            self._interrupt(len(futures) + len(buffered), indexed_items)
+        finally:
+            executor.shutdown(wait=not self.interrupted, cancel_futures=True)
+
+    def _run_killable(
+        self,
+        worker: Callable[[ItemT], ValueT],
+        indexed_items: Iterator[tuple[int, ItemT]],
+        timeout: float,
+    ) -> Iterator[BatchResult[ItemT, ValueT]]:
+        context = multiprocessing.get_context()
+        workers: list[_WorkerProcess | None] = [None] * self.jobs
+        buffered: dict[int, BatchResult[ItemT, ValueT]] = {}
+        next_index = 0
+        submitted = 0
+        exhausted = False
+        try:
+            while True:
+                for slot, process in enumerate(workers):
+                    window = submitted - next_index if self.ordered else 0
+                    if exhausted or window >= self.max_in_flight:
+                        break
+                    if process is not None and process.task is not None:
+                        continue
+                    try:
+                        index, item = next(indexed_items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if process is None:
+                        process = workers[slot] = _WorkerProcess(context, worker)
+                    process.assign(index, item)
+                    submitted += 1
+
+                busy = [process for process in workers if process is not None and process.task is not None]
+                if not busy:
+                    break
+
+                deadline = min(process.started for process in busy) + timeout
+                ready = multiprocessing.connection.wait(
+                    [process.connection for process in busy], timeout=max(0.0, deadline - time.monotonic())
+                )
+                finished: list[BatchResult[ItemT, ValueT]] = []
+                for process in busy:
+                    task = process.task
+                    if task is None:
+                        continue
+                    index, item = task
+                    if process.connection in ready:
+                        try:
+                            value, error, seconds = process.connection.recv()
+                        except (EOFError, OSError):
+                            process.process.join(TERMINATE_GRACE_SECONDS)
+                            error = RuntimeError(f"Worker process exited with code {process.process.exitcode}")
+                            finished.append(BatchResult(index=index, item=item, error=error))
+                            self._replace(workers, process)
+                            continue
+                        process.task = None
+                        finished.append(BatchResult(index=index, item=item, value=value, error=error, seconds=seconds))
+                    elif time.monotonic() - process.started >= timeout:
+                        error = TimeoutError(f"Timed out after {timeout:g} seconds")
+                        finished.append(BatchResult(index=index, item=item, error=error, seconds=timeout))
+                        self._replace(workers, process)
+
+                for result in sorted(finished, key=lambda finished_result: finished_result.index):
+                    if self.ordered:
+                        buffered[result.index] = result
+                    else:
+                        yield result
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        except KeyboardInterrupt:
+            running = sum(1 for process in workers if process is not None and process.task is not None)
+            self._interrupt(running + len(buffered), indexed_items)
+        finally:
+            for process in workers:
+                if process is not None:
+                    process.stop(force=self.interrupted or process.task is not None)
+
+    @staticmethod
+    def _replace(workers: list[_WorkerProcess | None], process: _WorkerProcess) -> None:
+        """Stop a stuck or dead worker; its slot starts a fresh process for the next item."""
+        process.stop(force=True)
+        workers[workers.index(process)] = None
+
+    @staticmethod
+    def _collect(
+        future: concurrent.futures.Future[Any],
+        index: int,
+        item: ItemT,
+    ) -> BatchResult[ItemT, ValueT]:
+        try:
+            value, error, seconds = future.result()
+        except Exception as exc:
+            # The worker process died or its result could not be transferred back.
+            return BatchResult(index=index, item=item, error=exc)
+        return BatchResult(index=index, item=item, value=value, error=error, seconds=seconds)
+
+    def _run_asyncio(
+        self,
+        worker: Callable[[ItemT], ValueT],
+        indexed_items: Iterator[tuple[int, ItemT]],
+    ) -> Iterator[BatchResult[ItemT, ValueT]]:
+        results: queue.Queue[BatchResult[ItemT, ValueT] | None] = queue.Queue()
+        state = _AsyncioFeedState()
+
+        async def run_one(index: int, item: ItemT, limit: asyncio.Semaphore) -> None:
+            started = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(worker):
+                    value = await worker(item)
+                else:
+                    value = await asyncio.to_thread(worker, item)
+            except Exception as exc:
+                results.put(BatchResult(index=index, item=item, error=exc, seconds=time.perf_counter() - started))
+            else:
+                results.put(BatchResult(index=index, item=item, value=value, seconds=time.perf_counter() - started))
+            finally:
+                limit.release()
+
+        async def feed() -> None:
+            state.loop = asyncio.get_running_loop()
+            limit = asyncio.Semaphore(self.jobs)
+            for index, item in indexed_items:
+                await limit.acquire()
+                if state.stop.is_set():
+                    state.submitted_or_skipped += 1
+                    break
+                task = asyncio.create_task(run_one(index, item, limit))
+                state.running.add(task)
+                task.add_done_callback(state.running.discard)
+                state.submitted_or_skipped += 1
+            if state.stop.is_set():
+                state.submitted_or_skipped += sum(1 for _ in indexed_items)
+            state.fed.set()
+            await asyncio.gather(*list(state.running), return_exceptions=True)
+
+        def thread_main() -> None:
+            try:
+                asyncio.run(feed())
+            except BaseException as exc:  # pragma: no cover - surfaced to the consuming thread below.
+                state.error = exc
+            finally:
+                state.fed.set()
+                results.put(None)
+
+        thread = threading.Thread(target=thread_main, name="pyt-batch-asyncio", daemon=True)
+        thread.start()
+        buffered: dict[int, BatchResult[ItemT, ValueT]] = {}
+        next_index = 0
+        delivered = 0
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                if self.ordered:
+                    buffered[result.index] = result
+                    while next_index in buffered:
+                        yield buffered.pop(next_index)
+                        next_index += 1
+                        delivered += 1
+                else:
+                    yield result
+                    delivered += 1
+        except KeyboardInterrupt:
+            state.cancel()
+            self.interrupted = True
+            self.cancelled = max(state.submitted_or_skipped - delivered, 0)
+            return
+        thread.join()
+        if state.error is not None:
+            raise state.error
+
+
+class _AsyncioFeedState:
+    """Shared state between the asyncio feeder thread and the consuming thread."""
+
+    def __init__(self) -> None:
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.running: set[asyncio.Task[None]] = set()
+        self.stop = threading.Event()
+        self.fed = threading.Event()
+        self.submitted_or_skipped = 0
+        self.error: BaseException | None = None
+
+    def cancel(self) -> None:
+        self.stop.set()
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel_running)
+            except RuntimeError:
+                pass
+        # Wait for the feeder to stop scheduling and count the unscheduled items.
+        self.fed.wait(timeout=5)
+
+    def _cancel_running(self) -> None:
+        for task in list(self.running):
+            task.cancel()
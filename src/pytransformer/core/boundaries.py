@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Fixed-length chunk ranges for media files, optionally snapped to silences or scene changes found by FFmpeg."""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from pytransformer.core.common import ScriptError
+from pytransformer.core.ffmpeg import FFMPEG_ANALYSIS_ARGS, iter_ffmpeg_log
+
+SNAP_SILENCE = "silence"
+SNAP_SCENE = "scene"
+SNAP_MODES = (SNAP_SILENCE, SNAP_SCENE)
+DEFAULT_SNAP_WINDOW = 5.0
+DEFAULT_SILENCE_THRESHOLD_DB = -35.0
+DEFAULT_SCENE_THRESHOLD = 0.3
+# Shortest pause that counts as silence, and how far a cut stays inside one so the next word is not clipped.
+MIN_SILENCE_SECONDS = 0.3
+SILENCE_MARGIN_SECONDS = 0.1
+# Silence is found on audio resampled to this rate in mono, and scene changes on frames scaled to this width,
+# which keeps the analysis pass cheap without moving the detected times.
+ANALYSIS_SAMPLE_RATE = 8000
+ANALYSIS_FRAME_WIDTH = 160
+
+SILENCE_START_PATTERN = re.compile(r"silence_start: (-?[\d.]+)")
+SILENCE_END_PATTERN = re.compile(r"silence_end: (-?[\d.]+)")
+SCENE_TIME_PATTERN = re.compile(r"Parsed_showinfo.*\bpts_time:(-?[\d.]+)")
+
+
+@dataclass(frozen=True)
+class SnapSettings:
+    mode: str
+    window: float = DEFAULT_SNAP_WINDOW
+    silence_threshold_db: float = DEFAULT_SILENCE_THRESHOLD_DB
+    scene_threshold: float = DEFAULT_SCENE_THRESHOLD
+
+
+def add_snap_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--snap",
+        choices=SNAP_MODES,
+        help="Move each cut to the nearest silence or scene change within --snap-window of its nominal time. "
+        "Cuts with nothing in range stay where they are.",
+    )
+    parser.add_argument(
+        "--snap-window",
+        type=float,
+        default=DEFAULT_SNAP_WINDOW,
+        metavar="SECONDS",
+        help=f"How far a cut may move to reach a silence or scene change (default {DEFAULT_SNAP_WINDOW:g}).",
+    )
+    parser.add_argument(
+        "--silence-threshold",
+        type=float,
+        default=DEFAULT_SILENCE_THRESHOLD_DB,
+        metavar="DB",
+        help=f"Audio quieter than this many dB counts as silence for --snap silence "
+        f"(default {DEFAULT_SILENCE_THRESHOLD_DB:g}).",
+    )
+    parser.add_argument(
+        "--scene-threshold",
+        type=float,
+        default=DEFAULT_SCENE_THRESHOLD,
+        help=f"Scene change score from 0 to 1 that counts as a cut for --snap scene "
+        f"(default {DEFAULT_SCENE_THRESHOLD:g}).",
+    )
+
+
+def snap_settings_from_args(args: argparse.Namespace, *, chunk_seconds: float) -> SnapSettings | None:
+    """Return validated snap settings, or None when --snap was not passed."""
+    if args.snap is None:
+        return None
+    if not 0 < args.snap_window < chunk_seconds / 2:
+        raise ScriptError(
+            f"Snap window must be positive and less than half the chunk length. Got {args.snap_window:g}."
+        )
+    if not 0 < args.scene_threshold < 1:
+        raise ScriptError(f"Scene threshold must be between 0 and 1. Got {args.scene_threshold:g}.")
+    return SnapSettings(args.snap, args.snap_window, args.silence_threshold, args.scene_threshold)
+
+
+def build_silence_command(ffmpeg_path: str, media_path: Path, threshold_db: float) -> list[str]:
+    audio_filter = (
+        f"aresample={ANALYSIS_SAMPLE_RATE},aformat=channel_layouts=mono,"
+        f"silencedetect=noise={threshold_db:g}dB:d={MIN_SILENCE_SECONDS:g}"
+    )
+    return [
+        ffmpeg_path,
+        *FFMPEG_ANALYSIS_ARGS,
+        "-i",
+        str(media_path),
+        "-map",
+        "0:a:0",
+        "-af",
+        audio_filter,
+        "-f",
+        "null",
+        "-",
+    ]
+
+
+def build_scene_command(ffmpeg_path: str, media_path: Path, threshold: float) -> list[str]:
+    video_filter = f"scale={ANALYSIS_FRAME_WIDTH}:-2,select='gt(scene,{threshold:g})',showinfo"
+    return [
+        ffmpeg_path,
+        *FFMPEG_ANALYSIS_ARGS,
+        "-i",
+        str(media_path),
+        "-map",
+        "0:v:0",
+        "-vf",
+        video_filter,
+        "-f",
+        "null",
+        "-",
+    ]
+
+
+def parse_silences(lines: Iterable[str]) -> list[tuple[float, float]]:
+    """Return (start, end) pairs from FFmpeg silencedetect log lines; a silence still open at the end is dropped."""
+    silences: list[tuple[float, float]] = []
+    start: float | None = None
+    for line in lines:
+        if match := SILENCE_START_PATTERN.search(line):
+            start = max(float(match.group(1)), 0.0)
+        elif (match := SILENCE_END_PATTERN.search(line)) and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+
+def parse_scene_changes(lines: Iterable[str]) -> list[tuple[float, float]]:
+    """Return each scene change from FFmpeg showinfo log lines as a zero-length (time, time) span."""
+    changes: list[tuple[float, float]] = []
+    for line in lines:
+        if match := SCENE_TIME_PATTERN.search(line):
+            time = float(match.group(1))
+            changes.append((time, time))
+    return changes
+
+
+def find_cut_candidates(media_path: Path, settings: SnapSettings, *, ffmpeg_path: str) -> list[tuple[float, float]]:
+    """Stream media_path through FFmpeg once and return the spans where a cut may land, in time order."""
+    if settings.mode == SNAP_SILENCE:
+        command = build_silence_command(ffmpeg_path, media_path, settings.silence_threshold_db)
+        return parse_silences(iter_ffmpeg_log(command, action=f"Could not find silences in '{media_path}'"))
+    command = build_scene_command(ffmpeg_path, media_path, settings.scene_threshold)
+    return parse_scene_changes(iter_ffmpeg_log(command, action=f"Could not find scene changes in '{media_path}'"))
+
+
+def plan_chunk_ranges(
+    duration: float,
+    chunk_seconds: float,
+    candidates: Sequence[tuple[float, float]] = (),
+    window: float = 0.0,
+) -> list[tuple[float, float]]:
+    """Return the (start, end) of each chunk, about chunk_seconds long, covering duration.
+
+    Each cut is nominally chunk_seconds after the previous one. With candidate
+    spans, sorted and not overlapping, the cut moves to the point of the
+    nearest span within window seconds, staying a little inside a silence.
+    The last chunk may be shorter.
+    """
+    starts = [start for start, _end in candidates]
+    ranges: list[tuple[float, float]] = []
+    start = 0.0
+    while start < duration:
+        nominal = start + chunk_seconds
+        if nominal >= duration:
+            ranges.append((start, duration))
+            break
+        cut = snap_cut(nominal, candidates, starts, window, after=start)
+        ranges.append((start, cut))
+        start = cut
+    return ranges
+
+
+def snap_cut(
+    nominal: float, candidates: Sequence[tuple[float, float]], starts: Sequence[float], window: float, *, after: float
+) -> float:
+    best = nominal
+    best_distance = window
+    index = bisect.bisect_right(starts, nominal + window)
+    while index > 0:
+        index -= 1
+        span_start, span_end = candidates[index]
+        if span_end < nominal - window:
+            break
+        margin = min(SILENCE_MARGIN_SECONDS, (span_end - span_start) / 2)
+        point = min(max(nominal, span_start + margin), span_end - margin)
+        distance = abs(point - nominal)
+        if point > after and distance <= best_distance:
+            best, best_distance = point, distance
+    return best
@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Overlapping fixed-size text chunks with page and offset provenance, built while extracted pages stream past."""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import contextlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from pytransformer.core.common import ScriptError, temporary_output_path
+
+CHUNK_UNIT_CHARS = "chars"
+CHUNK_UNIT_TOKENS = "tokens"
+CHUNK_UNITS = (CHUNK_UNIT_CHARS, CHUNK_UNIT_TOKENS)
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 200
+CHUNK_SUFFIX = ".chunks.jsonl"
+# Pages are joined with a blank line, as in the text output, so a chunk can run across a page break.
+PAGE_SEPARATOR = "\n\n"
+TOKEN_PATTERN = re.compile(r"\S+")
+
+
+@dataclass(frozen=True)
+class ChunkSettings:
+    size: int = DEFAULT_CHUNK_SIZE
+    overlap: int = DEFAULT_CHUNK_OVERLAP
+    unit: str = CHUNK_UNIT_CHARS
+
+    def describe(self) -> str:
+        return f"{self.size} {self.unit}, {self.overlap} overlap"
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """One chunk and where it starts and ends, as a 1-based page and a character offset within that page."""
+
+    index: int
+    start_page: int
+    start_offset: int
+    end_page: int
+    end_offset: int
+    text: str
+
+
+def add_chunk_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--chunks",
+        action="store_true",
+        help=f"Also write overlapping text chunks with page and offset metadata to <output>{CHUNK_SUFFIX}.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Chunk length in --chunk-unit units (default {DEFAULT_CHUNK_SIZE}).",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_CHUNK_OVERLAP,
+        help=f"How many units each chunk repeats from the end of the previous one (default {DEFAULT_CHUNK_OVERLAP}).",
+    )
+    parser.add_argument(
+        "--chunk-unit",
+        choices=CHUNK_UNITS,
+        default=CHUNK_UNIT_CHARS,
+        help="Measure chunks in characters or in whitespace-separated tokens (default chars).",
+    )
+
+
+def chunk_settings_from_args(args: argparse.Namespace) -> ChunkSettings | None:
+    """Return validated chunk settings, or None when --chunks was not passed."""
+    if not args.chunks:
+        return None
+    if args.chunk_size <= 0:
+        raise ScriptError(f"Chunk size must be positive. Got {args.chunk_size}.")
+    if not 0 <= args.chunk_overlap < args.chunk_size:
+        raise ScriptError(f"Chunk overlap must be at least 0 and less than the chunk size. Got {args.chunk_overlap}.")
+    return ChunkSettings(size=args.chunk_size, overlap=args.chunk_overlap, unit=args.chunk_unit)
+
+
+def chunks_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}{CHUNK_SUFFIX}")
+
+
+class TextChunker:
+    """Cut a stream of page texts into overlapping chunks without holding the whole document.
+
+    Offsets are positions in the pages joined by blank lines; only the text
+    from the start of the next chunk onward is kept between pages, so memory
+    stays bounded by the chunk size plus the largest page.
+    """
+
+    def __init__(self, settings: ChunkSettings) -> None:
+        self.settings = settings
+        self.text = ""
+        self.base = 0
+        self.end = 0
+        self.head = 0
+        self.emitted_end = 0
+        self.count = 0
+        self.page_starts: list[int] = []
+        self.page_numbers: list[int] = []
+        self.tokens: list[tuple[int, int]] = []
+        self.token_head = 0
+
+    def add_page(self, page_number: int, text: str) -> list[TextChunk]:
+        """Add a page's text and return the chunks it completed."""
+        if not text:
+            return []
+        if self.page_starts:
+            self.text += PAGE_SEPARATOR
+            self.end += len(PAGE_SEPARATOR)
+        self.page_starts.append(self.end)
+        self.page_numbers.append(page_number)
+        if self.settings.unit == CHUNK_UNIT_TOKENS:
+            self.tokens.extend((self.end + start, self.end + stop) for start, stop in token_spans(text))
+        self.text += text
+        self.end += len(text)
+        return self.take(final=False)
+
+    def finish(self) -> list[TextChunk]:
+        """Return the last, possibly shorter, chunk once every page has been added."""
+        return self.take(final=True)
+
+    def take(self, *, final: bool) -> list[TextChunk]:
+        size, step = self.settings.size, self.settings.size - self.settings.overlap
+        chunks: list[TextChunk] = []
+        if self.settings.unit == CHUNK_UNIT_TOKENS:
+            while len(self.tokens) - self.token_head >= size:
+                first = self.token_head
+                chunks.append(self.make_chunk(self.tokens[first][0], self.tokens[first + size - 1][1]))
+                self.token_head += step
+            if final and self.token_head < len(self.tokens) and self.tokens[-1][1] > self.emitted_end:
+                chunks.append(self.make_chunk(self.tokens[self.token_head][0], self.tokens[-1][1]))
+            self.head = self.tokens[self.token_head][0] if self.token_head < len(self.tokens) else self.end
+        else:
+            while self.end - self.head >= size:
+                chunks.append(self.make_chunk(self.head, self.head + size))
+                self.head += step
+            if final and self.end > self.emitted_end:
+                chunks.append(self.make_chunk(self.head, self.end))
+        self.compact()
+        return chunks
+
+    def make_chunk(self, start: int, stop: int) -> TextChunk:
+        start_page, start_offset = self.locate(start)
+        end_page, end_offset = self.locate(stop - 1)
+        chunk = TextChunk(
+            index=self.count,
+            start_page=start_page,
+            start_offset=start_offset,
+            end_page=end_page,
+            end_offset=end_offset + 1,
+            text=self.text[start - self.base : stop - self.base],
+        )
+        self.count += 1
+        self.emitted_end = stop
+        return chunk
+
+    def locate(self, position: int) -> tuple[int, int]:
+        """Return the page holding a position and the offset within it; a page break belongs to the page before."""
+        slot = max(bisect.bisect_right(self.page_starts, position) - 1, 0)
+        return self.page_numbers[slot], position - self.page_starts[slot]
+
+    def compact(self) -> None:
+        """Drop text before the next chunk start once it makes up half the buffer."""
+        if self.head - self.base <= len(self.text) // 2:
+            return
+        self.text = self.text[self.head - self.base :]
+        self.base = self.head
+        del self.tokens[: self.token_head]
+        self.token_head = 0
+        keep = max(bisect.bisect_right(self.page_starts, self.head) - 1, 0)
+        del self.page_starts[:keep]
+        del self.page_numbers[:keep]
+
+
+def token_spans(text: str) -> Iterator[tuple[int, int]]:
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match.span()
+
+
+class ChunkWriter:
+    """Write a document's chunks as JSON lines as soon as each one is complete."""
+
+    def __init__(self, handle: TextIO, document: str, settings: ChunkSettings) -> None:
+        self.handle = handle
+        self.document = document
+        self.chunker = TextChunker(settings)
+
+    def add_page(self, page_number: int, text: str) -> None:
+        self.write(self.chunker.add_page(page_number, text))
+
+    def finish(self) -> None:
+        self.write(self.chunker.finish())
+
+    def write(self, chunks: Iterable[TextChunk]) -> None:
+        for chunk in chunks:
+            record = {
+                "document": self.document,
+                "chunk": chunk.index,
+                "start_page": chunk.start_page,
+                "start_offset": chunk.start_offset,
+                "end_page": chunk.end_page,
+                "end_offset": chunk.end_offset,
+                "text": chunk.text,
+            }
+            self.handle.write(json.dumps(record, ensure_ascii=False))
+            self.handle.write("\n")
+
+
+@contextlib.contextmanager
+def open_chunk_writer(output_path: Path, settings: ChunkSettings, document: str) -> Iterator[ChunkWriter]:
+    """Yield a writer for output_path's chunk file, which is finished and moved into place only on success."""
+    with temporary_output_path(chunks_path_for(output_path)) as temporary_path:
+        with temporary_path.open("w", encoding="utf-8") as handle:
+            writer = ChunkWriter(handle, document, settings)
+            yield writer
+            writer.finish()
+
+
+def chunk_page_text(page_texts: Iterable[str], page_indexes: Iterable[int], writer: ChunkWriter) -> Iterator[str]:
+    """Pass page texts through unchanged while feeding each one, with its 1-based page number, to writer."""
+    for page_index, text in zip(page_indexes, page_texts, strict=True):
+        writer.add_page(page_index + 1, text)
+        yield text
@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""FFmpeg and ffprobe lookup and command runners shared by the MP4 commands."""
+
+from __future__ import annotations
+
+import collections
+import math
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Iterator
+
+from pytransformer.core.common import ScriptError
+
+FFMPEG_COMMAND = "ffmpeg"
+FFPROBE_COMMAND = "ffprobe"
+MAX_FFMPEG_ERROR_LENGTH = 2000
+# Flags every FFmpeg run starts with: no banner, errors only, never read the terminal, replace temporary outputs.
+FFMPEG_QUIET_ARGS = ("-hide_banner", "-loglevel", "error", "-nostdin", "-y")
+# Analysis filters such as silencedetect report at info level; -nostats drops the progress line.
+FFMPEG_ANALYSIS_ARGS = ("-hide_banner", "-loglevel", "info", "-nostats", "-nostdin")
+# Log lines kept from a streamed FFmpeg run to explain a failure.
+FFMPEG_ERROR_TAIL_LINES = 20
+
+
+def require_ffmpeg() -> str:
+    """Return the FFmpeg executable path or raise a clear setup error."""
+    ffmpeg_path = shutil.which(FFMPEG_COMMAND)
+    if ffmpeg_path is None:
+        raise ScriptError("FFmpeg is required and must be available on PATH.")
+    return ffmpeg_path
+
+
+def require_ffprobe() -> str:
+    """Return the ffprobe executable path, installed alongside FFmpeg, or raise a clear setup error."""
+    ffprobe_path = shutil.which(FFPROBE_COMMAND)
+    if ffprobe_path is None:
+        raise ScriptError("ffprobe is required and must be available on PATH. It is installed with FFmpeg.")
+    return ffprobe_path
+
+
+def run_media_tool(command: list[str], *, action: str) -> subprocess.CompletedProcess[str]:
+    """Run an FFmpeg or ffprobe command and return the finished process.
+
+    A failed run raises ScriptError starting with action, such as
+    "Could not split 'video.mp4'", followed by the end of the tool's error output.
+    """
+    tool = Path(command[0]).name
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, errors="replace", check=False)
+    except OSError as exc:
+        raise ScriptError(f"Could not run {tool}: {exc}") from exc
+    if result.returncode != 0:
+        details = (result.stderr or "").strip()[-MAX_FFMPEG_ERROR_LENGTH:]
+        raise ScriptError(f"{action}: {details or f'{tool} exited with status {result.returncode}.'}")
+    return result
+
+
+def run_ffmpeg(command: list[str], *, action: str) -> str:
+    """Run an FFmpeg command and return its standard error, which carries FFmpeg's log and filter output."""
+    return run_media_tool(command, action=action).stderr or ""
+
+
+def iter_ffmpeg_log(command: list[str], *, action: str) -> Iterator[str]:
+    """Run an FFmpeg analysis command and yield its log lines as FFmpeg writes them.
+
+    Nothing is buffered beyond the last few lines, so analysing a long file
+    uses constant memory. A failed run raises ScriptError starting with action
+    once the log ends; stopping early kills FFmpeg.
+    """
+    try:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+        )
+    except OSError as exc:
+        raise ScriptError(f"Could not run FFmpeg: {exc}") from exc
+    tail: collections.deque[str] = collections.deque(maxlen=FFMPEG_ERROR_TAIL_LINES)
+    try:
+        for line in process.stderr or ():
+            tail.append(line)
+            yield line
+        returncode = process.wait()
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        if process.stderr is not None:
+            process.stderr.close()
+    if returncode != 0:
+        details = "".join(tail).strip()[-MAX_FFMPEG_ERROR_LENGTH:]
+        raise ScriptError(f"{action}: {details or f'FFmpeg exited with status {returncode}.'}")
+
+
+def probe_duration(media_path: Path, *, ffprobe_path: str | None = None) -> float:
+    """Return media_path's duration in seconds, read from the container by ffprobe without decoding."""
+    command = [
+        ffprobe_path or require_ffprobe(),
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(media_path),
+    ]
+    output = run_media_tool(command, action=f"Could not read the duration of '{media_path}'").stdout
+    try:
+        duration = float(output.strip())
+    except ValueError:
+        duration = math.nan
+    if not math.isfinite(duration) or duration <= 0:
+        raise ScriptError(f"Could not determine a positive duration for: {media_path}")
+    return duration
@@ -0,0 +1,267 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Append-only JSONL job journal that lets long batch runs resume after a crash."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+from pytransformer.core.common import ScriptError, resolve_user_path
+
+STATUS_WRITTEN = "written"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_JOURNAL_NAME = ".pyt-journal.jsonl"
+
+
+@dataclass
+class JournalEntry:
+    """One processed item as recorded in the journal."""
+
+    item: str
+    status: str
+    params: dict[str, Any] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: str | None = None
+    output: str | None = None
+    size: int | None = None
+    sha256: str | None = None
+    finished_at: str = ""
+
+
+@dataclass
+class ResumePlan:
+    """Items a resumed run still has to process, and those it can skip."""
+
+    pending: list[Path] = field(default_factory=list)
+    completed: list[Path] = field(default_factory=list)
+    replace_outputs: frozenset[Path] = frozenset()
+
+
+def add_journal_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --journal, --no-journal, and --resume options used by batch commands."""
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        help=(
+            f"Job journal path. Defaults to {DEFAULT_JOURNAL_NAME} in --output-folder; without an output folder, "
+            "no journal is kept unless this is given."
+        ),
+    )
+    parser.add_argument("--no-journal", action="store_true", help="Do not record a job journal for this run.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip items the journal records as complete and retry failed or missing ones.",
+    )
+
+
+def open_batch_journal(args: argparse.Namespace, output_folder: Path | None) -> JobJournal | None:
+    """Open the journal selected by the shared journal options, or return None when there is none.
+
+    The default journal lives in the output folder. Without one, a journal is
+    kept only when --journal names it, so a run never writes into the input folder
+    unasked.
+    """
+    if args.no_journal:
+        if args.resume:
+            raise ScriptError("--resume needs a job journal; remove --no-journal.")
+        return None
+    if args.journal is not None:
+        return JobJournal.open(args.journal, resume=args.resume)
+    if output_folder is None:
+        if args.resume:
+            raise ScriptError("--resume needs a job journal; pass --output-folder or --journal.")
+        return None
+    return JobJournal.open(output_folder / DEFAULT_JOURNAL_NAME, resume=args.resume)
+
+
+def file_fingerprint(path: Path) -> tuple[int, str]:
+    """Return the size and SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            size += len(chunk)
+            digest.update(chunk)
+    return size, digest.hexdigest()
+
+
+class JobJournal:
+    """Record per-item batch outcomes and answer which items a resumed run can skip.
+
+    Each record is one JSON line, flushed and synced as soon as the item
+    finishes, so a crash loses at most the items that were still running.
+    Skipped items are only flushed, since redoing their check is cheap. A torn
+    final line from an interrupted write is ignored when the journal is read
+    back. The latest record for an item wins.
+
+    Only a resumed run reads the journal. It first rewrites it with the latest
+    record for each item, and any other run starts a new journal, so the file
+    stays the size of one batch however many runs it has seen.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = resolve_user_path(path)
+        self.entries: dict[str, JournalEntry] = {}
+        self._handle: IO[str] | None = None
+
+    @classmethod
+    def open(cls, path: Path, *, resume: bool = False) -> JobJournal:
+        journal = cls(path)
+        if resume:
+            journal.load()
+            journal.compact()
+        try:
+            journal.path.parent.mkdir(parents=True, exist_ok=True)
+            journal._handle = journal.path.open("a" if resume else "w", encoding="utf-8")
+        except OSError as exc:
+            raise ScriptError(f"Could not open job journal '{journal.path}': {exc}") from exc
+        return journal
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError) as exc:
+            raise ScriptError(f"Could not read job journal '{self.path}': {exc}") from exc
+        for line in lines:
+            try:
+                record = json.loads(line)
+                entry = JournalEntry(**record)
+            except (TypeError, ValueError):
+                continue
+            self.entries[entry.item] = entry
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the latest record for each item, replacing it atomically."""
+        if not self.path.exists():
+            return
+        try:
+            file_descriptor, temporary_name = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f"{self.path.name}-", suffix=".tmp"
+            )
+        except OSError as exc:
+            raise ScriptError(f"Could not compact job journal '{self.path}': {exc}") from exc
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as handle:
+                for entry in self.entries.values():
+                    handle.write(json.dumps(asdict(entry), sort_keys=True) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary_name, self.path)
+        except OSError as exc:
+            raise ScriptError(f"Could not compact job journal '{self.path}': {exc}") from exc
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temporary_name)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            with contextlib.suppress(OSError):
+                self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> JobJournal:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        item: Path,
+        status: str,
+        *,
+        params: dict[str, Any],
+        seconds: float = 0.0,
+        error: BaseException | str | None = None,
+        output: Path | None = None,
+    ) -> JournalEntry:
+        """Append one item outcome, fingerprinting the output when it was written."""
+        size: int | None = None
+        sha256: str | None = None
+        if status == STATUS_WRITTEN and output is not None:
+            try:
+                size, sha256 = file_fingerprint(output)
+            except OSError:
+                size, sha256 = None, None
+        entry = JournalEntry(
+            item=str(item),
+            status=status,
+            params=params,
+            seconds=round(seconds, 3),
+            error=str(error) if error is not None else None,
+            output=str(output) if output is not None else None,
+            size=size,
+            sha256=sha256,
+            finished_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        self.entries[entry.item] = entry
+        if self._handle is not None:
+            try:
+                self._handle.write(json.dumps(asdict(entry), sort_keys=True) + "\n")
+                self._handle.flush()
+                if status != STATUS_SKIPPED:
+                    os.fsync(self._handle.fileno())
+            except OSError as exc:
+                raise ScriptError(f"Could not write job journal '{self.path}': {exc}") from exc
+        return entry
+
+    def completed_entry(self, item: Path, *, params: dict[str, Any]) -> JournalEntry | None:
+        """Return the item's last successful entry when it used the same parameters."""
+        entry = self.entries.get(str(item))
+        if entry is None or entry.status != STATUS_WRITTEN or entry.params != params:
+            return None
+        return entry
+
+    def is_complete(self, item: Path, *, params: dict[str, Any]) -> bool:
+        """Return whether the item finished with these parameters and its output is unchanged."""
+        entry = self.completed_entry(item, params=params)
+        return entry is not None and verify_output(entry)
+
+
+def verify_output(entry: JournalEntry) -> bool:
+    """Check that a journaled output still exists with the recorded size and hash."""
+    if entry.output is None or entry.size is None or entry.sha256 is None:
+        return False
+    output = Path(entry.output)
+    try:
+        if output.stat().st_size != entry.size:
+            return False
+        return file_fingerprint(output) == (entry.size, entry.sha256)
+    except OSError:
+        return False
+
+
+def plan_resume(journal: JobJournal, items: list[Path], *, params: dict[str, Any]) -> ResumePlan:
+    """Split items into those already complete and those a resumed run must process.
+
+    An item whose journaled output is missing or no longer matches its recorded
+    size and hash is retried, and its stale output may be replaced even without
+    --overwrite because the journal shows this batch produced it.
+    """
+    plan = ResumePlan()
+    replace_outputs: set[Path] = set()
+    for item in items:
+        entry = journal.completed_entry(item, params=params)
+        if entry is not None and verify_output(entry):
+            plan.completed.append(item)
+            continue
+        plan.pending.append(item)
+        if entry is not None and entry.output is not None and Path(entry.output).exists():
+            replace_outputs.add(item)
+    plan.replace_outputs = frozenset(replace_outputs)
+    return plan
@@ -0,0 +1,235 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Incremental-run manifest: remember each input's size, mtime, and hash so unchanged inputs can be skipped."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from pytransformer.core.common import ScriptError, resolve_user_path
+from pytransformer.core.journal import file_fingerprint
+
+DEFAULT_MANIFEST_NAME = ".pyt-manifest.json"
+MANIFEST_VERSION = 1
+# Entries recorded since the last save are appended to <manifest>.log and folded into the manifest on save.
+MANIFEST_LOG_SUFFIX = ".log"
+
+
+@dataclass(frozen=True)
+class SourceState:
+    """An input file's size, modification time, and SHA-256 digest when it was processed."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class ManifestEntry:
+    """The input state and settings that produced one output."""
+
+    output: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class IncrementalPlan:
+    """Items an incremental run has to process, and those unchanged since the last run."""
+
+    pending: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    replace_outputs: frozenset[Path] = frozenset()
+
+
+def source_state(path: Path) -> SourceState:
+    """Stat and hash an input; the stat is taken first so a file changed while hashing is seen as changed later."""
+    stat = path.stat()
+    _size, sha256 = file_fingerprint(path)
+    return SourceState(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256)
+
+
+class IncrementalManifest:
+    """Track which inputs produced which outputs so later runs only redo inputs that changed.
+
+    The manifest is one JSON document that is replaced atomically on save.
+    Each change in between is appended as one line to a log beside it, so
+    recording an entry costs the same however large the manifest is, and a
+    run that crashes before saving keeps its progress. Loading replays the
+    log over the document, and saving folds it in and removes it.
+
+    An input counts as unchanged when its size and mtime match the recorded
+    ones. When only the mtime moved, for example after a copy or a touch, the
+    input is hashed and still counts as unchanged if the content is the same.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = resolve_user_path(path)
+        self.log_path = self.path.with_name(self.path.name + MANIFEST_LOG_SUFFIX)
+        self.entries: dict[str, ManifestEntry] = {}
+        self.dirty = False
+        self._log: TextIO | None = None
+
+    @classmethod
+    def open(cls, path: Path) -> IncrementalManifest:
+        manifest = cls(path)
+        manifest.load()
+        return manifest
+
+    def load(self) -> None:
+        if self.path.exists():
+            try:
+                document = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError, ValueError) as exc:
+                raise ScriptError(f"Could not read manifest '{self.path}': {exc}") from exc
+            if not isinstance(document, dict) or document.get("version") != MANIFEST_VERSION:
+                raise ScriptError(f"Unsupported manifest format in '{self.path}'; delete it to start a fresh manifest.")
+            for item, record in document.get("entries", {}).items():
+                try:
+                    self.entries[item] = ManifestEntry(**record)
+                except TypeError:
+                    continue
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        """Apply entries appended after the last save; a line torn by a crash is skipped."""
+        if not self.log_path.exists():
+            return
+        try:
+            lines = self.log_path.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError) as exc:
+            raise ScriptError(f"Could not read manifest log '{self.log_path}': {exc}") from exc
+        for line in lines:
+            try:
+                record = json.loads(line)
+                item = record.pop("item")
+                self.entries[item] = ManifestEntry(**record)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        self.dirty = True
+
+    def _append(self, item: str, entry: ManifestEntry) -> None:
+        try:
+            if self._log is None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._log = self.log_path.open("a", encoding="utf-8")
+            # Flushed but not synced: a lost line only means that input is extracted again next time.
+            self._log.write(json.dumps({"item": item, **asdict(entry)}, separators=(",", ":")) + "\n")
+            self._log.flush()
+        except OSError as exc:
+            raise ScriptError(f"Could not write manifest log '{self.log_path}': {exc}") from exc
+
+    def close_log(self) -> None:
+        if self._log is not None:
+            with contextlib.suppress(OSError):
+                self._log.close()
+            self._log = None
+
+    def save(self) -> None:
+        """Fold the log in, write the manifest to a temporary file, rename it over the old one, and drop the log."""
+        self.close_log()
+        if not self.dirty:
+            return
+        document = {
+            "version": MANIFEST_VERSION,
+            "entries": {item: asdict(entry) for item, entry in sorted(self.entries.items())},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary_name = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f"{self.path.name}-", suffix=".tmp"
+            )
+        except OSError as exc:
+            raise ScriptError(f"Could not write manifest '{self.path}': {exc}") from exc
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as handle:
+                json.dump(document, handle, separators=(",", ":"))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary_name, self.path)
+        except OSError as exc:
+            raise ScriptError(f"Could not write manifest '{self.path}': {exc}") from exc
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temporary_name)
+        try:
+            self.log_path.unlink(missing_ok=True)
+        except OSError as exc:
+            raise ScriptError(f"Could not remove manifest log '{self.log_path}': {exc}") from exc
+        self.dirty = False
+
+    def record(self, item: Path, source: SourceState, *, output: Path, params: dict[str, Any]) -> None:
+        entry = ManifestEntry(
+            output=str(output),
+            size=source.size,
+            mtime_ns=source.mtime_ns,
+            sha256=source.sha256,
+            params=params,
+        )
+        self.entries[str(item)] = entry
+        self._append(str(item), entry)
+        self.dirty = True
+
+    def retain(self, items: list[Path]) -> None:
+        """Forget inputs that are no longer part of the batch, such as deleted PDFs."""
+        keep = {str(item) for item in items}
+        stale = [item for item in self.entries if item not in keep]
+        for item in stale:
+            del self.entries[item]
+        self.dirty = self.dirty or bool(stale)
+
+    def is_unchanged(self, item: Path, *, output: Path, params: dict[str, Any]) -> bool:
+        """Return whether item still matches its recorded state and its output is still there."""
+        entry = self.entries.get(str(item))
+        if entry is None or entry.params != params or entry.output != str(output):
+            return False
+        try:
+            stat = item.stat()
+            if stat.st_size != entry.size or not output.is_file():
+                return False
+            if stat.st_mtime_ns == entry.mtime_ns:
+                return True
+            if file_fingerprint(item)[1] != entry.sha256:
+                return False
+        except OSError:
+            return False
+        entry.mtime_ns = stat.st_mtime_ns
+        self._append(str(item), entry)
+        self.dirty = True
+        return True
+
+
+def plan_incremental(
+    manifest: IncrementalManifest,
+    items: list[Path],
+    *,
+    output_for: Callable[[Path], Path],
+    params: dict[str, Any],
+) -> IncrementalPlan:
+    """Split items into those unchanged since the last run and those that must be processed again.
+
+    A changed item's previous output may be replaced even without --overwrite,
+    because the manifest shows an earlier run of this batch produced it.
+    """
+    plan = IncrementalPlan()
+    replace_outputs: set[Path] = set()
+    for item in items:
+        output = output_for(item)
+        if manifest.is_unchanged(item, output=output, params=params):
+            plan.unchanged.append(item)
+            continue
+        plan.pending.append(item)
+        entry = manifest.entries.get(str(item))
+        if entry is not None and entry.output == str(output) and output.exists():
+            replace_outputs.add(item)
+    plan.replace_outputs = frozenset(replace_outputs)
+    return plan
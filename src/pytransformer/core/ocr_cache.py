@@ -0,0 +1,192 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""On-disk OCR result cache keyed by page image content and OCR settings."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from pytransformer.core.common import ScriptError, resolve_user_path
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_LIMIT_MB = 512
+CACHE_SUFFIX = ".txt"
+# Evict down to this fraction of the limit so a full cache does not rescan on every write.
+EVICTION_TARGET = 0.9
+
+# Caches unpickled in a worker process, reused for every task it runs so the size estimate carries over.
+_process_caches: dict[tuple[Path, int], OcrCache] = {}
+
+
+def page_image_digest(page: Any) -> str | None:
+    """Hash the raw streams that decide how a PyMuPDF page renders, without rendering it.
+
+    The page content stream, geometry, image XObjects, soft masks, and form
+    XObjects are included. Returns None when the page has no images or the
+    streams cannot be read; callers then hash the rendered pixmap instead.
+    """
+    try:
+        images = page.get_images(full=True)
+        if not images:
+            return None
+        doc = page.parent
+        digest = hashlib.sha256()
+        digest.update(repr((tuple(page.rect), page.rotation)).encode("utf-8"))
+        digest.update(page.read_contents() or b"")
+        xrefs = [image[0] for image in images] + [image[1] for image in images if image[1]]
+        xrefs += [xobject[0] for xobject in page.get_xobjects()]
+        for xref in xrefs:
+            # Hash lengths rather than xref numbers so a re-saved copy of the same scan still matches.
+            stream = doc.xref_stream_raw(xref) or b""
+            digest.update(len(stream).to_bytes(8, "big"))
+            digest.update(stream)
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def pixmap_digest(pix: Any) -> str:
+    """Hash rendered pixmap samples and their layout."""
+    digest = hashlib.sha256()
+    digest.update(repr((pix.width, pix.height, pix.n)).encode("ascii"))
+    digest.update(pix.samples)
+    return digest.hexdigest()
+
+
+def ocr_cache_key(
+    content_digest: str,
+    *,
+    source: str,
+    dpi: int,
+    language: str | None,
+    config: str,
+    backend: str = "",
+) -> str:
+    """Combine a page content digest with every setting that changes OCR output."""
+    settings = {
+        "version": CACHE_FORMAT_VERSION,
+        "source": source,
+        "content": content_digest,
+        "backend": backend,
+        "dpi": dpi,
+        "language": language,
+        "config": config,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def shared_ocr_cache(folder: Path, max_bytes: int, size_estimate: int | None) -> OcrCache:
+    """Return this process's cache for folder, starting from size_estimate the first time; used by unpickling."""
+    key = (folder, max_bytes)
+    cache = _process_caches.get(key)
+    if cache is None:
+        cache = OcrCache(folder, max_bytes=max_bytes)
+        cache._size_estimate = size_estimate
+        _process_caches[key] = cache
+    return cache
+
+
+class OcrCache:
+    """Store OCR text in a folder of small files with size-bounded, least-recently-used eviction.
+
+    A hit refreshes the entry's modification time, and eviction removes the
+    oldest entries first. Several worker processes may share one folder:
+    writes are atomic renames and entries that vanish mid-scan are ignored.
+
+    The folder size is measured once, in prepare, and then tracked from the
+    writes. A cache sent to worker processes becomes one instance per process,
+    so each worker keeps its own running estimate instead of rescanning the
+    folder for every task; the estimate is approximate, and eviction corrects it.
+    """
+
+    def __init__(self, folder: Path, *, max_bytes: int = DEFAULT_CACHE_LIMIT_MB * 1024 * 1024) -> None:
+        if max_bytes <= 0:
+            raise ScriptError(f"OCR cache size must be positive. Got {max_bytes}")
+        self.folder = resolve_user_path(folder)
+        self.max_bytes = max_bytes
+        self._size_estimate: int | None = None
+
+    def prepare(self) -> None:
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise ScriptError(f"Could not create OCR cache folder '{self.folder}': {exc}") from exc
+        if not self.folder.is_dir():
+            raise ScriptError(f"OCR cache path is not a folder: {self.folder}")
+        self._size_estimate = self.total_size()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (shared_ocr_cache, (self.folder, self.max_bytes, self._size_estimate))
+
+    def path_for(self, key: str) -> Path:
+        return self.folder / key[:2] / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> str | None:
+        path = self.path_for(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store text under key; cache write failures never fail the extraction."""
+        path = self.path_for(key)
+        data = text.encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, "wb") as handle:
+                    handle.write(data)
+                os.replace(temporary_name, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temporary_name)
+                raise
+        except OSError:
+            return
+        if self._size_estimate is None:
+            self._size_estimate = self.total_size()
+        else:
+            self._size_estimate += len(data)
+        if self._size_estimate > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        found: list[tuple[float, int, Path]] = []
+        for path in self.folder.glob(f"*/*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def total_size(self) -> int:
+        return sum(size for _mtime, size, _path in self.entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache is back under its limit."""
+        entries = sorted(self.entries())
+        total = sum(size for _mtime, size, _path in entries)
+        target = int(self.max_bytes * EVICTION_TARGET)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                removed += 1
+            total -= size
+        self._size_estimate = total
+        return removed
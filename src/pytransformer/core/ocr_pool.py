@@ -0,0 +1,294 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Persistent Tesseract OCR workers fed from a shared queue."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import importlib
+import queue
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pytransformer.core.common import ScriptError, require_positive_int
+
+TESSERACT_COMMAND = "tesseract"
+TESSERACT_TIMEOUT_SECONDS = 600
+MAX_TESSERACT_ERROR_LENGTH = 500
+DEFAULT_BATCH_SIZE = 4
+# Tesseract ends each page's text with a form feed in list-file mode.
+PAGE_SEPARATOR = "\f"
+MODE_TESSEROCR = "tesserocr"
+MODE_LIST_FILE = "list-file"
+
+tesserocr: Any | None = None
+TESSEROCR_IMPORT_ERROR: ImportError | None = None
+TESSEROCR_IMPORT_ATTEMPTED = False
+
+
+@dataclass
+class GrayImage:
+    """An 8-bit grayscale page render with tightly packed rows."""
+
+    width: int
+    height: int
+    samples: bytes
+    dpi: int
+
+    def to_pgm(self) -> bytes:
+        return f"P5\n{self.width} {self.height}\n255\n".encode("ascii") + self.samples
+
+
+@dataclass
+class _Job:
+    image: GrayImage
+    future: concurrent.futures.Future[str]
+
+
+def load_tesserocr() -> bool:
+    """Load tesserocr lazily; the pool falls back to the tesseract executable without it."""
+    global TESSEROCR_IMPORT_ATTEMPTED
+    global TESSEROCR_IMPORT_ERROR
+    global tesserocr
+
+    if TESSEROCR_IMPORT_ATTEMPTED:
+        return tesserocr is not None
+
+    TESSEROCR_IMPORT_ATTEMPTED = True
+    try:
+        tesserocr = importlib.import_module("tesserocr")
+    except ImportError as exc:
+        TESSEROCR_IMPORT_ERROR = exc
+        return False
+    return True
+
+
+def find_tesseract() -> str | None:
+    return shutil.which(TESSERACT_COMMAND)
+
+
+def build_tesseract_command(
+    executable: str,
+    image_argument: str,
+    *,
+    dpi: int,
+    language: str | None,
+    config: str,
+) -> list[str]:
+    # PGM input carries no resolution, so pass the render DPI explicitly.
+    command = [executable, image_argument, "stdout", "--dpi", str(dpi)]
+    if language:
+        command += ["-l", language]
+    return command + shlex.split(config)
+
+
+def run_tesseract_command(command: list[str], *, input_data: bytes | None = None) -> str:
+    try:
+        result = subprocess.run(
+            command,
+            input=input_data,
+            capture_output=True,
+            check=False,
+            timeout=TESSERACT_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise ScriptError(f"Could not run Tesseract: {exc}") from exc
+    if result.returncode != 0:
+        details = result.stderr.decode("utf-8", "replace").strip()[-MAX_TESSERACT_ERROR_LENGTH:]
+        raise ScriptError(details or f"Tesseract exited with status {result.returncode}.")
+    return result.stdout.decode("utf-8", "replace")
+
+
+def parse_tesserocr_config(config: str) -> tuple[int | None, dict[str, str]] | None:
+    """Translate --psm and -c name=value flags for tesserocr; None means other flags need the executable."""
+    page_seg_mode: int | None = None
+    variables: dict[str, str] = {}
+    arguments = shlex.split(config)
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        value = arguments[index + 1] if index + 1 < len(arguments) else ""
+        if argument == "--psm" and value.isdigit():
+            page_seg_mode = int(value)
+        elif argument == "-c" and "=" in value:
+            name, _separator, setting = value.partition("=")
+            variables[name] = setting
+        else:
+            return None
+        index += 2
+    return page_seg_mode, variables
+
+
+class TesseractPool:
+    """Keep N Tesseract workers alive and OCR queued grayscale pages with them.
+
+    With tesserocr installed each worker thread owns one initialized API
+    handle, so the language model loads once per worker and recognition runs
+    outside the GIL. Otherwise each worker drains up to ``batch_size`` queued
+    pages into one ``tesseract`` list-file run and splits its output on the
+    form feed Tesseract writes after every page.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        language: str | None = None,
+        config: str = "",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        require_positive_int(workers, label="OCR workers")
+        require_positive_int(batch_size, label="OCR batch size")
+        self.language = language
+        self.config = config
+        self.batch_size = batch_size
+        self._tesserocr = tesserocr if load_tesserocr() else None
+        self._tesserocr_settings = parse_tesserocr_config(config) if self._tesserocr is not None else None
+        executable = find_tesseract()
+        if self._tesserocr_settings is not None:
+            self.mode = MODE_TESSEROCR
+        elif executable is not None:
+            self.mode = MODE_LIST_FILE
+        else:
+            raise ScriptError("The OCR worker pool needs tesserocr or the tesseract executable on PATH.")
+        self.executable = executable or TESSERACT_COMMAND
+        self._jobs: queue.Queue[_Job | None] = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"pyt-tesseract-{index}", daemon=True) for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> TesseractPool:
+        return self
+
+    def __exit__(self, exc_type: object, *_args: object) -> None:
+        self.close(cancel=exc_type is not None)
+
+    def submit(self, image: GrayImage) -> concurrent.futures.Future[str]:
+        future: concurrent.futures.Future[str] = concurrent.futures.Future()
+        self._jobs.put(_Job(image, future))
+        return future
+
+    def close(self, *, cancel: bool = False) -> None:
+        """Stop the workers, finishing queued pages unless cancel is set."""
+        if cancel:
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    job = self._jobs.get_nowait()
+                    if job is not None:
+                        job.future.cancel()
+        for _thread in self._threads:
+            self._jobs.put(None)
+        if not cancel:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self) -> None:
+        if self._tesserocr is not None and self._tesserocr_settings is not None:
+            self._work_tesserocr(self._tesserocr, *self._tesserocr_settings)
+        else:
+            self._work_list_file()
+
+    def _fail_remaining(self, error: BaseException) -> None:
+        while (job := self._jobs.get()) is not None:
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+
+    def _work_tesserocr(self, module: Any, page_seg_mode: int | None, variables: dict[str, str]) -> None:
+        try:
+            api = module.PyTessBaseAPI(lang=self.language or "eng")
+            if page_seg_mode is not None:
+                api.SetPageSegMode(page_seg_mode)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+        except Exception as exc:
+            # A worker that cannot start must still answer every page it takes.
+            self._fail_remaining(ScriptError(f"Could not start tesserocr: {exc}"))
+            return
+        try:
+            while (job := self._jobs.get()) is not None:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    image = job.image
+                    api.SetImageBytes(image.samples, image.width, image.height, 1, image.width)
+                    api.SetSourceResolution(image.dpi)
+                    job.future.set_result(api.GetUTF8Text())
+                except Exception as exc:
+                    job.future.set_exception(exc)
+        finally:
+            api.End()
+
+    def _next_batch(self, first: _Job, carry: list[_Job]) -> list[_Job]:
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # Leave the stop signal for this worker's next loop.
+                self._jobs.put(None)
+                break
+            if job.image.dpi != first.image.dpi:
+                carry.append(job)
+                break
+            batch.append(job)
+        return [job for job in batch if job.future.set_running_or_notify_cancel()]
+
+    def _work_list_file(self) -> None:
+        carry: list[_Job] = []
+        while True:
+            first = carry.pop() if carry else self._jobs.get()
+            if first is None:
+                return
+            batch = self._next_batch(first, carry)
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_Job]) -> None:
+        dpi = batch[0].image.dpi
+        try:
+            with tempfile.TemporaryDirectory(prefix="pyt-ocr-") as temp_dir:
+                folder = Path(temp_dir)
+                image_paths = []
+                for index, job in enumerate(batch):
+                    image_path = folder / f"page-{index:04d}.pgm"
+                    image_path.write_bytes(job.image.to_pgm())
+                    image_paths.append(str(image_path))
+                list_path = folder / "pages.txt"
+                list_path.write_text("\n".join(image_paths) + "\n", encoding="utf-8")
+                command = build_tesseract_command(
+                    self.executable, str(list_path), dpi=dpi, language=self.language, config=self.config
+                )
+                pages = run_tesseract_command(command).split(PAGE_SEPARATOR)
+        except Exception as exc:
+            for job in batch:
+                job.future.set_exception(exc)
+            return
+
+        if len(pages) < len(batch):
+            # Output could not be split reliably; OCR the pages one at a time instead.
+            for job in batch:
+                self._run_single(job)
+            return
+        for job, text in zip(batch, pages[: len(batch)], strict=True):
+            job.future.set_result(text)
+
+    def _run_single(self, job: _Job) -> None:
+        command = build_tesseract_command(
+            self.executable, "stdin", dpi=job.image.dpi, language=self.language, config=self.config
+        )
+        try:
+            job.future.set_result(run_tesseract_command(command, input_data=job.image.to_pgm()))
+        except Exception as exc:
+            job.future.set_exception(exc)
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Cheap PyMuPDF page classification for deciding which pages need OCR, and at what DPI."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any
+
+PAGE_KIND_TEXT = "text"
+PAGE_KIND_SCANNED = "scanned"
+PAGE_KIND_GARBLED = "garbled"
+PAGE_KIND_NO_TEXT = "no-text"
+OCR_PAGE_KINDS = (PAGE_KIND_SCANNED, PAGE_KIND_GARBLED, PAGE_KIND_NO_TEXT)
+
+# Images covering this much of the page with only a few text spans are scans with a stray text layer,
+# such as a stamped page number or a partial OCR layer.
+SCANNED_IMAGE_COVERAGE = 0.85
+MAX_SCANNED_TEXT_SPANS = 3
+# Shorter text layers are too small to judge as garbled.
+MIN_GARBLED_SAMPLE = 20
+MAX_SUSPICIOUS_CHARACTER_RATIO = 0.1
+MIN_ALPHANUMERIC_RATIO = 0.3
+# Runs of one punctuation mark, such as dot leaders in a table of contents or table rules, count as one character.
+REPEATED_PUNCTUATION = re.compile(r"([^\w\s])\1+")
+# Never render below this DPI, even for low-resolution scans; Tesseract accuracy drops quickly under it.
+MIN_ADAPTIVE_OCR_DPI = 150
+POINTS_PER_INCH = 72
+# Unicode categories that a usable text layer should almost never contain.
+SUSPICIOUS_CATEGORIES = ("Cc", "Co", "Cn", "Cs")
+REPLACEMENT_CHARACTER = "\ufffd"
+
+
+@dataclass
+class PageProfile:
+    """What a page looks like before extraction: its text layer, image coverage, and scan resolution."""
+
+    kind: str
+    text: str = ""
+    image_coverage: float = 0.0
+    native_dpi: int | None = None
+
+    @property
+    def needs_ocr(self) -> bool:
+        return self.kind in OCR_PAGE_KINDS
+
+
+def is_garbled_text(text: str) -> bool:
+    """Return True for text layers made of replacement, private-use, or control characters or mostly symbols.
+
+    These come from fonts without a usable ToUnicode map and read as noise;
+    OCR of the rendered page recovers the real text.
+    """
+    characters = [character for character in text if not character.isspace()]
+    if len(characters) < MIN_GARBLED_SAMPLE:
+        return False
+    suspicious = sum(
+        1
+        for character in characters
+        if character == REPLACEMENT_CHARACTER or unicodedata.category(character) in SUSPICIOUS_CATEGORIES
+    )
+    if suspicious / len(characters) > MAX_SUSPICIOUS_CHARACTER_RATIO:
+        return True
+    collapsed = REPEATED_PUNCTUATION.sub(r"\1", "".join(characters))
+    alphanumeric = sum(1 for character in collapsed if character.isalnum())
+    return alphanumeric / len(collapsed) < MIN_ALPHANUMERIC_RATIO
+
+
+def page_fonts(page: Any) -> list[Any] | None:
+    """Return the fonts a page references, including those in form XObjects, or None if unknown."""
+    try:
+        return list(page.get_fonts())
+    except Exception:
+        return None
+
+
+def image_placements(page: Any) -> tuple[float, int | None]:
+    """Return the fraction of the page covered by images and the largest image's effective DPI.
+
+    The DPI is the image's pixel size divided by its placed size in inches,
+    which is the resolution the page was scanned at. Rendering above it only
+    interpolates pixels. Pages whose images cannot be inspected report no coverage.
+    """
+    try:
+        infos = page.get_image_info()
+        page_rect = page.rect
+        page_area = float(page_rect.width * page_rect.height)
+    except Exception:
+        return 0.0, None
+    if not infos or page_area <= 0:
+        return 0.0, None
+
+    covered = 0.0
+    largest_area = 0.0
+    native_dpi: int | None = None
+    for info in infos:
+        x0, y0, x1, y1 = info["bbox"]
+        width = max(0.0, min(x1, page_rect.x1) - max(x0, page_rect.x0))
+        height = max(0.0, min(y1, page_rect.y1) - max(y0, page_rect.y0))
+        area = width * height
+        covered += area
+        if area <= largest_area:
+            continue
+        largest_area = area
+        # Compare long sides so images placed at a quarter turn still measure correctly.
+        placed_inches = max(x1 - x0, y1 - y0) / POINTS_PER_INCH
+        native_dpi = round(max(info["width"], info["height"]) / placed_inches)
+    return min(1.0, covered / page_area), native_dpi
+
+
+def count_text_spans(page: Any) -> int | None:
+    """Count text spans without decoding image blocks; None when the layout cannot be read."""
+    try:
+        layout = page.get_text("dict", flags=0)
+        return sum(len(line["spans"]) for block in layout["blocks"] for line in block.get("lines", ()))
+    except Exception:
+        return None
+
+
+def is_stray_text_layer(page: Any) -> bool:
+    spans = count_text_spans(page)
+    return spans is not None and spans <= MAX_SCANNED_TEXT_SPANS
+
+
+def classify_page(page: Any) -> PageProfile:
+    """Classify a page from its fonts, text layer, and image placements without rendering it.
+
+    A page that references no fonts cannot have a text layer, so its text is
+    not extracted at all. Pages whose text layer is empty, garbled, or a few
+    spans over a full-page image are marked for OCR.
+    """
+    fonts = page_fonts(page)
+    text = "" if fonts == [] else page.get_text("text") or ""
+    coverage, native_dpi = image_placements(page)
+    if not text.strip():
+        kind = PAGE_KIND_SCANNED if coverage else PAGE_KIND_NO_TEXT
+    elif is_garbled_text(text):
+        kind = PAGE_KIND_GARBLED
+    elif coverage >= SCANNED_IMAGE_COVERAGE and is_stray_text_layer(page):
+        kind = PAGE_KIND_SCANNED
+    else:
+        kind = PAGE_KIND_TEXT
+    return PageProfile(kind, text, coverage, native_dpi)
+
+
+def adaptive_ocr_dpi(native_dpi: int | None, max_dpi: int) -> int:
+    """Pick the OCR render DPI: the scan's own resolution, at least MIN_ADAPTIVE_OCR_DPI and at most max_dpi."""
+    if native_dpi is None:
+        return max_dpi
+    return min(max_dpi, max(MIN_ADAPTIVE_OCR_DPI, native_dpi))
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Page-range selection shared by the PDF commands."""
+
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass
+from typing import Sequence
+
+from pytransformer.core.common import ScriptError
+
+# One comma-separated item: a page, a closed range, or an open-ended range. Negative numbers count from the end.
+PAGE_ITEM_PATTERN = re.compile(r"(-?\d+)(?:(-)(-?\d+)?)?")
+PAGES_HELP = (
+    "Pages to process, such as 1-5,10,-1. Numbers start at 1, negative numbers count from the last page, "
+    "and N- runs to the end. Write a selection that starts with a range from the end with =, as in "
+    "--pages=-3--1. Defaults to every page."
+)
+
+
+@dataclass(frozen=True)
+class PageRange:
+    """One parsed item; ``last`` is None for open-ended ranges such as ``5-``."""
+
+    first: int
+    last: int | None
+    single: bool = False
+
+
+@dataclass(frozen=True)
+class PageSelection:
+    """A parsed --pages value, resolved against a document's page count when it is opened."""
+
+    spec: str
+    ranges: tuple[PageRange, ...]
+
+    def indexes(self, page_count: int) -> list[int]:
+        """Return sorted, de-duplicated 0-based page indexes.
+
+        Ranges are clipped to the document, so ``1-5`` on a three-page PDF
+        selects all three pages. A single page outside the document, or a
+        selection with no pages left, is an error.
+        """
+        selected: set[int] = set()
+        for page_range in self.ranges:
+            first = _absolute_page(page_range.first, page_count)
+            last = page_count if page_range.last is None else _absolute_page(page_range.last, page_count)
+            if page_range.single and not 1 <= first <= page_count:
+                raise ScriptError(f"Page {page_range.first} is out of range; the PDF has {page_count} pages.")
+            if first > last:
+                continue
+            selected.update(range(max(first, 1) - 1, min(last, page_count)))
+        if not selected:
+            raise ScriptError(f"--pages {self.spec} selects no pages; the PDF has {page_count} pages.")
+        return sorted(selected)
+
+
+def _absolute_page(number: int, page_count: int) -> int:
+    return page_count + 1 + number if number < 0 else number
+
+
+def parse_page_selection(spec: str) -> PageSelection:
+    """Parse a --pages value such as ``1-5,10,-1``, ``5-``, or ``-3--1``."""
+    ranges: list[PageRange] = []
+    for item in spec.replace(" ", "").split(","):
+        match = PAGE_ITEM_PATTERN.fullmatch(item)
+        if match is None:
+            raise ScriptError(f"Invalid page selection {item!r} in {spec!r}; use pages like 1-5,10,-1.")
+        first = int(match.group(1))
+        if match.group(2) is None:
+            last: int | None = first
+        else:
+            last = int(match.group(3)) if match.group(3) is not None else None
+        if first == 0 or last == 0:
+            raise ScriptError(f"Page numbers start at 1; got {item!r}.")
+        if last is not None and (first < 0) == (last < 0) and first > last:
+            raise ScriptError(f"Page range {item!r} runs backwards.")
+        ranges.append(PageRange(first, last, single=match.group(2) is None))
+    return PageSelection(spec, tuple(ranges))
+
+
+def page_selection_argument(value: str) -> PageSelection:
+    try:
+        return parse_page_selection(value)
+    except ScriptError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def add_pages_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --pages option used by the PDF commands."""
+    parser.add_argument("--pages", type=page_selection_argument, metavar="PAGES", help=PAGES_HELP)
+
+
+def selected_page_indexes(selection: PageSelection | None, page_count: int) -> Sequence[int]:
+    """Return the 0-based pages to process, every page when no selection was given."""
+    if selection is None:
+        return range(page_count)
+    return selection.indexes(page_count)
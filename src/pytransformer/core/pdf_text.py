@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Selectable-text engine choice for the PDF text commands, pypdf or PyMuPDF, streamed page-text writing, and
+per-worker PyMuPDF documents."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from pytransformer.core.chunking import (
+    PAGE_SEPARATOR,
+    ChunkSettings,
+    chunk_page_text,
+    open_chunk_writer,
+)
+from pytransformer.core.common import ScriptError, temporary_output_path
+from pytransformer.core.pages import PageSelection, selected_page_indexes
+from pytransformer.core.text_index import PageSpool, collect_page_text
+
+ENGINE_AUTO = "auto"
+ENGINE_PYPDF = "pypdf"
+ENGINE_PYMUPDF = "pymupdf"
+ENGINES = (ENGINE_AUTO, ENGINE_PYPDF, ENGINE_PYMUPDF)
+# PyMuPDF text flag bits, named as in PyMuPDF, so the flags are known before PyMuPDF is imported.
+TEXT_PRESERVE_LIGATURES = 1
+TEXT_PRESERVE_WHITESPACE = 2
+TEXT_MEDIABOX_CLIP = 64
+TEXT_CID_FOR_UNKNOWN_UNICODE = 128
+# PyMuPDF's TEXTFLAGS_TEXT without TEXT_PRESERVE_LIGATURES, so "ﬁ" reads as "fi" the way pypdf reports it.
+PYMUPDF_TEXT_FLAGS = TEXT_PRESERVE_WHITESPACE | TEXT_MEDIABOX_CLIP | TEXT_CID_FOR_UNKNOWN_UNICODE
+
+# Documents opened by worker_document, kept for every later item the same worker process handles.
+_worker_documents: dict[tuple[Callable[[Path, str], Any], str, str], Any] = {}
+
+fitz: Any | None = None
+FITZ_IMPORT_ERROR: ImportError | None = None
+FITZ_IMPORT_ATTEMPTED = False
+
+
+def load_pymupdf() -> bool:
+    """Load PyMuPDF lazily so pypdf-only installs never pay for the import."""
+    global FITZ_IMPORT_ATTEMPTED
+    global FITZ_IMPORT_ERROR
+    global fitz
+
+    if FITZ_IMPORT_ATTEMPTED:
+        return fitz is not None
+
+    FITZ_IMPORT_ATTEMPTED = True
+    try:
+        fitz = importlib.import_module("fitz")
+    except ImportError as exc:
+        FITZ_IMPORT_ERROR = exc
+        return False
+    return True
+
+
+def add_engine_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --engine option used by the selectable-text PDF commands."""
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=ENGINE_AUTO,
+        help="Text extraction engine. 'pymupdf' is much faster, 'pypdf' is pure Python, and 'auto' uses "
+        "PyMuPDF when it is installed (default auto).",
+    )
+
+
+def resolve_text_engine(choice: str) -> str:
+    """Turn an --engine choice into the engine to use; the caller checks pypdf itself."""
+    if choice == ENGINE_AUTO:
+        return ENGINE_PYMUPDF if load_pymupdf() else ENGINE_PYPDF
+    if choice == ENGINE_PYMUPDF and not load_pymupdf():
+        raise ScriptError("PyMuPDF is required for --engine pymupdf. Install it with: pip install pymupdf")
+    return choice
+
+
+class PymupdfTextPage:
+    """One page of a PyMuPDF document, loaded only when its text is requested."""
+
+    def __init__(self, doc: Any, index: int) -> None:
+        self._doc = doc
+        self._index = index
+
+    def extract_text(self) -> str:
+        return self._doc.load_page(self._index).get_text("text", flags=PYMUPDF_TEXT_FLAGS)
+
+
+class PymupdfTextReader:
+    """Present a PyMuPDF document through the part of the pypdf ``PdfReader`` API the text commands use.
+
+    ``pages``, ``is_encrypted``, ``decrypt()``, and ``close()`` behave like
+    their pypdf counterparts, so opening, password handling, page selection,
+    and streamed writing are shared by both engines.
+    """
+
+    def __init__(self, path: str) -> None:
+        if not load_pymupdf() or fitz is None:
+            raise ScriptError("PyMuPDF is required for --engine pymupdf. Install it with: pip install pymupdf")
+        self._doc = fitz.open(str(Path(path)))
+
+    @property
+    def is_encrypted(self) -> bool:
+        return bool(self._doc.needs_pass)
+
+    def decrypt(self, password: str) -> int:
+        return int(self._doc.authenticate(password))
+
+    @property
+    def pages(self) -> list[PymupdfTextPage]:
+        return [PymupdfTextPage(self._doc, index) for index in range(self._doc.page_count)]
+
+    def close(self) -> None:
+        self._doc.close()
+
+
+def iter_page_text(reader: Any, pages: PageSelection | None = None) -> Iterator[str]:
+    """Yield each selected page's text without trailing whitespace, reading one page at a time."""
+    all_pages = reader.pages
+    for page_index in selected_page_indexes(pages, len(all_pages)):
+        try:
+            text = all_pages[page_index].extract_text() or ""
+        except Exception as exc:
+            raise ScriptError(f"Could not extract text from page {page_index + 1}: {exc}") from exc
+        yield text.rstrip()
+
+
+def write_page_text(page_texts: Iterable[str], handle: TextIO) -> int:
+    """Write pages separated by blank lines as they arrive and return the number of empty pages.
+
+    Separators are held back until the next non-empty page, so trailing
+    empty pages leave no blank lines and the file ends with one newline.
+    """
+    empty_pages = 0
+    held_separators = 0
+    for index, text in enumerate(page_texts):
+        if index:
+            held_separators += 1
+        if not text:
+            empty_pages += 1
+            continue
+        handle.write(PAGE_SEPARATOR * held_separators)
+        handle.write(text)
+        held_separators = 0
+    handle.write("\n")
+    return empty_pages
+
+
+def spool_page_text(reader: Any, spool: PageSpool, pages: PageSelection | None = None) -> None:
+    """Spool each non-empty page for the search index without writing any output."""
+    for _text in collect_page_text(
+        iter_page_text(reader, pages), selected_page_indexes(pages, len(reader.pages)), spool
+    ):
+        pass
+
+
+def write_text_file(
+    reader: Any,
+    output_path: Path,
+    pages: PageSelection | None = None,
+    indexed_pages: list[tuple[int, str]] | PageSpool | None = None,
+    chunks: ChunkSettings | None = None,
+    document: str = "",
+) -> int:
+    """Stream page text into output_path, so memory is bounded by the largest page; returns empty pages.
+
+    With indexed_pages, each non-empty page is also appended to it, with its
+    page number, for the search index. With chunks, overlapping chunks of the
+    same text are streamed to the output's .chunks.jsonl file, labelled with document.
+    """
+    page_texts = iter_page_text(reader, pages)
+    if indexed_pages is not None:
+        page_texts = collect_page_text(page_texts, selected_page_indexes(pages, len(reader.pages)), indexed_pages)
+    with contextlib.ExitStack() as stack:
+        if chunks is not None:
+            writer = stack.enter_context(open_chunk_writer(output_path, chunks, document))
+            page_texts = chunk_page_text(page_texts, selected_page_indexes(pages, len(reader.pages)), writer)
+        with temporary_output_path(output_path) as temporary_path:
+            with temporary_path.open("w", encoding="utf-8") as handle:
+                return write_page_text(page_texts, handle)
+
+
+def worker_document(pdf_path: Path, password: str, open_document: Callable[[Path, str], Any]) -> Any:
+    """Return this worker process's own open document, opening it on first use.
+
+    PyMuPDF documents cannot be pickled or shared between processes, so each
+    worker opens the PDF once and reuses it for every page range it is given.
+    """
+    key = (open_document, str(pdf_path), password)
+    doc = _worker_documents.get(key)
+    if doc is None:
+        doc = open_document(pdf_path, password)
+        _worker_documents[key] = doc
+    return doc
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Per-page stage timers, the shared --profile option, and the slowest-page report for PDF commands."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ContextManager, Iterator, Sequence
+
+from pytransformer.core.common import ScriptError, temporary_output_path
+
+DEFAULT_SLOWEST_PAGES = 10
+PROFILE_SUFFIXES = (".csv", ".json")
+
+
+@dataclass
+class PageTimer:
+    """Seconds spent in each stage of one page's work, such as load, render, OCR, or write.
+
+    Timers are plain data, so pages handled in worker processes send theirs
+    back with their results.
+    """
+
+    page_number: int
+    stages: dict[str, float] = field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    @property
+    def dominant_stage(self) -> str:
+        return max(self.stages, key=self.stages.__getitem__) if self.stages else ""
+
+
+def timed(timer: PageTimer | None, name: str) -> ContextManager[None]:
+    """Time a stage on timer, or do nothing when no timer is given."""
+    return timer.stage(name) if timer is not None else contextlib.nullcontext()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="Write per-page stage timings to this .csv or .json file and log the slowest pages at the end.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_SLOWEST_PAGES,
+        metavar="N",
+        help=f"How many of the slowest pages --profile logs (default {DEFAULT_SLOWEST_PAGES}).",
+    )
+
+
+def validate_profile_args(args: argparse.Namespace) -> None:
+    if args.profile is None:
+        return
+    if args.profile.suffix.lower() not in PROFILE_SUFFIXES:
+        raise ScriptError(f"Profile path must end in .csv or .json. Got {args.profile}.")
+    if args.profile_top < 0:
+        raise ScriptError(f"Profile top must be zero or more. Got {args.profile_top}.")
+
+
+class ProfileReport:
+    """Collect page timers for a run, write them out, and summarize where the time went."""
+
+    def __init__(self, stages: Sequence[str]) -> None:
+        self.stages = tuple(stages)
+        self.pages: list[PageTimer] = []
+
+    def add(self, timer: PageTimer) -> None:
+        self.pages.append(timer)
+
+    def columns(self) -> list[str]:
+        seen = {name for timer in self.pages for name in timer.stages}
+        return [name for name in self.stages if name in seen] + sorted(seen.difference(self.stages))
+
+    def stage_totals(self) -> dict[str, float]:
+        totals = dict.fromkeys(self.columns(), 0.0)
+        for timer in self.pages:
+            for name, seconds in timer.stages.items():
+                totals[name] += seconds
+        return totals
+
+    def slowest(self, count: int) -> list[PageTimer]:
+        return sorted(self.pages, key=lambda timer: timer.total, reverse=True)[:count]
+
+    def write(self, path: Path) -> None:
+        """Write one row or record per page, in page order, as CSV or JSON depending on the suffix."""
+        pages = sorted(self.pages, key=lambda timer: timer.page_number)
+        columns = self.columns()
+        try:
+            with temporary_output_path(path) as temporary_path:
+                with temporary_path.open("w", encoding="utf-8", newline="") as handle:
+                    if path.suffix.lower() == ".json":
+                        document = {
+                            "stage_totals": {name: round(seconds, 6) for name, seconds in self.stage_totals().items()},
+                            "pages": [
+                                {
+                                    "page": timer.page_number,
+                                    "total": round(timer.total, 6),
+                                    "dominant_stage": timer.dominant_stage,
+                                    "stages": {name: round(seconds, 6) for name, seconds in timer.stages.items()},
+                                }
+                                for timer in pages
+                            ],
+                        }
+                        json.dump(document, handle, indent=2)
+                        handle.write("\n")
+                    else:
+                        writer = csv.writer(handle)
+                        writer.writerow(["page", "total", "dominant_stage", *columns])
+                        for timer in pages:
+                            writer.writerow(
+                                [
+                                    timer.page_number,
+                                    f"{timer.total:.6f}",
+                                    timer.dominant_stage,
+                                    *(f"{timer.stages.get(name, 0.0):.6f}" for name in columns),
+                                ]
+                            )
+        except OSError as exc:
+            raise ScriptError(f"Could not write profile '{path}': {exc}") from exc
+
+    def log_summary(self, count: int, logger: logging.Logger | None = None) -> None:
+        """Log time per stage across the run, then the count slowest pages and the stage that dominated each."""
+        log = logger or logging.getLogger()
+        totals = self.stage_totals()
+        log.info("Stage totals: %s", " | ".join(f"{name} {seconds:.3f}s" for name, seconds in totals.items()))
+        slowest = self.slowest(count)
+        if not slowest:
+            return
+        log.info("Slowest pages:")
+        log.info("  %6s  %10s  %s", "Page", "Total ms", "Dominant stage")
+        for timer in slowest:
+            dominant = timer.dominant_stage
+            share = timer.stages.get(dominant, 0.0) / timer.total if timer.total else 0.0
+            log.info("  %6d  %10.1f  %s (%.0f%%)", timer.page_number, timer.total * 1000, dominant, share * 100)
@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+"""Full-text search index of PDF page text, stored in one SQLite database with an FTS5 table."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Iterable, Iterator, TextIO
+
+from pytransformer.core.common import ScriptError, resolve_user_path
+
+INDEX_SCHEMA_VERSION = 1
+SNIPPET_TOKENS = 12
+
+# Page text lives once in the pages table; the FTS5 table is an external-content index over it, so a document can be
+# removed through its indexed document_id and the triggers keep the inverted index in step.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    page_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_document ON pages(document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5(
+    text, content='pages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS pages_insert AFTER INSERT ON pages BEGIN
+    INSERT INTO page_text(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_delete AFTER DELETE ON pages BEGIN
+    INSERT INTO page_text(page_text, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One matching page, with a short excerpt around the matched terms."""
+
+    path: str
+    page_number: int
+    snippet: str
+
+
+def add_index_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--index",
+        type=Path,
+        metavar="DB",
+        help="Also add each page's text to this SQLite full-text index, replacing any earlier entry for the same PDF. "
+        "Search it with pyt-pdf-search.",
+    )
+
+
+def quote_query(query: str) -> str:
+    """Turn plain words into an FTS5 query that matches pages containing every word, in any order."""
+    terms = query.split()
+    if not terms:
+        raise ScriptError("Search query is empty.")
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class PageSpool:
+    """Page text for the index, spooled to a temporary JSONL file instead of held in memory.
+
+    A batch worker passes the spool, which is only a path, back to the main
+    process that owns the index connection, so a large PDF's pages are never
+    held or pickled all at once. Iterating the spool reads the pages back, and
+    discard removes the file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pages = 0
+        self._handle: TextIO | None = None
+
+    @classmethod
+    def create(cls) -> PageSpool:
+        try:
+            file_descriptor, name = tempfile.mkstemp(prefix="pyt-index-", suffix=".jsonl")
+            os.close(file_descriptor)
+        except OSError as exc:
+            raise ScriptError(f"Could not create a spool file for the search index: {exc}") from exc
+        return cls(Path(name))
+
+    def append(self, page: tuple[int, str]) -> None:
+        try:
+            if self._handle is None:
+                self._handle = self.path.open("a", encoding="utf-8")
+            self._handle.write(json.dumps(page) + "\n")
+        except OSError as exc:
+            raise ScriptError(f"Could not write index spool '{self.path}': {exc}") from exc
+        self.pages += 1
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self) -> None:
+        self.close()
+        with contextlib.suppress(OSError):
+            self.path.unlink(missing_ok=True)
+
+    def __iter__(self) -> Iterator[tuple[int, str]]:
+        self.close()
+        try:
+            with self.path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    page_number, text = json.loads(line)
+                    yield page_number, text
+        except (OSError, ValueError) as exc:
+            raise ScriptError(f"Could not read index spool '{self.path}': {exc}") from exc
+
+
+def collect_page_text(
+    page_texts: Iterable[str], page_indexes: Iterable[int], collected: list[tuple[int, str]] | PageSpool
+) -> Iterator[str]:
+    """Pass page texts through unchanged, keeping each non-empty one with its 1-based page number for the index."""
+    for page_index, text in zip(page_indexes, page_texts, strict=True):
+        if text:
+            collected.append((page_index + 1, text))
+        yield text
+
+
+class TextIndex:
+    """Page-level inverted index of extracted text, keyed by each PDF's resolved path.
+
+    Every document is replaced in a single transaction, so a search never sees
+    half of a PDF, and the database uses write-ahead logging so searches can run
+    while a batch is still adding documents. Only one process should write at a
+    time; batch commands write from their main process.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = resolve_user_path(path)
+        self.connection: sqlite3.Connection | None = None
+
+    @classmethod
+    def open(cls, path: Path, *, create: bool = True) -> TextIndex:
+        index = cls(path)
+        index.connect(create=create)
+        return index
+
+    def connect(self, *, create: bool = True) -> None:
+        if not create and not self.path.is_file():
+            raise ScriptError(f"Search index not found: {self.path}")
+        try:
+            if create:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+        except (OSError, sqlite3.Error) as exc:
+            raise ScriptError(f"Could not open search index '{self.path}': {exc}") from exc
+        try:
+            connection.execute("PRAGMA foreign_keys = ON")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, INDEX_SCHEMA_VERSION):
+                raise ScriptError(
+                    f"Unsupported search index format in '{self.path}'; delete it to build a fresh index."
+                )
+            if create and version == 0:
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            elif version == 0:
+                raise ScriptError(f"Search index is empty: {self.path}")
+            connection.execute("PRAGMA synchronous = NORMAL")
+        except sqlite3.Error as exc:
+            connection.close()
+            message = f"Could not prepare search index '{self.path}': {exc}"
+            if "fts5" in str(exc).lower():
+                message = f"{message}. This Python's SQLite was built without FTS5."
+            raise ScriptError(message) from exc
+        except ScriptError:
+            connection.close()
+            raise
+        self.connection = connection
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self) -> TextIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def require_connection(self) -> sqlite3.Connection:
+        if self.connection is None:
+            raise ScriptError(f"Search index is not open: {self.path}")
+        return self.connection
+
+    def replace_document(self, pdf_path: Path, pages: Iterable[tuple[int, str]], *, page_count: int) -> None:
+        """Replace everything indexed for pdf_path with pages, given as (1-based page number, text) pairs."""
+        connection = self.require_connection()
+        try:
+            with connection:
+                connection.execute("DELETE FROM documents WHERE path = ?", (str(pdf_path),))
+                cursor = connection.execute(
+                    "INSERT INTO documents(path, page_count, indexed_at) VALUES (?, ?, ?)",
+                    (str(pdf_path), page_count, time.time()),
+                )
+                connection.executemany(
+                    "INSERT INTO pages(document_id, page_number, text) VALUES (?, ?, ?)",
+                    ((cursor.lastrowid, page_number, text) for page_number, text in pages if text),
+                )
+        except sqlite3.Error as exc:
+            raise ScriptError(f"Could not update search index '{self.path}': {exc}") from exc
+
+    def has_document(self, pdf_path: Path) -> bool:
+        connection = self.require_connection()
+        try:
+            row = connection.execute("SELECT 1 FROM documents WHERE path = ?", (str(pdf_path),)).fetchone()
+        except sqlite3.Error as exc:
+            raise ScriptError(f"Could not read search index '{self.path}': {exc}") from exc
+        return row is not None
+
+    def remove_missing(self, folder: Path) -> int:
+        """Drop indexed documents below folder whose PDF no longer exists; returns how many were dropped."""
+        connection = self.require_connection()
+        prefix = os.path.join(str(folder), "")
+        try:
+            rows = connection.execute(
+                "SELECT path FROM documents WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+            missing = [(path,) for (path,) in rows if not Path(path).exists()]
+            if missing:
+                with connection:
+                    connection.executemany("DELETE FROM documents WHERE path = ?", missing)
+        except sqlite3.Error as exc:
+            raise ScriptError(f"Could not update search index '{self.path}': {exc}") from exc
+        return len(missing)
+
+    def search(self, query: str, *, limit: int = 20, raw: bool = False) -> list[SearchHit]:
+        """Return the best-ranked pages for query, most relevant first.
+
+        Plain queries match pages containing every word; with raw, query is
+        passed to FTS5 unchanged, so phrases, OR, NEAR, and prefix* work.
+        """
+        connection = self.require_connection()
+        match = query if raw else quote_query(query)
+        try:
+            rows = connection.execute(
+                "SELECT documents.path, pages.page_number, "
+                f"snippet(page_text, 0, '[', ']', '...', {SNIPPET_TOKENS}) "
+                "FROM page_text "
+                "JOIN pages ON pages.id = page_text.rowid "
+                "JOIN documents ON documents.id = pages.document_id "
+                "WHERE page_text MATCH ? ORDER BY page_text.rank LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as exc:
+            raise ScriptError(f"Invalid search query {query!r}: {exc}") from exc
+        except sqlite3.Error as exc:
+            raise ScriptError(f"Could not search index '{self.path}': {exc}") from exc
+        return [
+            SearchHit(path=path, page_number=page, snippet=" ".join(snippet.split())) for path, page, snippet in rows
+        ]
+
+    def document_count(self) -> int:
+        return int(self.require_connection().execute("SELECT count(*) FROM documents").fetchone()[0])
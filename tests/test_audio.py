@@ -0,0 +1,191 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import unittest
+import wave
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import Mock, patch
+
+from pytransformer.cli import pyt_mp4_transcribe_batch as batch_script
+from pytransformer.core import audio, ffmpeg
+from pytransformer.core.common import ScriptError
+
+
+class ExtractWavTests(unittest.TestCase):
+    def test_ffmpeg_extractor_decodes_only_the_audio_to_16khz_mono_pcm(self) -> None:
+        done = subprocess.CompletedProcess([], 0, stdout="", stderr="")
+        with (
+            patch.object(audio.shutil, "which", return_value="/usr/bin/ffmpeg"),
+            patch.object(ffmpeg.shutil, "which", return_value="/usr/bin/ffmpeg"),
+            patch.object(ffmpeg.subprocess, "run", return_value=done) as run_mock,
+            patch.object(audio, "load_audio_file_clip") as load_moviepy,
+        ):
+            audio.extract_wav(Path("talk.mp4"), Path("talk.wav"))
+
+        command = run_mock.call_args.args[0]
+        self.assertEqual(command[command.index("-map") + 1], "0:a:0")
+        self.assertEqual(command[command.index("-ac") + 1], "1")
+        self.assertEqual(command[command.index("-ar") + 1], "16000")
+        self.assertEqual(command[command.index("-c:a") + 1], "pcm_s16le")
+        self.assertEqual(command[-1], "talk.wav")
+        load_moviepy.assert_not_called()
+
+    def test_ffmpeg_extraction_errors_name_the_input(self) -> None:
+        failure = subprocess.CompletedProcess([], 1, stdout="", stderr="Stream map '0:a:0' matches no streams.")
+        with (
+            patch.object(ffmpeg.shutil, "which", return_value="/usr/bin/ffmpeg"),
+            patch.object(ffmpeg.subprocess, "run", return_value=failure),
+            self.assertRaisesRegex(ScriptError, "Could not extract audio from 'silent.mp4': Stream map"),
+        ):
+            audio.extract_wav(Path("silent.mp4"), Path("silent.wav"), extractor=audio.EXTRACTOR_FFMPEG)
+
+
+def write_silent_wav(path: Path, seconds: int, *, rate: int = 1000) -> None:
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(bytes(2 * rate * seconds))
+
+
+class WindowedTranscriptionTests(unittest.TestCase):
+    def test_windows_are_cut_in_pauses_transcribed_concurrently_and_joined_in_order(self) -> None:
+        started = threading.Barrier(2, timeout=5)
+
+        def recognize(window_path: Path) -> str:
+            if window_path.name in ("window_00001.wav", "window_00002.wav"):
+                started.wait()
+            return f"{window_path.stem} {audio.wav_duration(window_path):.1f}s "
+
+        settings = audio.WindowSettings(40, jobs=2)
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            write_silent_wav(folder / "talk.wav", 100)
+            with (
+                patch.object(audio.shutil, "which", return_value="ffmpeg"),
+                patch.object(audio, "find_cut_candidates", return_value=[(37.0, 38.0), (79.0, 81.0)]) as find,
+            ):
+                transcript = audio.transcribe_windows(folder / "talk.wav", recognize, settings, work_folder=folder)
+            leftovers = sorted(path.name for path in folder.iterdir())
+
+        self.assertEqual(find.call_args.args[1].window, 5)
+        self.assertEqual(transcript, "window_00001 37.9s window_00002 41.2s window_00003 20.9s")
+        self.assertEqual(leftovers, ["talk.wav"])
+
+    def test_failed_requests_are_retried_with_doubling_delays(self) -> None:
+        attempts: list[Path] = []
+
+        def flaky(window_path: Path) -> str:
+            attempts.append(window_path)
+            if len(attempts) < 3:
+                raise audio.RecognitionRequestError("503")
+            return "hello"
+
+        def down(_window_path: Path) -> str:
+            raise audio.RecognitionRequestError("connection refused")
+
+        settings = audio.WindowSettings(30, retries=2, retry_delay=0.5)
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            write_silent_wav(folder / "short.wav", 10)
+            with patch.object(audio.time, "sleep") as sleep:
+                transcript = audio.transcribe_windows(folder / "short.wav", flaky, settings, work_folder=folder)
+                delays = [call.args[0] for call in sleep.call_args_list]
+                with self.assertRaisesRegex(ScriptError, r"0\.0-10\.0 s of .*short\.wav': connection refused"):
+                    audio.transcribe_windows(folder / "short.wav", down, settings, work_folder=folder)
+
+        self.assertEqual((transcript, len(attempts), delays), ("hello", 3, [0.5, 1.0]))
+
+    def test_window_options_are_validated(self) -> None:
+        args = argparse.Namespace(window_seconds=None, window_jobs=4, retries=2, retry_delay=1.0)
+        self.assertIsNone(audio.window_settings_from_args(args))
+        for field, value in (("window_seconds", 2.0), ("window_jobs", 0), ("retries", -1)):
+            bad = argparse.Namespace(**{**vars(args), "window_seconds": 30.0, field: value})
+            with self.subTest(field=field), self.assertRaises(ScriptError):
+                audio.window_settings_from_args(bad)
+        args.window_seconds = 30.0
+        self.assertEqual(audio.window_settings_from_args(args), audio.WindowSettings(30.0))
+
+
+class FakeKaldiRecognizer:
+    def __init__(self, model: object, rate: int) -> None:
+        self.model = model
+        self.rate = rate
+        self.chunks = 0
+
+    def AcceptWaveform(self, _data: bytes) -> bool:
+        self.chunks += 1
+        return self.chunks == 1
+
+    def Result(self) -> str:
+        return json.dumps({"text": "hello"})
+
+    def FinalResult(self) -> str:
+        return json.dumps({"text": "world"})
+
+
+class SpeechEngineTests(unittest.TestCase):
+    def test_vosk_loads_its_model_once_and_collects_every_utterance(self) -> None:
+        model = object()
+        vosk = SimpleNamespace(SetLogLevel=Mock(), Model=Mock(return_value=model), KaldiRecognizer=FakeKaldiRecognizer)
+        with TemporaryDirectory() as temp_dir, patch.dict(sys.modules, {"vosk": vosk}):
+            folder = Path(temp_dir)
+            write_silent_wav(folder / "talk.wav", 2, rate=audio.SPEECH_SAMPLE_RATE)
+            recognize = audio.load_speech_engine(audio.ENGINE_VOSK, language="en-US", model=folder)
+            texts = [recognize(folder / "talk.wav"), recognize(folder / "talk.wav")]
+            with self.assertRaisesRegex(ScriptError, "needs --model"):
+                audio.load_speech_engine(audio.ENGINE_VOSK, language="en-US")
+
+        vosk.Model.assert_called_once_with(str(folder))
+        self.assertEqual(texts, ["hello world", "hello world"])
+
+    def test_batch_loads_the_engine_once_and_shares_it_across_files(self) -> None:
+        heard: list[str] = []
+
+        def recognize(wav_path: Path) -> str:
+            heard.append(wav_path.stem)
+            return f"said in {wav_path.stem}"
+
+        load = Mock(return_value=recognize)
+        engine = audio.SpeechEngine("local stand-in", "never missing", available=lambda: True, load=load)
+
+        def extract(_mp4_path: Path, wav_path: Path, **_kwargs: Any) -> None:
+            write_silent_wav(wav_path, 1)
+
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            for name in ("a", "b", "c"):
+                (folder / f"{name}.mp4").write_bytes(b"mp4")
+            with (
+                patch.dict(audio.SPEECH_ENGINES, {"local": engine}),
+                patch.object(audio, "extract_wav", side_effect=extract),
+            ):
+                summary = batch_script.process_folder(
+                    folder,
+                    output_folder=None,
+                    overwrite=False,
+                    include_hidden=False,
+                    language="en-US",
+                    jobs=2,
+                    engine="local",
+                    model=folder / "model",
+                )
+            transcript = (folder / "b.txt").read_text(encoding="utf-8")
+
+        load.assert_called_once_with("en-US", folder / "model")
+        self.assertEqual((summary.written, sorted(heard)), (3, ["a", "b", "c"]))
+        self.assertEqual(transcript, "said in b\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
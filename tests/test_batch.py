@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterator
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_files_append_folder_name, pyt_pdf_extract_selectable_text_batch
+from pytransformer.core import batch
+from pytransformer.core.common import ScriptError
+
+
+def square(value: int) -> int:
+    if value < 0:
+        raise ValueError(f"negative: {value}")
+    return value * value
+
+
+def slow_first(value: int) -> int:
+    if value == 0:
+        time.sleep(0.1)
+    return value
+
+
+def hang_or_crash(value: int) -> int:
+    if value == 1:
+        time.sleep(60)
+    if value == 3:
+        os._exit(3)
+    return value
+
+
+class BatchRunnerTests(unittest.TestCase):
+    def test_inline_run_isolates_item_errors(self) -> None:
+        runner = batch.BatchRunner(jobs=1)
+
+        results = list(runner.run(square, [2, -1, 3]))
+
+        self.assertEqual([result.value for result in results], [4, None, 9])
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertFalse(runner.interrupted)
+
+    def test_thread_backend_preserves_input_order(self) -> None:
+        runner = batch.BatchRunner(jobs=3, backend="thread", ordered=True)
+
+        results = list(runner.run(slow_first, range(6)))
+
+        self.assertEqual([result.index for result in results], list(range(6)))
+        self.assertEqual([result.value for result in results], list(range(6)))
+
+    def test_thread_backend_streams_unordered_results_as_they_finish(self) -> None:
+        runner = batch.BatchRunner(jobs=2, backend="thread", ordered=False)
+
+        results = list(runner.run(slow_first, range(4)))
+
+        self.assertEqual(sorted(result.value for result in results), [0, 1, 2, 3])
+        self.assertNotEqual(results[0].index, 0)
+
+    def test_thread_backend_bounds_in_flight_work(self) -> None:
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def track(value: int) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return value
+
+        consumed = 0
+        runner = batch.BatchRunner(jobs=2, backend="thread", max_in_flight=2)
+        submitted: list[int] = []
+
+        def items() -> Iterator[int]:
+            for value in range(8):
+                submitted.append(value)
+                yield value
+
+        for _result in runner.run(track, items()):
+            consumed += 1
+            self.assertLessEqual(len(submitted) - consumed, 2)
+
+        self.assertEqual(consumed, 8)
+        self.assertLessEqual(peak, 2)
+
+    def test_process_backend_runs_picklable_workers(self) -> None:
+        runner = batch.BatchRunner(jobs=2, backend="process")
+
+        results = list(runner.run(square, [1, -2, 3]))
+
+        self.assertEqual([result.value for result in results], [1, None, 9])
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_process_timeout_stops_stuck_items_and_replaces_dead_workers(self) -> None:
+        runner = batch.BatchRunner(jobs=2, backend="process", timeout=0.5)
+        started = time.monotonic()
+
+        results = list(runner.run(hang_or_crash, range(6)))
+
+        self.assertLess(time.monotonic() - started, 30)
+        self.assertEqual([result.index for result in results], list(range(6)))
+        self.assertEqual([result.value for result in results], [0, None, 2, None, 4, 5])
+        self.assertIsInstance(results[1].error, TimeoutError)
+        self.assertIn("exited with code 3", str(results[3].error))
+        with self.assertRaises(ValueError):
+            batch.BatchRunner(backend="thread", timeout=1)
+        with self.assertRaises(ScriptError):
+            batch.BatchRunner(backend="process", timeout=0)
+
+    def test_asyncio_backend_accepts_coroutine_and_plain_workers(self) -> None:
+        async def double(value: int) -> int:
+            await asyncio.sleep(0)
+            if value == 2:
+                raise RuntimeError("bad item")
+            return value * 2
+
+        runner = batch.BatchRunner(jobs=2, backend="asyncio")
+        results = list(runner.run(double, range(4)))
+        self.assertEqual([result.value for result in results], [0, 2, None, 6])
+        self.assertIsInstance(results[2].error, RuntimeError)
+
+        self.assertEqual([result.value for result in runner.run(square, [1, 2])], [1, 4])
+
+    def test_keyboard_interrupt_cancels_remaining_items(self) -> None:
+        def interrupt_on_second(value: int) -> int:
+            if value == 1:
+                raise KeyboardInterrupt
+            return value
+
+        runner = batch.BatchRunner(jobs=1)
+
+        results = list(runner.run(interrupt_on_second, range(5)))
+
+        self.assertEqual([result.value for result in results], [0])
+        self.assertTrue(runner.interrupted)
+        self.assertEqual(runner.cancelled, 4)
+
+    def test_invalid_options_are_rejected(self) -> None:
+        with self.assertRaises(ScriptError):
+            batch.BatchRunner(jobs=0)
+        with self.assertRaises(ScriptError):
+            batch.BatchRunner(jobs=2, max_in_flight=0)
+        with self.assertRaises(ValueError):
+            batch.BatchRunner(backend="fibers")
+
+    def test_add_jobs_argument_defaults_to_one(self) -> None:
+        parser = argparse.ArgumentParser()
+        batch.add_jobs_argument(parser)
+
+        self.assertEqual(parser.parse_args([]).jobs, 1)
+        self.assertEqual(parser.parse_args(["--jobs", "4"]).jobs, 4)
+        batch.add_timeout_argument(parser)
+        self.assertIsNone(parser.parse_args([]).timeout)
+        self.assertEqual(parser.parse_args(["--timeout", "2.5"]).timeout, 2.5)
+
+
+class BatchCommandAdoptionTests(unittest.TestCase):
+    def test_selectable_batch_runs_files_in_parallel_threads(self) -> None:
+        script = pyt_pdf_extract_selectable_text_batch
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            for name in ("a.pdf", "b.pdf", "c.pdf"):
+                (folder / name).write_bytes(b"pdf")
+
+            def fake_process(pdf_path: Path, **_kwargs: object) -> object:
+                if pdf_path.name == "b.pdf":
+                    raise ScriptError("broken")
+                return script.PdfOutcome(output_path=pdf_path.with_suffix(".txt"), empty_pages=1)
+
+            with (
+                patch.object(script, "process_pdf", side_effect=fake_process),
+                patch.object(
+                    script, "BatchRunner", lambda **kwargs: batch.BatchRunner(**{**kwargs, "backend": "thread"})
+                ),
+            ):
+                summary = script.process_folder(
+                    folder,
+                    output_folder=None,
+                    overwrite=False,
+                    include_hidden=False,
+                    password="",
+                    jobs=2,
+                )
+
+        self.assertEqual((summary.written, summary.failed, summary.empty_pages), (2, 1, 2))
+
+    def test_rename_plan_reports_cancelled_items(self) -> None:
+        script = pyt_files_append_folder_name
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir) / "Tokyo"
+            folder.mkdir()
+            plans = []
+            for name in ("a.txt", "b.txt", "c.txt"):
+                source = folder / name
+                source.write_text(name, encoding="utf-8")
+                plans.append(script.RenamePlan(source=source, target=script.build_target_path(source, "Tokyo")))
+
+            with patch.object(script, "rename_file", side_effect=[True, KeyboardInterrupt]):
+                summary = script.apply_rename_plan(plans, dry_run=False)
+
+        self.assertEqual((summary.renamed, summary.cancelled), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
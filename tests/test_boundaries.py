@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import io
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pytransformer.core import boundaries, ffmpeg
+from pytransformer.core.common import ScriptError
+
+SILENCE_LOG = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'talk.mp4':
+[silencedetect @ 0x5581] silence_start: -0.01
+[silencedetect @ 0x5581] silence_end: 1.2 | silence_duration: 1.21
+[silencedetect @ 0x5581] silence_start: 57.5
+[silencedetect @ 0x5581] silence_end: 58.5 | silence_duration: 1
+[silencedetect @ 0x5581] silence_start: 124
+[silencedetect @ 0x5581] silence_end: 124.4 | silence_duration: 0.4
+[silencedetect @ 0x5581] silence_start: 178
+"""
+SCENE_LOG = """\
+[Parsed_showinfo_2 @ 0x55d1] config in time_base: 1/12800, frame_rate: 25/1
+[Parsed_showinfo_2 @ 0x55d1] n:   0 pts: 793600 pts_time:62      duration: 512 pos: 1 fmt:yuv420p
+[Parsed_showinfo_2 @ 0x55d1] n:   1 pts:1536000 pts_time:120     duration: 512 pos: 2 fmt:yuv420p
+"""
+
+
+class FakeProcess:
+    def __init__(self, log: str, returncode: int = 0) -> None:
+        self.stderr = io.StringIO(log)
+        self.returncode = returncode
+
+    def wait(self) -> int:
+        return self.returncode
+
+    def poll(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        raise AssertionError("finished processes are not killed")
+
+
+class PlanChunkRangesTests(unittest.TestCase):
+    def test_fixed_ranges_cover_the_duration(self) -> None:
+        self.assertEqual(boundaries.plan_chunk_ranges(65, 30), [(0.0, 30.0), (30.0, 60.0), (60.0, 65)])
+        self.assertEqual(boundaries.plan_chunk_ranges(60, 30), [(0.0, 30.0), (30.0, 60)])
+
+    def test_cuts_snap_inside_nearby_silences_and_stay_put_without_one(self) -> None:
+        silences = boundaries.parse_silences(SILENCE_LOG.splitlines())
+        ranges = boundaries.plan_chunk_ranges(200, 60, silences, window=5)
+
+        self.assertEqual(silences, [(0.0, 1.2), (57.5, 58.5), (124.0, 124.4)])
+        self.assertEqual([round(end, 3) for _start, end in ranges], [58.4, 118.4, 178.4, 200])
+
+    def test_cuts_snap_to_the_nearest_scene_change(self) -> None:
+        changes = boundaries.parse_scene_changes(SCENE_LOG.splitlines())
+        ranges = boundaries.plan_chunk_ranges(150, 60, changes, window=5)
+
+        self.assertEqual(changes, [(62.0, 62.0), (120.0, 120.0)])
+        self.assertEqual(ranges, [(0.0, 62.0), (62.0, 120.0), (120.0, 150)])
+
+
+class FindCutCandidatesTests(unittest.TestCase):
+    def test_silences_are_read_from_a_streamed_decimated_analysis_pass(self) -> None:
+        settings = boundaries.SnapSettings(boundaries.SNAP_SILENCE, silence_threshold_db=-40)
+        with patch.object(ffmpeg.subprocess, "Popen", return_value=FakeProcess(SILENCE_LOG)) as popen:
+            silences = boundaries.find_cut_candidates(Path("talk.mp4"), settings, ffmpeg_path="ffmpeg")
+
+        command = popen.call_args.args[0]
+        self.assertEqual(len(silences), 3)
+        self.assertIn("aresample=8000,aformat=channel_layouts=mono,silencedetect=noise=-40dB:d=0.3", command)
+        self.assertEqual(command[-3:], ["-f", "null", "-"])
+
+    def test_failed_analysis_reports_the_end_of_the_log(self) -> None:
+        settings = boundaries.SnapSettings(boundaries.SNAP_SCENE)
+        with (
+            patch.object(
+                ffmpeg.subprocess, "Popen", return_value=FakeProcess("Stream map '0:v:0' matches no streams.\n", 1)
+            ),
+            self.assertRaisesRegex(ScriptError, "scene changes in 'audio.mp4': Stream map"),
+        ):
+            boundaries.find_cut_candidates(Path("audio.mp4"), settings, ffmpeg_path="ffmpeg")
+
+    def test_snap_window_must_leave_room_between_cuts(self) -> None:
+        args = argparse.Namespace(snap="silence", snap_window=15.0, silence_threshold=-35.0, scene_threshold=0.3)
+        with self.assertRaises(ScriptError):
+            boundaries.snap_settings_from_args(args, chunk_seconds=30)
+        args.snap_window = 5.0
+        self.assertEqual(boundaries.snap_settings_from_args(args, chunk_seconds=30), boundaries.SnapSettings("silence"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text as script
+from pytransformer.core import chunking
+from pytransformer.core.common import ScriptError
+
+
+def chunk_pages(settings: chunking.ChunkSettings, *pages: str) -> list[chunking.TextChunk]:
+    chunker = chunking.TextChunker(settings)
+    chunks: list[chunking.TextChunk] = []
+    for number, text in enumerate(pages, start=1):
+        chunks.extend(chunker.add_page(number, text))
+    return chunks + chunker.finish()
+
+
+class TextChunkerTests(unittest.TestCase):
+    def test_character_chunks_overlap_and_run_across_page_breaks(self) -> None:
+        chunks = chunk_pages(chunking.ChunkSettings(size=8, overlap=3), "abcdef", "", "ghijkl")
+
+        self.assertEqual([chunk.text for chunk in chunks], ["abcdef\n\n", "f\n\nghijk", "ijkl"])
+        self.assertEqual(
+            [(chunk.start_page, chunk.start_offset, chunk.end_page, chunk.end_offset) for chunk in chunks],
+            [(1, 0, 1, 8), (1, 5, 3, 5), (3, 2, 3, 6)],
+        )
+
+    def test_token_chunks_keep_whole_words_and_the_original_spacing(self) -> None:
+        settings = chunking.ChunkSettings(size=3, overlap=1, unit=chunking.CHUNK_UNIT_TOKENS)
+        chunks = chunk_pages(settings, "one two  three four", "five")
+
+        self.assertEqual([chunk.text for chunk in chunks], ["one two  three", "three four\n\nfive"])
+        self.assertEqual((chunks[1].start_page, chunks[1].start_offset, chunks[1].end_page), (1, 9, 2))
+
+    def test_long_documents_keep_only_the_unchunked_tail_in_memory(self) -> None:
+        chunker = chunking.TextChunker(chunking.ChunkSettings(size=100, overlap=10))
+        total = 0
+        for number in range(1, 501):
+            total += len(chunker.add_page(number, "x" * 990))
+            self.assertLess(len(chunker.text), 3000)
+        total += len(chunker.finish())
+
+        self.assertEqual(total, 5511)
+        self.assertLessEqual(len(chunker.page_starts), 2)
+
+    def test_settings_are_validated(self) -> None:
+        def args(size: int, overlap: int) -> argparse.Namespace:
+            return argparse.Namespace(chunks=True, chunk_size=size, chunk_overlap=overlap, chunk_unit="chars")
+
+        self.assertIsNone(chunking.chunk_settings_from_args(argparse.Namespace(chunks=False)))
+        self.assertEqual(chunking.chunk_settings_from_args(args(10, 0)), chunking.ChunkSettings(10, 0))
+        for size, overlap in ((0, 0), (10, 10), (10, -1)):
+            with self.subTest(size=size, overlap=overlap), self.assertRaises(ScriptError):
+                chunking.chunk_settings_from_args(args(size, overlap))
+
+
+class ChunkOutputTests(unittest.TestCase):
+    def test_extractor_streams_chunks_beside_the_text_output(self) -> None:
+        reader = SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda n=n: f"page {n} text") for n in (1, 2, 3)])
+        with TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "doc.txt"
+            script.write_text_file(
+                reader, output, chunks=chunking.ChunkSettings(size=2, overlap=0, unit="tokens"), document="doc.pdf"
+            )
+            records = [json.loads(line) for line in (Path(temp_dir) / "doc.chunks.jsonl").read_text().splitlines()]
+
+        self.assertEqual(
+            [(record["chunk"], record["start_page"], record["end_page"], record["text"]) for record in records],
+            [
+                (0, 1, 1, "page 1"),
+                (1, 1, 2, "text\n\npage"),
+                (2, 2, 2, "2 text"),
+                (3, 3, 3, "page 3"),
+                (4, 3, 3, "text"),
+            ],
+        )
+        self.assertEqual({record["document"] for record in records}, {"doc.pdf"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -366,7 +366,11 @@ class PdfTests(unittest.TestCase):
                     (pdf.resolve(), output.resolve()),
                 )
                 self.assertEqual(selectable_cli.extract_text(reader), ("hello\n", 1))
-                with patch.object(sys, "argv", ["pyt-pdf-extract-selectable-text", str(pdf), "--output", str(output)]):
+                with patch.object(
+                    sys,
+                    "argv",
+                    ["pyt-pdf-extract-selectable-text", str(pdf), "--output", str(output), "--engine", "pypdf"],
+                ):
                     self.assertEqual(selectable_cli.main(), 0)
             self.assertEqual(output.read_text(encoding="utf-8"), "hello\n")
             self.assertTrue(reader.closed)
@@ -551,11 +555,14 @@ class PdfTests(unittest.TestCase):
 
 class AudioAndVideoTests(unittest.TestCase):
     def test_audio_helpers_cover_dependencies_extraction_and_transcription(self) -> None:
-        with patch.object(audio, "MOVIEPY_IMPORT_ERROR", ImportError("moviepy")):
+        with (
+            patch.object(audio.shutil, "which", return_value=None),
+            patch.object(audio.importlib.util, "find_spec", return_value=None),
+        ):
             with self.assertRaises(ScriptError):
                 audio.require_transcription_dependencies()
         with (
-            patch.object(audio, "MOVIEPY_IMPORT_ERROR", None),
+            patch.object(audio, "resolve_audio_extractor", return_value=audio.EXTRACTOR_MOVIEPY),
             patch.object(audio, "SPEECH_RECOGNITION_IMPORT_ERROR", ImportError("speech")),
         ):
             with self.assertRaises(ScriptError):
@@ -563,14 +570,17 @@ class AudioAndVideoTests(unittest.TestCase):
 
         clip = Mock()
         clip_cls = Mock(return_value=clip)
-        with patch.object(audio, "AudioFileClip", clip_cls):
-            audio.extract_wav(Path("video.mp4"), Path("audio.wav"))
-        clip.write_audiofile.assert_called_once()
-        clip.close.assert_called_once()
-        clip_cls.side_effect = OSError("extract")
-        with patch.object(audio, "AudioFileClip", clip_cls):
+        with (
+            patch.object(audio.importlib.util, "find_spec", return_value=object()),
+            patch.object(audio, "load_audio_file_clip", return_value=clip_cls),
+        ):
+            audio.extract_wav(Path("video.mp4"), Path("audio.wav"), extractor=audio.EXTRACTOR_MOVIEPY)
+            clip.write_audiofile.assert_called_once()
+            self.assertEqual(clip.write_audiofile.call_args.kwargs["fps"], audio.SPEECH_SAMPLE_RATE)
+            clip.close.assert_called_once()
+            clip_cls.side_effect = OSError("extract")
             with self.assertRaises(ScriptError):
-                audio.extract_wav(Path("video.mp4"), Path("audio.wav"))
+                audio.extract_wav(Path("video.mp4"), Path("audio.wav"), extractor=audio.EXTRACTOR_MOVIEPY)
 
         class UnknownValueError(Exception):
             pass
@@ -681,7 +691,7 @@ class AudioAndVideoTests(unittest.TestCase):
                 ["bad.mp4", "good.mp4"],
             )
 
-            def transcribe(path: Path, *, language: str) -> str:
+            def transcribe(path: Path, *, language: str, **_kwargs: object) -> str:
                 if path.name == "bad.mp4":
                     raise ScriptError("bad audio")
                 return language
@@ -715,7 +725,7 @@ class ImageCommandTests(unittest.TestCase):
                 self.assertEqual(
                     webp_cli.process_image(source, overwrite=True, quality=80), source.with_suffix(".webp").resolve()
                 )
-            args = argparse.Namespace(images=[source], quality=80, overwrite=True, quiet=True, debug=False)
+            args = argparse.Namespace(images=[source], quality=80, overwrite=True, quiet=True, debug=False, jobs=1)
             with patch.object(webp_cli, "process_image", return_value=output):
                 self.assertEqual(webp_cli.run(args), 0)
         with patch.object(webp_cli, "Image", None), patch.object(webp_cli, "ImageOps", None):
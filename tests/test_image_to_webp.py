@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import contextlib
+import io
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -121,3 +123,19 @@ class ImageToWebpPillowTests(unittest.TestCase):
 
             with self.assertRaises(ScriptError):
                 pyt_image_to_webp.process_image(input_path, overwrite=False, quality=98)
+
+    def test_a_failed_image_does_not_stop_the_remaining_images(self) -> None:
+        assert Image is not None
+        with TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            for name in ("a", "b", "c"):
+                Image.new("RGB", (2, 2), (0, 255, 0)).save(temp_path / f"{name}.png")
+            (temp_path / "b.webp").write_bytes(b"existing")
+            stdout = io.StringIO()
+
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+                code = pyt_image_to_webp.main([str(temp_path / f"{name}.png") for name in ("a", "b", "c")])
+            written = sorted(Path(line).name for line in stdout.getvalue().splitlines())
+
+        self.assertEqual(code, 1)
+        self.assertEqual(written, ["a.webp", "c.webp"])
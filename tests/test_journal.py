@@ -0,0 +1,168 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_mp4_transcribe_batch, pyt_pdf_extract_selectable_text_batch
+from pytransformer.core import journal, pdf_text
+from pytransformer.core.common import ScriptError
+
+
+class JobJournalTests(unittest.TestCase):
+    def test_records_are_reloaded_and_torn_lines_ignored(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            output = folder / "a.txt"
+            output.write_text("hello\n", encoding="utf-8")
+            path = folder / "journal.jsonl"
+
+            with journal.JobJournal.open(path) as job_journal:
+                job_journal.record(folder / "a.pdf", journal.STATUS_WRITTEN, params={}, seconds=1.5, output=output)
+                job_journal.record(folder / "b.pdf", journal.STATUS_FAILED, params={}, error=ValueError("bad"))
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write('{"item": "torn')
+
+            reloaded = journal.JobJournal(path)
+            reloaded.load()
+
+        entry = reloaded.entries[str(folder / "a.pdf")]
+        self.assertEqual((entry.status, entry.size, entry.seconds), ("written", 6, 1.5))
+        self.assertEqual(reloaded.entries[str(folder / "b.pdf")].error, "bad")
+        self.assertEqual(len(reloaded.entries), 2)
+
+    def test_resumed_runs_compact_the_journal_and_other_runs_start_a_new_one(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            path = folder / "journal.jsonl"
+            with journal.JobJournal.open(path) as job_journal:
+                for status in (journal.STATUS_FAILED, journal.STATUS_FAILED, journal.STATUS_SKIPPED):
+                    job_journal.record(folder / "a.pdf", status, params={})
+                job_journal.record(folder / "b.pdf", journal.STATUS_FAILED, params={})
+
+            with journal.JobJournal.open(path, resume=True) as resumed:
+                compacted = path.read_text(encoding="utf-8").splitlines()
+            with patch.object(journal.JobJournal, "load") as load, journal.JobJournal.open(path) as fresh:
+                pass
+            fresh_size = path.stat().st_size
+
+        self.assertEqual((len(compacted), fresh_size), (2, 0))
+        self.assertEqual(resumed.entries[str(folder / "a.pdf")].status, journal.STATUS_SKIPPED)
+        load.assert_not_called()
+        self.assertEqual(fresh.entries, {})
+
+    def test_plan_resume_verifies_outputs_and_parameters(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            items = [folder / f"{name}.pdf" for name in ("done", "changed", "failed", "new", "other")]
+            job_journal = journal.JobJournal(folder / "journal.jsonl")
+            for item in items[:2] + items[4:]:
+                output = item.with_suffix(".txt")
+                output.write_text("text", encoding="utf-8")
+                params = {"language": "fr"} if item.stem == "other" else {}
+                job_journal.record(item, journal.STATUS_WRITTEN, params=params, output=output)
+            job_journal.record(items[2], journal.STATUS_FAILED, params={}, error="boom")
+            (folder / "changed.txt").write_text("edited", encoding="utf-8")
+
+            plan = journal.plan_resume(job_journal, items, params={})
+
+        self.assertEqual([item.stem for item in plan.completed], ["done"])
+        self.assertEqual([item.stem for item in plan.pending], ["changed", "failed", "new", "other"])
+        self.assertEqual(plan.replace_outputs, frozenset({items[1]}))
+
+    def test_open_batch_journal_honours_options(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            args = argparse.Namespace(journal=None, no_journal=False, resume=False)
+            job_journal = journal.open_batch_journal(args, folder)
+            assert job_journal is not None
+            job_journal.close()
+            self.assertEqual(job_journal.path, (folder / journal.DEFAULT_JOURNAL_NAME).resolve())
+
+            self.assertIsNone(journal.open_batch_journal(argparse.Namespace(no_journal=True, resume=False), folder))
+            with self.assertRaises(ScriptError):
+                journal.open_batch_journal(argparse.Namespace(no_journal=True, resume=True), folder)
+
+            # Without an output folder the input folder is left alone unless --journal names a path.
+            self.assertIsNone(journal.open_batch_journal(args, None))
+            with self.assertRaisesRegex(ScriptError, "--output-folder or --journal"):
+                journal.open_batch_journal(argparse.Namespace(journal=None, no_journal=False, resume=True), None)
+            named = journal.open_batch_journal(
+                argparse.Namespace(journal=folder / "run.jsonl", no_journal=False, resume=True), None
+            )
+            assert named is not None
+            named.close()
+            self.assertEqual(named.path, (folder / "run.jsonl").resolve())
+
+
+class JournalCommandTests(unittest.TestCase):
+    def test_selectable_batch_resume_retries_only_unfinished_pdfs(self) -> None:
+        script = pyt_pdf_extract_selectable_text_batch
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            for name in ("a.pdf", "b.pdf", "c.pdf"):
+                (folder / name).write_bytes(b"pdf")
+            calls: list[str] = []
+
+            def fake_extract(pdf_path: Path, password: str, engine: str) -> object:
+                calls.append(pdf_path.name)
+                if pdf_path.name == "b.pdf" and len(calls) <= 3:
+                    raise ScriptError("broken")
+                return pdf_path
+
+            def run(*, resume: bool) -> script.PdfBatchSummary:
+                with (
+                    journal.JobJournal.open(folder / journal.DEFAULT_JOURNAL_NAME, resume=resume) as job_journal,
+                    patch.object(script, "open_pdf_reader", side_effect=fake_extract),
+                    patch.object(pdf_text, "iter_page_text", side_effect=lambda *_args: iter(["text"])),
+                ):
+                    return script.process_folder(
+                        folder,
+                        output_folder=None,
+                        overwrite=False,
+                        include_hidden=False,
+                        password="",
+                        journal=job_journal,
+                        resume=resume,
+                    )
+
+            first = run(resume=False)
+            (folder / "c.txt").write_text("tampered", encoding="utf-8")
+            second = run(resume=True)
+
+            self.assertEqual((first.written, first.failed), (2, 1))
+            self.assertEqual(calls, ["a.pdf", "b.pdf", "c.pdf", "b.pdf", "c.pdf"])
+            self.assertEqual((second.written, second.skipped, second.failed), (2, 1, 0))
+            self.assertEqual((folder / "c.txt").read_text(encoding="utf-8"), "text\n")
+
+    def test_transcribe_batch_resume_skips_completed_transcripts(self) -> None:
+        script = pyt_mp4_transcribe_batch
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            (folder / "video.mp4").write_bytes(b"mp4")
+            with (
+                journal.JobJournal.open(folder / "journal.jsonl", resume=True) as job_journal,
+                patch.object(script, "transcribe_mp4_to_text", return_value="hello") as transcribe,
+            ):
+                for _attempt in range(2):
+                    summary = script.process_folder(
+                        folder,
+                        output_folder=None,
+                        overwrite=False,
+                        include_hidden=False,
+                        language="en-US",
+                        journal=job_journal,
+                        resume=True,
+                    )
+
+        self.assertEqual(transcribe.call_count, 1)
+        self.assertEqual((summary.written, summary.skipped), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
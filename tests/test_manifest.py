@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text_batch as script
+from pytransformer.core import manifest, pdf_text
+
+
+class IncrementalManifestTests(unittest.TestCase):
+    def test_touched_files_stay_unchanged_and_edited_files_are_redone(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            item, output = folder / "a.pdf", folder / "a.txt"
+            item.write_bytes(b"first")
+            output.write_text("text", encoding="utf-8")
+            params = {"pages": None}
+            job_manifest = manifest.IncrementalManifest(folder / manifest.DEFAULT_MANIFEST_NAME)
+            job_manifest.record(item, manifest.source_state(item), output=output, params=params)
+            job_manifest.save()
+
+            reloaded = manifest.IncrementalManifest.open(job_manifest.path)
+            self.assertTrue(reloaded.is_unchanged(item, output=output, params=params))
+            self.assertFalse(reloaded.is_unchanged(item, output=output, params={"pages": "1"}))
+
+            os.utime(item, ns=(1, 1))
+            self.assertTrue(reloaded.is_unchanged(item, output=output, params=params))
+            self.assertEqual(reloaded.entries[str(item)].mtime_ns, 1)
+
+            item.write_bytes(b"other")
+            plan = manifest.plan_incremental(reloaded, [item], output_for=lambda _item: output, params=params)
+            self.assertEqual((plan.pending, plan.replace_outputs), ([item], frozenset({item})))
+            reloaded.close_log()
+
+    def test_records_are_appended_to_a_log_that_save_folds_into_the_manifest(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            params = {"pages": None}
+            job_manifest = manifest.IncrementalManifest(folder / manifest.DEFAULT_MANIFEST_NAME)
+            for name in ("a", "b"):
+                (folder / f"{name}.pdf").write_bytes(name.encode())
+                job_manifest.record(
+                    folder / f"{name}.pdf",
+                    manifest.source_state(folder / f"{name}.pdf"),
+                    output=folder / f"{name}.txt",
+                    params=params,
+                )
+            with job_manifest.log_path.open("a", encoding="utf-8") as log:
+                log.write('{"item": "torn')
+            self.assertFalse(job_manifest.path.exists())
+
+            # A run that stopped before saving still finds its records in the log.
+            crashed = manifest.IncrementalManifest.open(job_manifest.path)
+            self.assertEqual(sorted(Path(item).name for item in crashed.entries), ["a.pdf", "b.pdf"])
+
+            job_manifest.save()
+            saved = manifest.IncrementalManifest.open(job_manifest.path)
+            log_left = job_manifest.log_path.exists()
+
+        self.assertFalse(log_left)
+        self.assertEqual(saved.entries, crashed.entries)
+        self.assertFalse(saved.dirty)
+
+    def test_recursive_incremental_batch_mirrors_the_tree_and_skips_unchanged_pdfs(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir).resolve()
+            folder, output_folder = root / "in", root / "out"
+            for relative in ("a.pdf", "sub/b.pdf", "sub/deep/c.pdf", ".hidden/d.pdf"):
+                (folder / relative).parent.mkdir(parents=True, exist_ok=True)
+                (folder / relative).write_bytes(relative.encode())
+            opened: list[str] = []
+
+            def fake_open(pdf_path: Path, _password: str, _engine: str) -> Path:
+                opened.append(pdf_path.relative_to(folder).as_posix())
+                return pdf_path
+
+            def run() -> script.PdfBatchSummary:
+                with (
+                    patch.object(script, "open_pdf_reader", side_effect=fake_open),
+                    patch.object(pdf_text, "iter_page_text", side_effect=lambda *_args: iter(["text"])),
+                ):
+                    return script.process_folder(
+                        folder,
+                        output_folder=output_folder,
+                        overwrite=False,
+                        include_hidden=False,
+                        password="",
+                        recursive=True,
+                        jobs=1,
+                        manifest=manifest.IncrementalManifest.open(output_folder / manifest.DEFAULT_MANIFEST_NAME),
+                    )
+
+            first = run()
+            (folder / "sub" / "b.pdf").write_bytes(b"changed")
+            second = run()
+
+            self.assertEqual(opened, ["a.pdf", "sub/b.pdf", "sub/deep/c.pdf", "sub/b.pdf"])
+            self.assertEqual((first.written, second.written, second.skipped), (3, 1, 2))
+            self.assertTrue((output_folder / "sub" / "deep" / "c.txt").is_file())
+
+    def test_incremental_batch_adopts_outputs_that_existed_before_the_manifest(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir).resolve()
+            folder, output_folder = root / "in", root / "out"
+            folder.mkdir()
+            output_folder.mkdir()
+            for name in ("a", "b"):
+                (folder / f"{name}.pdf").write_bytes(name.encode())
+                (output_folder / f"{name}.txt").write_text("earlier text\n", encoding="utf-8")
+            processed: list[str] = []
+
+            def counting_process_pdf(pdf_path: Path, **kwargs: Any) -> script.PdfOutcome:
+                processed.append(pdf_path.name)
+                return original_process_pdf(pdf_path, **kwargs)
+
+            original_process_pdf = script.process_pdf
+
+            def run() -> script.PdfBatchSummary:
+                with (
+                    patch.object(script, "process_pdf", side_effect=counting_process_pdf),
+                    patch.object(script, "open_pdf_reader", side_effect=lambda pdf_path, *_args: pdf_path),
+                    patch.object(pdf_text, "iter_page_text", side_effect=lambda *_args: iter(["new text"])),
+                ):
+                    return script.process_folder(
+                        folder,
+                        output_folder=output_folder,
+                        overwrite=False,
+                        include_hidden=False,
+                        password="",
+                        jobs=1,
+                        manifest=manifest.IncrementalManifest.open(output_folder / manifest.DEFAULT_MANIFEST_NAME),
+                    )
+
+            first = run()
+            second = run()
+            (folder / "b.pdf").write_bytes(b"changed")
+            third = run()
+            outputs = [(output_folder / f"{name}.txt").read_text(encoding="utf-8") for name in ("a", "b")]
+
+        self.assertEqual(processed, ["a.pdf", "b.pdf", "b.pdf"])
+        self.assertEqual((first.skipped, second.skipped, third.skipped, third.written), (2, 2, 1, 1))
+        self.assertEqual(outputs, ["earlier text\n", "new text\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_mp4_split_chunks as script
+from pytransformer.core import boundaries, ffmpeg
+from pytransformer.core.common import ScriptError
+
+
+def fake_segment_muxer(segment_count: int) -> object:
+    def run(command: list[str], **_kwargs: object) -> subprocess.CompletedProcess[str]:
+        pattern = Path(command[-1])
+        for number in range(segment_count):
+            (pattern.parent / (pattern.name % number)).write_bytes(f"segment {number}".encode())
+        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+    return run
+
+
+class StreamCopySplitTests(unittest.TestCase):
+    def test_stream_copy_runs_the_segment_muxer_once_and_numbers_chunks(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            video = folder / "talk.mp4"
+            video.write_bytes(b"mp4")
+            chunks = folder / "chunks"
+            chunks.mkdir()
+            (chunks / "talk_chunk_02.mp4").write_bytes(b"existing")
+
+            with patch.object(ffmpeg.subprocess, "run", side_effect=fake_segment_muxer(11)) as run_mock:
+                summary = script.split_video_stream_copy(
+                    video, chunks, chunk_seconds=600, overwrite=False, ffmpeg_path="ffmpeg"
+                )
+            names = sorted(path.name for path in chunks.iterdir())
+            first_chunk = (chunks / "talk_chunk_01.mp4").read_bytes()
+            second_chunk = (chunks / "talk_chunk_02.mp4").read_bytes()
+
+        command = run_mock.call_args.args[0]
+        self.assertEqual(run_mock.call_count, 1)
+        self.assertEqual(command[command.index("-c") + 1], "copy")
+        self.assertEqual(
+            command[command.index("-f") + 1 : command.index("-f") + 4], ["segment", "-segment_time", "600"]
+        )
+        self.assertEqual((summary.saved, summary.skipped, summary.failed), (10, 1, 0))
+        self.assertEqual(names, [f"talk_chunk_{number:02d}.mp4" for number in range(1, 12)])
+        self.assertEqual((first_chunk, second_chunk), (b"segment 0", b"existing"))
+
+    def test_snapped_stream_copy_passes_planned_cut_times_to_the_segment_muxer(self) -> None:
+        snap = boundaries.SnapSettings(boundaries.SNAP_SILENCE)
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            video = folder / "talk.mp4"
+            video.write_bytes(b"mp4")
+            with (
+                patch.object(script, "probe_duration", return_value=130.0),
+                patch.object(script, "find_cut_candidates", return_value=[(57.5, 58.5), (119.0, 121.0)]),
+                patch.object(ffmpeg.subprocess, "run", side_effect=fake_segment_muxer(3)) as run_mock,
+            ):
+                summary = script.split_video_stream_copy(
+                    video, folder, chunk_seconds=60, overwrite=False, ffmpeg_path="ffmpeg", snap=snap
+                )
+
+        command = run_mock.call_args.args[0]
+        self.assertEqual(command[command.index("-segment_times") + 1], "58.400,119.100")
+        self.assertEqual(summary.saved, 3)
+
+    def test_stream_copy_reports_ffmpeg_errors_and_cleans_up_staging(self) -> None:
+        failure = subprocess.CompletedProcess([], 1, stdout="", stderr="moov atom not found")
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            video = folder / "broken.mp4"
+            video.write_bytes(b"mp4")
+            with (
+                patch.object(ffmpeg.subprocess, "run", return_value=failure),
+                self.assertRaisesRegex(ScriptError, "moov atom not found"),
+            ):
+                script.split_video_stream_copy(video, folder, chunk_seconds=30, overwrite=False, ffmpeg_path="ffmpeg")
+            leftovers = [path.name for path in folder.iterdir()]
+
+        self.assertEqual(leftovers, ["broken.mp4"])
+
+
+class ParallelSplitTests(unittest.TestCase):
+    def test_parallel_encode_seeks_each_worker_to_its_own_chunk(self) -> None:
+        commands: list[list[str]] = []
+
+        def run(command: list[str], **_kwargs: object) -> subprocess.CompletedProcess[str]:
+            if command[0] == "ffprobe":
+                return subprocess.CompletedProcess(command, 0, stdout="125.5\n", stderr="")
+            commands.append(command)
+            Path(command[-1]).write_bytes(command[command.index("-ss") + 1].encode())
+            return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            video = folder / "talk.mp4"
+            video.write_bytes(b"mp4")
+            (folder / "talk_chunk_1.mp4").write_bytes(b"existing")
+            with patch.object(ffmpeg.subprocess, "run", side_effect=run):
+                summary = script.split_video_parallel(
+                    video,
+                    folder,
+                    chunk_seconds=60,
+                    overwrite=False,
+                    jobs=2,
+                    threads=3,
+                    ffmpeg_path="ffmpeg",
+                    ffprobe_path="ffprobe",
+                )
+            contents = [(folder / f"talk_chunk_{number}.mp4").read_bytes() for number in (1, 2, 3)]
+
+        self.assertEqual((summary.saved, summary.skipped, summary.failed), (2, 1, 0))
+        self.assertEqual(contents, [b"existing", b"60.000", b"120.000"])
+        spans = sorted((command[command.index("-ss") + 1], command[command.index("-t") + 1]) for command in commands)
+        self.assertEqual(spans, [("120.000", "5.500"), ("60.000", "60.000")])
+        for command in commands:
+            self.assertLess(command.index("-ss"), command.index("-i"))
+            self.assertEqual(command.count("-threads"), 2)
+            self.assertEqual(command[command.index("-threads") + 1], "3")
+
+    def test_stream_copy_cannot_be_combined_with_parallel_encoding(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            video = Path(temp_dir) / "talk.mp4"
+            video.write_bytes(b"mp4")
+            argv = ["pyt-mp4-split-chunks", "--stream-copy", "--jobs", "2", str(video)]
+            with patch.object(sys, "argv", argv), patch.object(script, "split_video_stream_copy") as split:
+                self.assertEqual(script.main(), 2)
+        split.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import os
+import pickle
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from pytransformer.cli import pyt_pdf_extract_text
+from pytransformer.core import ocr_cache
+from pytransformer.core.common import ScriptError
+
+
+class OcrCacheTests(unittest.TestCase):
+    def test_round_trip_and_settings_change_the_key(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            cache = ocr_cache.OcrCache(Path(temp_dir))
+            key = ocr_cache.ocr_cache_key("abc", source="images", dpi=300, language=None, config="")
+
+            self.assertIsNone(cache.get(key))
+            cache.put(key, "hello")
+
+            self.assertEqual(cache.get(key), "hello")
+        for changed in (
+            {"dpi": 200, "language": None, "config": ""},
+            {"dpi": 300, "language": "deu", "config": ""},
+            {"dpi": 300, "language": None, "config": "--psm 6"},
+        ):
+            self.assertNotEqual(ocr_cache.ocr_cache_key("abc", source="images", **changed), key)
+
+    def test_eviction_removes_least_recently_used_entries(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            cache = ocr_cache.OcrCache(Path(temp_dir), max_bytes=250)
+            for index, key in enumerate(("aa1", "bb2", "cc3")):
+                cache.put(key, "x" * 100)
+                os.utime(cache.path_for(key), (1000 + index, 1000 + index))
+            self.assertIsNone(cache.get("aa1"))
+            self.assertEqual(cache.total_size(), 200)
+
+            os.utime(cache.path_for("bb2"), (900, 900))
+            cache.put("dd4", "x" * 100)
+
+            self.assertIsNone(cache.get("bb2"))
+            self.assertEqual([cache.get(key) is not None for key in ("cc3", "dd4")], [True, True])
+            self.assertEqual(cache.total_size(), 200)
+
+    def test_worker_copies_share_one_cache_per_process_without_rescanning(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            cache = ocr_cache.OcrCache(Path(temp_dir))
+            cache.put("aa1", "x" * 100)
+            cache.prepare()
+            with patch.dict(ocr_cache._process_caches, clear=True):
+                first, second = (pickle.loads(pickle.dumps(cache)) for _task in range(2))
+                with patch.object(ocr_cache.OcrCache, "total_size") as total_size:
+                    first.put("bb2", "x" * 50)
+                    second.put("cc3", "x" * 25)
+
+        self.assertIs(first, second)
+        total_size.assert_not_called()
+        self.assertEqual(first._size_estimate, 175)
+
+    def test_rejects_non_positive_limits(self) -> None:
+        with self.assertRaises(ScriptError):
+            ocr_cache.OcrCache(Path("cache"), max_bytes=0)
+
+    def test_page_image_digest_falls_back_for_pages_without_images(self) -> None:
+        self.assertIsNone(ocr_cache.page_image_digest(SimpleNamespace(get_images=lambda full: [])))
+        self.assertIsNone(ocr_cache.page_image_digest(object()))
+
+
+class CachedPageOcrTests(unittest.TestCase):
+    def test_repeated_pages_reuse_cached_text(self) -> None:
+        script = pyt_pdf_extract_text
+        pix = SimpleNamespace(width=2, height=2, n=3, samples=b"pixels")
+        page = SimpleNamespace(get_images=lambda full: [], get_pixmap=Mock(return_value=pix))
+        engine = SimpleNamespace(image_to_string=Mock(return_value="scanned text"))
+        with TemporaryDirectory() as temp_dir:
+            settings = script.OcrSettings(dpi=150, language="eng", cache=ocr_cache.OcrCache(Path(temp_dir)))
+            with (
+                patch.object(script, "OCR_IMPORT_ATTEMPTED", True),
+                patch.object(script, "Image", object()),
+                patch.object(script, "pytesseract", engine),
+                patch.object(script, "pixmap_to_image", return_value=Mock()),
+            ):
+                first = script.run_page_ocr(page, settings)
+                second = script.run_page_ocr(page, settings)
+
+        self.assertEqual((first, second), (("scanned text", False), ("scanned text", True)))
+        engine.image_to_string.assert_called_once()
+        self.assertEqual(engine.image_to_string.call_args.kwargs, {"lang": "eng"})
+        self.assertEqual(page.get_pixmap.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
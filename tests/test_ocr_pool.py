@@ -0,0 +1,174 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import concurrent.futures
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from pytransformer.cli import pyt_pdf_extract_text
+from pytransformer.core import ocr_pool
+from pytransformer.core.common import ScriptError
+
+
+def gray(dpi: int = 300) -> ocr_pool.GrayImage:
+    return ocr_pool.GrayImage(width=1, height=1, samples=b"\x00", dpi=dpi)
+
+
+class FakeTessApi:
+    def __init__(self, *, lang: str) -> None:
+        self.lang = lang
+        self.variables: dict[str, str] = {}
+        self.ended = False
+
+    def SetPageSegMode(self, mode: int) -> None:
+        self.mode = mode
+
+    def SetVariable(self, name: str, value: str) -> None:
+        self.variables[name] = value
+
+    def SetImageBytes(self, samples: bytes, width: int, height: int, bpp: int, bpl: int) -> None:
+        self.image = (samples, width, height, bpp, bpl)
+
+    def SetSourceResolution(self, dpi: int) -> None:
+        self.dpi = dpi
+
+    def GetUTF8Text(self) -> str:
+        return f"{self.lang} at {self.dpi}"
+
+    def End(self) -> None:
+        self.ended = True
+
+
+class TesseractPoolTests(unittest.TestCase):
+    def test_list_file_mode_splits_batched_output_on_form_feeds(self) -> None:
+        def fake_run(command: list[str], **_kwargs: object) -> subprocess.CompletedProcess[bytes]:
+            pages = Path(command[1]).read_text(encoding="utf-8").split()
+            self.assertTrue(all(Path(page).read_bytes().startswith(b"P5\n1 1\n255\n") for page in pages))
+            stdout = "".join(f"text {index}\n\f" for index in range(len(pages)))
+            return subprocess.CompletedProcess(command, 0, stdout=stdout.encode(), stderr=b"")
+
+        with (
+            patch.object(ocr_pool, "load_tesserocr", return_value=False),
+            patch.object(ocr_pool, "find_tesseract", return_value="tesseract"),
+            patch.object(ocr_pool.subprocess, "run", side_effect=fake_run) as run,
+        ):
+            pool = ocr_pool.TesseractPool(1, language="eng", batch_size=4)
+            # Queue everything before the worker can start so pages are batched together.
+            futures = [pool.submit(gray()) for _ in range(3)]
+            pool.close()
+
+        self.assertEqual(pool.mode, ocr_pool.MODE_LIST_FILE)
+        texts = [future.result() for future in futures]
+        self.assertTrue(all(text.startswith("text ") for text in texts))
+        self.assertLessEqual(run.call_count, 3)
+        self.assertIn("-l", run.call_args.args[0])
+
+    def test_unsplittable_output_falls_back_to_single_pages(self) -> None:
+        responses = iter(
+            [
+                subprocess.CompletedProcess([], 0, stdout=b"merged", stderr=b""),
+                subprocess.CompletedProcess([], 0, stdout=b"one\n", stderr=b""),
+                subprocess.CompletedProcess([], 0, stdout=b"two\n", stderr=b""),
+            ]
+        )
+        pool = ocr_pool.TesseractPool.__new__(ocr_pool.TesseractPool)
+        pool.executable, pool.language, pool.config = "tesseract", None, ""
+        jobs = [ocr_pool._Job(gray(), concurrent.futures.Future()) for _ in range(2)]
+        for job in jobs:
+            job.future.set_running_or_notify_cancel()
+
+        with patch.object(ocr_pool.subprocess, "run", side_effect=lambda *_args, **_kwargs: next(responses)):
+            pool._run_batch(jobs)
+
+        self.assertEqual([job.future.result() for job in jobs], ["one\n", "two\n"])
+
+    def test_tesserocr_workers_keep_one_api_per_thread(self) -> None:
+        apis: list[FakeTessApi] = []
+
+        def make_api(*, lang: str) -> FakeTessApi:
+            apis.append(FakeTessApi(lang=lang))
+            return apis[-1]
+
+        module = SimpleNamespace(PyTessBaseAPI=make_api)
+        with (
+            patch.object(ocr_pool, "load_tesserocr", return_value=True),
+            patch.object(ocr_pool, "tesserocr", module),
+        ):
+            with ocr_pool.TesseractPool(2, language="deu", config="--psm 6 -c preserve_interword_spaces=1") as pool:
+                futures = [pool.submit(gray(dpi)) for dpi in (100, 200, 300)]
+
+        self.assertEqual([future.result() for future in futures], ["deu at 100", "deu at 200", "deu at 300"])
+        self.assertEqual(len(apis), 2)
+        self.assertTrue(all(api.ended and api.variables == {"preserve_interword_spaces": "1"} for api in apis))
+
+    def test_unsupported_tesserocr_flags_and_missing_engines(self) -> None:
+        self.assertEqual(ocr_pool.parse_tesserocr_config("--psm 4"), (4, {}))
+        self.assertIsNone(ocr_pool.parse_tesserocr_config("--oem 1"))
+        with (
+            patch.object(ocr_pool, "load_tesserocr", return_value=False),
+            patch.object(ocr_pool, "find_tesseract", return_value=None),
+        ):
+            with self.assertRaises(ScriptError):
+                ocr_pool.TesseractPool(1)
+
+
+class PooledExtractionTests(unittest.TestCase):
+    def test_pooled_pages_are_written_in_page_order(self) -> None:
+        script = pyt_pdf_extract_text
+        pages = [
+            SimpleNamespace(
+                get_text=lambda _kind, index=index: "" if index % 2 else f"text {index}",
+                get_images=lambda full: [],
+                get_pixmap=lambda **_kwargs: SimpleNamespace(n=1, width=1, height=1, stride=1, samples=b"\x00"),
+            )
+            for index in range(5)
+        ]
+        doc = SimpleNamespace(page_count=5, load_page=lambda index: pages[index])
+
+        class FakePool:
+            mode = "fake"
+
+            def __init__(self, _workers: int, **_kwargs: object) -> None:
+                self.submitted = 0
+                self.closed = False
+
+            def submit(self, _image: ocr_pool.GrayImage) -> concurrent.futures.Future[str]:
+                future: concurrent.futures.Future[str] = concurrent.futures.Future()
+                self.submitted += 1
+                future.set_result(f"ocr {self.submitted}")
+                return future
+
+            def close(self, *, cancel: bool = False) -> None:
+                self.closed = True
+
+        with (
+            TemporaryDirectory() as temp_dir,
+            patch.object(script, "TesseractPool", FakePool),
+            patch.object(script, "ocr_backend_available", return_value=True),
+            patch.object(script, "fitz", SimpleNamespace(csGRAY="gray")),
+        ):
+            output = Path(temp_dir) / "out.txt"
+            summary = script.extract_text_from_pdf(
+                doc,
+                output,
+                overwrite=False,
+                use_ocr=True,
+                ocr_dpi=150,
+                logger=Mock(),
+                ocr_backend=script.OCR_BACKEND_POOL,
+                ocr_workers=2,
+            )
+            lines = output.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(lines, ["text 0", "ocr 1", "text 2", "ocr 2", "text 4"])
+        self.assertEqual((summary.processed_pages, summary.ocr_pages), (5, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import Mock
+
+from pytransformer.core import page_classifier
+
+LETTER = SimpleNamespace(x0=0.0, y0=0.0, x1=612.0, y1=792.0, width=612.0, height=792.0)
+
+
+def fake_page(
+    text: str = "", *, fonts: list[Any] | None = None, images: list[dict[str, Any]] | None = None, spans: int = 0
+) -> SimpleNamespace:
+    layout: dict[str, Any] = {"blocks": [{"lines": [{"spans": [{}] * spans}]}]}
+    return SimpleNamespace(
+        rect=LETTER,
+        get_fonts=Mock(return_value=[] if fonts is None else fonts),
+        get_text=Mock(side_effect=lambda kind, **_kwargs: layout if kind == "dict" else text),
+        get_image_info=Mock(return_value=images or []),
+    )
+
+
+def full_page_scan(width: int = 1275, height: int = 1650) -> dict[str, Any]:
+    return {"bbox": (0.0, 0.0, 612.0, 792.0), "width": width, "height": height}
+
+
+class PageClassifierTests(unittest.TestCase):
+    def test_pages_without_fonts_skip_text_extraction_and_report_scan_resolution(self) -> None:
+        page = fake_page(images=[full_page_scan()])
+
+        profile = page_classifier.classify_page(page)
+
+        self.assertEqual((profile.kind, profile.image_coverage, profile.native_dpi), ("scanned", 1.0, 150))
+        self.assertTrue(profile.needs_ocr)
+        page.get_text.assert_not_called()
+
+    def test_text_layers_are_kept_unless_garbled_or_stray_over_a_scan(self) -> None:
+        prose = "A perfectly ordinary paragraph of selectable text."
+        fonts = [("font",)]
+
+        self.assertEqual(page_classifier.classify_page(fake_page(prose, fonts=fonts)).kind, "text")
+        self.assertEqual(page_classifier.classify_page(fake_page("\ufffd" * 30, fonts=fonts)).kind, "garbled")
+        stamped = fake_page("Page 7", fonts=fonts, images=[full_page_scan()], spans=1)
+        self.assertEqual(page_classifier.classify_page(stamped).kind, "scanned")
+        captioned = fake_page(prose, fonts=fonts, images=[full_page_scan()], spans=12)
+        self.assertEqual(page_classifier.classify_page(captioned).kind, "text")
+        self.assertEqual(page_classifier.classify_page(fake_page(fonts=fonts)).kind, "no-text")
+
+    def test_garbled_text_detection(self) -> None:
+        self.assertTrue(page_classifier.is_garbled_text("\ue001\ue002\x03 " * 10))
+        self.assertTrue(page_classifier.is_garbled_text("!#$%&()*+,-./:;<=>?@[]^_{|}~" * 2))
+        self.assertFalse(page_classifier.is_garbled_text("Plain words, with punctuation; and numbers 1-2-3."))
+        self.assertFalse(page_classifier.is_garbled_text("\ufffd short"))
+
+    def test_dot_leaders_and_table_rules_are_not_garbled(self) -> None:
+        contents = "Contents\nIntroduction ....................... 1\nMethods .......................... 5\n"
+        spaced = "Results . . . . . . . . . . . . . . . 12\nDiscussion . . . . . . . . . . . . . 19\n"
+        table = "+--------+-------+\n| Fruit  | Count |\n+========+=======+\n| Apples |    12 |\n+--------+-------+\n"
+
+        self.assertFalse(page_classifier.is_garbled_text(contents))
+        self.assertFalse(page_classifier.is_garbled_text(spaced))
+        self.assertFalse(page_classifier.is_garbled_text(table))
+        self.assertFalse(page_classifier.is_garbled_text("Introduction ....... 1\nMethods ....... 5 ..."))
+
+    def test_adaptive_dpi_follows_the_scan_within_limits(self) -> None:
+        self.assertEqual(page_classifier.adaptive_ocr_dpi(200, 300), 200)
+        self.assertEqual(page_classifier.adaptive_ocr_dpi(600, 300), 300)
+        self.assertEqual(page_classifier.adaptive_ocr_dpi(72, 300), page_classifier.MIN_ADAPTIVE_OCR_DPI)
+        self.assertEqual(page_classifier.adaptive_ocr_dpi(None, 250), 250)
+
+    def test_pages_that_cannot_be_inspected_fall_back_to_the_text_layer(self) -> None:
+        page = SimpleNamespace(get_text=lambda _kind: "text from an older page object")
+
+        profile = page_classifier.classify_page(page)
+
+        self.assertEqual((profile.kind, profile.native_dpi), ("text", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
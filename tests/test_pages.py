@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text, pyt_pdf_extract_text
+from pytransformer.core import pages
+from pytransformer.core.common import ScriptError
+
+
+class PageSelectionTests(unittest.TestCase):
+    def test_selections_resolve_to_sorted_unique_indexes(self) -> None:
+        cases = {
+            "1-5,10,-1": [0, 1, 2, 3, 4, 9, 19],
+            "5-": list(range(4, 20)),
+            "-3--1": [17, 18, 19],
+            "3,1-3, 2": [0, 1, 2],
+            "18-25": [17, 18, 19],
+        }
+        for spec, expected in cases.items():
+            with self.subTest(spec=spec):
+                self.assertEqual(pages.parse_page_selection(spec).indexes(20), expected)
+
+    def test_invalid_specs_and_out_of_range_pages_are_rejected(self) -> None:
+        for spec in ("", "0", "a-b", "5-2", "1,,2", "1-2-3"):
+            with self.subTest(spec=spec), self.assertRaises(ScriptError):
+                pages.parse_page_selection(spec)
+        with self.assertRaisesRegex(ScriptError, "out of range"):
+            pages.parse_page_selection("1,30").indexes(20)
+        with self.assertRaisesRegex(ScriptError, "selects no pages"):
+            pages.parse_page_selection("25-30").indexes(20)
+
+    def test_argument_reports_parse_errors_as_usage_errors(self) -> None:
+        parser = argparse.ArgumentParser()
+        pages.add_pages_argument(parser)
+
+        self.assertEqual(parser.parse_args(["--pages", "-1"]).pages.indexes(4), [3])
+        self.assertIsNone(parser.parse_args([]).pages)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            pages.page_selection_argument("x")
+        self.assertEqual(pages.selected_page_indexes(None, 3), range(3))
+
+    def test_ranges_from_the_end_parse_through_a_command_parser_with_equals(self) -> None:
+        parser = pyt_pdf_extract_selectable_text.build_parser()
+
+        for value in ("-3--1", "-2-"):
+            with self.subTest(value=value):
+                args = parser.parse_args([f"--pages={value}", "file.pdf"])
+                self.assertEqual(args.pages.indexes(5), [2, 3, 4] if value == "-3--1" else [3, 4])
+                # Without "=", argparse reads a value that starts with "-" as an option, as PAGES_HELP explains.
+                with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                    parser.parse_args(["--pages", value, "file.pdf"])
+        self.assertIn("--pages=-3--1", pages.PAGES_HELP)
+
+
+class PageSelectionCommandTests(unittest.TestCase):
+    def test_extract_text_loads_only_selected_pages(self) -> None:
+        script = pyt_pdf_extract_text
+        load_page = Mock(side_effect=lambda index: SimpleNamespace(get_text=lambda _kind: f"page {index + 1}"))
+        doc = SimpleNamespace(page_count=5000, load_page=load_page)
+        with TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "out.txt"
+            summary = script.extract_text_from_pdf(
+                doc,
+                output,
+                overwrite=False,
+                use_ocr=False,
+                ocr_dpi=72,
+                logger=Mock(),
+                page_indexes=pages.parse_page_selection("1-2,-1").indexes(doc.page_count),
+            )
+            lines = output.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(lines, ["page 1", "page 2", "page 5000"])
+        self.assertEqual([call.args[0] for call in load_page.call_args_list], [0, 1, 4999])
+        self.assertEqual((summary.total_pages, summary.processed_pages), (3, 3))
+
+    def test_selectable_text_extracts_selected_pages_in_order(self) -> None:
+        reader = SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda n=n: f"page {n}") for n in range(1, 6)])
+
+        text, empty_pages = pyt_pdf_extract_selectable_text.extract_text(reader, pages.parse_page_selection("-1,2"))
+
+        self.assertEqual((text, empty_pages), ("page 2\n\npage 5\n", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import io
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text
+from pytransformer.core import pdf_text
+from pytransformer.core.common import ScriptError
+
+
+def fake_reader(*texts: str) -> SimpleNamespace:
+    return SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda text=text: text) for text in texts])
+
+
+class StreamedPageTextTests(unittest.TestCase):
+    def test_streamed_output_matches_joining_every_page(self) -> None:
+        cases = [
+            ("one", "two"),
+            ("", "  \n", "first text \n", "", "last\n\n", " ", ""),
+            ("", ""),
+            ("\n  indented\n",),
+        ]
+        for texts in cases:
+            with self.subTest(texts=texts):
+                handle = io.StringIO()
+
+                empty_pages = pdf_text.write_page_text(pdf_text.iter_page_text(fake_reader(*texts)), handle)
+
+                expected = "\n\n".join(text.rstrip() for text in texts).rstrip() + "\n"
+                self.assertEqual(handle.getvalue(), expected)
+                self.assertEqual(empty_pages, sum(not text.strip() for text in texts))
+
+    def test_failed_page_leaves_no_partial_output(self) -> None:
+        def broken() -> str:
+            raise ValueError("bad page")
+
+        reader = SimpleNamespace(
+            pages=[SimpleNamespace(extract_text=lambda: "ok"), SimpleNamespace(extract_text=broken)]
+        )
+        with TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "out.txt"
+            with self.assertRaisesRegex(ScriptError, "page 2"):
+                pyt_pdf_extract_selectable_text.write_text_file(reader, output)
+
+            self.assertEqual(list(Path(temp_dir).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from pytransformer.cli import pyt_pdf_extract_text as script
+from pytransformer.core import batch, ocr_pool, pdf_text
+from pytransformer.core.text_index import PageSpool, TextIndex
+
+
+class DirectTesseractTests(unittest.TestCase):
+    def test_pixmap_to_pgm_wraps_grayscale_samples_and_strips_row_padding(self) -> None:
+        pix = SimpleNamespace(n=1, width=2, height=2, stride=3, samples=b"ab_cd_")
+
+        self.assertEqual(script.pixmap_to_pgm(pix), b"P5\n2 2\n255\nabcd")
+        with self.assertRaises(script.TextExtractionError):
+            script.pixmap_to_pgm(SimpleNamespace(n=3, width=1, height=1, samples=b"rgb"))
+
+    def test_tesseract_backend_streams_grayscale_render_over_stdin(self) -> None:
+        pix = SimpleNamespace(n=1, width=1, height=1, stride=1, samples=b"\x80")
+        page = SimpleNamespace(get_pixmap=Mock(return_value=pix))
+        completed = subprocess.CompletedProcess([], 0, stdout=b"page text\n", stderr=b"")
+        with (
+            patch.object(script, "fitz", SimpleNamespace(csGRAY="gray")),
+            patch.object(script, "find_tesseract", return_value="/usr/bin/tesseract"),
+            patch.object(ocr_pool.subprocess, "run", return_value=completed) as run,
+            patch.object(script, "pixmap_to_image") as pixmap_to_image,
+        ):
+            text = script.ocr_page(page, 200, language="eng", config="--psm 6", backend=script.OCR_BACKEND_TESSERACT)
+
+        self.assertEqual(text, "page text\n")
+        pixmap_to_image.assert_not_called()
+        self.assertEqual(page.get_pixmap.call_args.kwargs, {"dpi": 200, "colorspace": "gray", "alpha": False})
+        self.assertEqual(
+            run.call_args.args[0],
+            ["/usr/bin/tesseract", "stdin", "stdout", "--dpi", "200", "-l", "eng", "--psm", "6"],
+        )
+        self.assertEqual(run.call_args.kwargs["input"], b"P5\n1 1\n255\n\x80")
+
+    def test_tesseract_failures_raise_extraction_errors(self) -> None:
+        failed = subprocess.CompletedProcess([], 1, stdout=b"", stderr=b"Failed loading language 'xx'")
+        with (
+            patch.object(script, "find_tesseract", return_value="tesseract"),
+            patch.object(ocr_pool.subprocess, "run", return_value=failed),
+        ):
+            with self.assertRaisesRegex(script.TextExtractionError, "Failed loading language"):
+                script.run_tesseract(b"P5", dpi=300, language="xx", config="")
+        with patch.object(script, "find_tesseract", return_value=None):
+            with self.assertRaises(script.TextExtractionError):
+                script.run_tesseract(b"P5", dpi=300, language=None, config="")
+
+    def test_auto_backend_prefers_tesseract_on_path(self) -> None:
+        with patch.object(script, "find_tesseract", return_value="/usr/bin/tesseract"):
+            self.assertEqual(script.resolve_ocr_backend("auto"), script.OCR_BACKEND_TESSERACT)
+        with patch.object(script, "find_tesseract", return_value=None):
+            self.assertEqual(script.resolve_ocr_backend("auto"), script.OCR_BACKEND_PYTESSERACT)
+            self.assertFalse(script.ocr_backend_available(script.OCR_BACKEND_TESSERACT))
+        self.assertEqual(script.resolve_ocr_backend("pytesseract"), script.OCR_BACKEND_PYTESSERACT)
+
+
+class AdaptiveOcrTests(unittest.TestCase):
+    @staticmethod
+    def scanned_page() -> SimpleNamespace:
+        return SimpleNamespace(
+            rect=SimpleNamespace(x0=0.0, y0=0.0, x1=612.0, y1=792.0, width=612.0, height=792.0),
+            get_fonts=lambda: [],
+            get_image_info=lambda: [{"bbox": (0.0, 0.0, 612.0, 792.0), "width": 1275, "height": 1650}],
+        )
+
+    def test_scanned_pages_are_ocred_at_their_native_resolution(self) -> None:
+        with (
+            patch.object(script, "ocr_backend_available", return_value=True),
+            patch.object(script, "run_page_ocr", return_value=("scan", False)) as run_page_ocr,
+        ):
+            adaptive = script.extract_page(self.scanned_page(), 1, use_ocr=True, ocr=script.OcrSettings(dpi=300))
+            fixed = script.extract_page(
+                self.scanned_page(), 2, use_ocr=True, ocr=script.OcrSettings(dpi=300, fixed_dpi=True)
+            )
+
+        self.assertEqual([call.args[1].dpi for call in run_page_ocr.call_args_list], [150, 300])
+        self.assertEqual((adaptive.status, adaptive.ocr_dpi, fixed.ocr_dpi), (script.PAGE_OCR, 150, 300))
+
+    def test_garbled_text_layer_is_kept_with_a_warning_when_ocr_is_unavailable(self) -> None:
+        page = SimpleNamespace(get_fonts=lambda: [("font",)], get_text=lambda _kind: "\ufffd" * 40)
+        with patch.object(script, "ocr_backend_available", return_value=False):
+            result = script.extract_page(page, 1, use_ocr=True, ocr=script.OcrSettings())
+        logger = Mock()
+
+        script.log_page_result(result, 1, logger)
+
+        self.assertEqual((result.status, result.text, result.level), (script.PAGE_TEXT, "\ufffd" * 40, logging.WARNING))
+        self.assertIn("garbled", logger.log.call_args.args[3])
+
+
+class JsonlOutputTests(unittest.TestCase):
+    def test_jsonl_output_streams_one_record_per_page_with_blocks_and_ocr_use(self) -> None:
+        blocks = [(72.0, 60.123, 300.0, 75.0, "Heading\n", 0, 0), (0, 0, 10, 10, "", 1, 1)]
+        text_page = SimpleNamespace(
+            rect=SimpleNamespace(width=595.0, height=842.0),
+            get_fonts=lambda: [("font",)],
+            get_text=lambda kind: blocks if kind == "blocks" else "Heading\n",
+            get_image_info=lambda: [],
+        )
+        pages = [text_page, AdaptiveOcrTests.scanned_page()]
+
+        def load_page(index: int) -> SimpleNamespace:
+            if index == 2:
+                raise RuntimeError("broken page")
+            return pages[index]
+
+        doc = SimpleNamespace(page_count=3, load_page=load_page)
+        with (
+            TemporaryDirectory() as temp_dir,
+            patch.object(script, "ocr_backend_available", return_value=True),
+            patch.object(script, "run_page_ocr", return_value=("scanned text", False)),
+        ):
+            output = Path(temp_dir) / "out.jsonl"
+            summary = script.extract_text_from_pdf(
+                doc, output, overwrite=False, use_ocr=True, ocr_dpi=300, logger=Mock(), output_format="jsonl"
+            )
+            records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual((summary.processed_pages, summary.ocr_pages, summary.failed_pages), (2, 1, 1))
+        self.assertEqual(
+            [(record["page"], record["status"], record["ocr"]) for record in records],
+            [
+                (1, "text", False),
+                (2, "ocr", True),
+                (3, "failed", False),
+            ],
+        )
+        self.assertEqual(records[0]["blocks"], [{"bbox": [72.0, 60.12, 300.0, 75.0], "text": "Heading"}])
+        self.assertEqual((records[1]["text"], records[1]["blocks"], records[1]["ocr_dpi"]), ("scanned text", [], 150))
+        self.assertEqual((records[1]["width"], records[2]["error"]), (612.0, "broken page"))
+        self.assertTrue(all(record["seconds"] >= 0 for record in records))
+
+
+class PageParallelTests(unittest.TestCase):
+    def test_pdf_extract_text_writes_parallel_page_ranges_in_order(self) -> None:
+        def load_page(index: int) -> object:
+            if index == 5:
+                raise RuntimeError("bad page")
+            return SimpleNamespace(get_text=lambda _kind: f"page {index + 1}")
+
+        doc = SimpleNamespace(page_count=9, load_page=load_page)
+        with TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "out.txt"
+            with (
+                patch.object(script, "open_pdf", return_value=doc) as open_pdf,
+                patch.dict(pdf_text._worker_documents, clear=True),
+                patch.object(
+                    script, "BatchRunner", lambda **kwargs: batch.BatchRunner(**{**kwargs, "backend": "thread"})
+                ),
+            ):
+                summary = script.extract_text_from_pdf(
+                    doc,
+                    output,
+                    overwrite=False,
+                    use_ocr=False,
+                    ocr_dpi=72,
+                    logger=Mock(),
+                    jobs=3,
+                    pdf_path=Path("doc.pdf"),
+                )
+            lines = output.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(lines, [f"page {number}" for number in (1, 2, 3, 4, 5, 7, 8, 9)])
+        self.assertEqual((summary.processed_pages, summary.failed_pages), (8, 1))
+        self.assertEqual(open_pdf.call_count, 1)
+        self.assertEqual(script.page_ranges(100, 2), [(start, start + 12) for start in range(0, 96, 12)] + [(96, 100)])
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_pages_with_text_are_spooled_for_the_index_as_they_are_written(self) -> None:
+        texts = ["scanned invoice\n", "   \n", "invoice total\n"]
+        doc = SimpleNamespace(
+            page_count=3, load_page=lambda index: SimpleNamespace(get_text=lambda _kind: texts[index])
+        )
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            spool = PageSpool.create()
+            try:
+                script.extract_text_from_pdf(
+                    doc,
+                    folder / "out.txt",
+                    overwrite=False,
+                    use_ocr=False,
+                    ocr_dpi=72,
+                    logger=Mock(),
+                    pdf_path=folder / "doc.pdf",
+                    index_pages=spool,
+                )
+                with TextIndex.open(folder / "pages.sqlite") as index:
+                    index.replace_document(folder / "doc.pdf", spool, page_count=doc.page_count)
+                    hits = [hit.page_number for hit in index.search("invoice")]
+            finally:
+                spool.discard()
+
+        self.assertEqual(sorted(hits), [1, 3])
+        self.assertEqual(spool.pages, 2)
+        self.assertIn("--index", script.build_parser().format_help())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_pdf_render_jpeg as script
+
+
+@unittest.skipIf(script.fitz is None, "PyMuPDF is required for PDF render tests.")
+class PdfRenderTests(unittest.TestCase):
+    def test_parallel_render_matches_serial_render_and_skips_existing_pages(self) -> None:
+        assert script.fitz is not None
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            pdf_path = folder / "doc.pdf"
+            doc = script.fitz.open()
+            for number in range(1, 6):
+                doc.new_page(width=144, height=144).insert_text((20, 72), f"page {number}")
+            doc.save(str(pdf_path))
+            doc.close()
+            serial_dir, parallel_dir = folder / "serial", folder / "parallel"
+            serial_dir.mkdir()
+            parallel_dir.mkdir()
+            (parallel_dir / "page_2.jpg").write_bytes(b"existing")
+
+            doc = script.open_pdf(pdf_path, "")
+            try:
+                serial = script.convert_pdf_to_images(doc, serial_dir, 72, 80, overwrite=False)
+            finally:
+                doc.close()
+            with patch.object(script, "SUBSETS_PER_JOB", 1):
+                parallel = script.convert_pdf_to_images_parallel(
+                    pdf_path, "", 5, parallel_dir, 72, 80, overwrite=False, jobs=2
+                )
+
+            self.assertEqual((serial.saved, serial.skipped, serial.failed), (5, 0, 0))
+            self.assertEqual((parallel.saved, parallel.skipped, parallel.failed), (4, 1, 0))
+            self.assertEqual((parallel_dir / "page_2.jpg").read_bytes(), b"existing")
+            for name in ("page_1.jpg", "page_3.jpg", "page_5.jpg"):
+                self.assertEqual((parallel_dir / name).read_bytes(), (serial_dir / name).read_bytes())
+
+    def test_variants_render_once_and_write_each_size_and_format(self) -> None:
+        assert script.fitz is not None
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            doc = script.fitz.open()
+            doc.new_page(width=144, height=72).insert_text((10, 40), "variants")
+            variants = [script.parse_variant(value) for value in ("144:png", "72:jpg:80", "36:png")]
+            (folder / "72dpi_jpeg").mkdir()
+            (folder / "72dpi_jpeg" / "page_1.jpg").write_bytes(b"existing")
+
+            with patch.object(doc, "load_page", wraps=doc.load_page) as load_page:
+                summary = script.convert_pdf_to_images(doc, folder, 300, 95, False, variants=variants)
+            sizes = {
+                name: script.fitz.Pixmap(str(folder / name)).width
+                for name in ("144dpi_png/page_1.png", "36dpi_png/page_1.png")
+            }
+            doc.close()
+
+        self.assertEqual((summary.saved, summary.skipped, summary.failed), (2, 1, 0))
+        self.assertEqual(load_page.call_count, 1)
+        self.assertEqual(sizes, {"144dpi_png/page_1.png": 288, "36dpi_png/page_1.png": 72})
+
+    def test_pages_over_the_memory_budget_stream_png_bands(self) -> None:
+        assert script.fitz is not None
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            doc = script.fitz.open()
+            page = doc.new_page(width=1000, height=800)
+            page.insert_text((20, 60), "banded render", fontsize=24)
+            page.set_rotation(90)
+            variants = [script.parse_variant(value) for value in ("150:png", "150:jpeg")]
+
+            stderr = io.StringIO()
+            with self.assertLogs(level="ERROR"), contextlib.redirect_stderr(stderr):
+                summary = script.convert_pdf_to_images(
+                    doc, folder, 72, 95, False, variants=variants, memory_budget_mb=1
+                )
+            full = doc.load_page(0).get_pixmap(matrix=script.fitz.Matrix(150 / 72, 150 / 72), alpha=False)
+            banded = script.fitz.Pixmap(str(folder / "150dpi_png" / "page_1.png"))
+            rows_per_band = script.BYTES_PER_MB // (full.width * 3)
+            doc.close()
+
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertLess(rows_per_band, full.height)
+        self.assertEqual((summary.saved, summary.failed), (1, 1))
+        self.assertEqual((banded.width, banded.height), (full.width, full.height))
+        self.assertEqual(banded.samples, full.samples)
+
+    def test_invalid_variants_are_usage_errors(self) -> None:
+        self.assertEqual(script.parse_variant("72:WebP"), script.RenderVariant(72, "webp", 95, "72dpi_webp"))
+        for value in ("72", "72:gif", "0:png", "x:png", "72:jpeg:101"):
+            with self.subTest(value=value), self.assertRaises(argparse.ArgumentTypeError):
+                script.variant_argument(value)
+
+    def test_ctrl_c_during_parallel_render_exits_with_130(self) -> None:
+        assert script.fitz is not None
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            pdf_path = folder / "doc.pdf"
+            doc = script.fitz.open()
+            doc.new_page(width=144, height=144)
+            doc.save(str(pdf_path))
+            doc.close()
+            argv = ["pyt-pdf-render-jpeg", "--jobs", "2", "--output-folder", str(folder / "out"), str(pdf_path)]
+            with (
+                patch("sys.argv", argv),
+                patch.object(script, "convert_pdf_to_images_parallel", side_effect=KeyboardInterrupt),
+                contextlib.redirect_stderr(io.StringIO()) as stderr,
+            ):
+                code = script.main()
+
+        self.assertEqual(code, 130)
+        self.assertIn("Interrupted by user.", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import io
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text as script
+from pytransformer.core import pdf_text
+from pytransformer.core.common import ScriptError
+
+
+def fake_fitz(*texts: str, password: str | None = None) -> SimpleNamespace:
+    def load_page(index: int) -> SimpleNamespace:
+        return SimpleNamespace(get_text=Mock(return_value=texts[index]))
+
+    doc = SimpleNamespace(
+        page_count=len(texts),
+        needs_pass=password is not None,
+        load_page=Mock(side_effect=load_page),
+        authenticate=lambda value: int(value == password),
+        close=Mock(),
+    )
+    return SimpleNamespace(open=Mock(return_value=doc), doc=doc)
+
+
+class EngineSelectionTests(unittest.TestCase):
+    def test_auto_prefers_pymupdf_and_explicit_pymupdf_requires_it(self) -> None:
+        with patch.object(pdf_text, "load_pymupdf", return_value=True):
+            self.assertEqual(pdf_text.resolve_text_engine("auto"), pdf_text.ENGINE_PYMUPDF)
+            self.assertEqual(pdf_text.resolve_text_engine("pypdf"), pdf_text.ENGINE_PYPDF)
+        with patch.object(pdf_text, "load_pymupdf", return_value=False):
+            self.assertEqual(pdf_text.resolve_text_engine("auto"), pdf_text.ENGINE_PYPDF)
+            with self.assertRaisesRegex(ScriptError, "PyMuPDF is required"):
+                pdf_text.resolve_text_engine("pymupdf")
+
+    @unittest.skipUnless(pdf_text.load_pymupdf(), "PyMuPDF is required to check its text flags.")
+    def test_text_flags_are_pymupdf_plain_text_flags_with_ligatures_expanded(self) -> None:
+        fitz = pdf_text.fitz
+        assert fitz is not None
+        self.assertEqual(pdf_text.PYMUPDF_TEXT_FLAGS, fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES)
+
+
+class PymupdfTextReaderTests(unittest.TestCase):
+    def test_reader_loads_only_the_pages_that_are_written(self) -> None:
+        module = fake_fitz("one\n", "two\n", "three\n")
+        with (
+            patch.object(pdf_text, "load_pymupdf", return_value=True),
+            patch.object(pdf_text, "fitz", module),
+        ):
+            reader = script.open_pdf_reader(Path("doc.pdf"), "", pdf_text.ENGINE_PYMUPDF)
+            handle = io.StringIO()
+            script.write_page_text(script.iter_page_text(reader), handle)
+            script.close_resource(reader)
+
+        self.assertEqual(handle.getvalue(), "one\n\ntwo\n\nthree\n")
+        self.assertEqual([call.args[0] for call in module.doc.load_page.call_args_list], [0, 1, 2])
+        module.doc.close.assert_called_once_with()
+
+    def test_encrypted_documents_use_the_shared_password_handling(self) -> None:
+        module = fake_fitz("secret text", password="pw")
+        with (
+            patch.object(pdf_text, "load_pymupdf", return_value=True),
+            patch.object(pdf_text, "fitz", module),
+        ):
+            with self.assertRaisesRegex(ScriptError, "pass --password"):
+                script.open_pdf_reader(Path("doc.pdf"), "", pdf_text.ENGINE_PYMUPDF)
+            with self.assertRaisesRegex(ScriptError, "did not work"):
+                script.open_pdf_reader(Path("doc.pdf"), "wrong", pdf_text.ENGINE_PYMUPDF)
+            reader = script.open_pdf_reader(Path("doc.pdf"), "pw", pdf_text.ENGINE_PYMUPDF)
+
+        self.assertEqual(script.extract_text(reader), ("secret text\n", 0))
+
+
+class WorkerDocumentTests(unittest.TestCase):
+    def test_worker_document_is_opened_once_per_file_and_opener(self) -> None:
+        def open_document(pdf_path: Path, password: str) -> object:
+            return object()
+
+        opener = Mock(side_effect=open_document)
+        with patch.dict(pdf_text._worker_documents, clear=True):
+            first = pdf_text.worker_document(Path("a.pdf"), "", opener)
+            again = pdf_text.worker_document(Path("a.pdf"), "", opener)
+            other = pdf_text.worker_document(Path("b.pdf"), "", opener)
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertEqual(opener.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
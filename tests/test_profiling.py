@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from pytransformer.cli import pyt_pdf_extract_text as extract_script
+from pytransformer.cli import pyt_pdf_render_jpeg as render_script
+from pytransformer.core import profiling
+from pytransformer.core.common import ScriptError
+
+
+def page_timer(page_number: int, **stages: float) -> profiling.PageTimer:
+    return profiling.PageTimer(page_number, dict(stages))
+
+
+class ProfileReportTests(unittest.TestCase):
+    def test_report_writes_csv_and_json_in_page_order_and_ranks_slowest_pages(self) -> None:
+        report = profiling.ProfileReport(("load", "render", "save"))
+        report.add(page_timer(2, load=0.5, save=2.0, custom=0.25))
+        report.add(page_timer(1, load=0.25, render=0.5))
+        report.add(page_timer(3, render=1.0))
+
+        with TemporaryDirectory() as temp_dir:
+            csv_path, json_path = Path(temp_dir) / "profile.csv", Path(temp_dir) / "profile.json"
+            report.write(csv_path)
+            report.write(json_path)
+            with csv_path.open(encoding="utf-8", newline="") as handle:
+                rows = list(csv.reader(handle))
+            document = json.loads(json_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(rows[0], ["page", "total", "dominant_stage", "load", "render", "save", "custom"])
+        self.assertEqual(
+            [row[:3] for row in rows[1:]],
+            [["1", "0.750000", "render"], ["2", "2.750000", "save"], ["3", "1.000000", "render"]],
+        )
+        self.assertEqual(document["stage_totals"], {"load": 0.75, "render": 1.5, "save": 2.0, "custom": 0.25})
+        self.assertEqual(document["pages"][1]["stages"], {"load": 0.5, "save": 2.0, "custom": 0.25})
+        self.assertEqual([timer.page_number for timer in report.slowest(2)], [2, 3])
+
+    def test_timed_ignores_a_missing_timer_and_arguments_are_validated(self) -> None:
+        timer = profiling.PageTimer(1)
+        with profiling.timed(timer, "ocr"), profiling.timed(None, "ocr"):
+            pass
+        self.assertEqual(list(timer.stages), ["ocr"])
+
+        for profile, top in ((Path("timings.txt"), 10), (Path("timings.csv"), -1)):
+            with self.subTest(profile=profile, top=top), self.assertRaises(ScriptError):
+                profiling.validate_profile_args(argparse.Namespace(profile=profile, profile_top=top))
+
+
+@unittest.skipIf(extract_script.fitz is None, "PyMuPDF is required for profiling tests.")
+class CommandProfileTests(unittest.TestCase):
+    def test_extract_and_render_record_stage_timings_for_every_page(self) -> None:
+        assert extract_script.fitz is not None
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            doc = extract_script.fitz.open()
+            for number in range(1, 4):
+                doc.new_page(width=144, height=144).insert_text((20, 72), f"page {number}")
+            extract_profile = profiling.ProfileReport(extract_script.PROFILE_STAGES)
+            render_profile = profiling.ProfileReport(render_script.PROFILE_STAGES)
+            variants = [render_script.parse_variant(value) for value in ("72:png", "36:jpeg")]
+
+            extract_script.extract_text_from_pdf(
+                doc,
+                folder / "out.jsonl",
+                overwrite=False,
+                use_ocr=False,
+                ocr_dpi=300,
+                logger=Mock(),
+                output_format="jsonl",
+                profile=extract_profile,
+            )
+            render_script.convert_pdf_to_images(doc, folder, 72, 95, False, variants=variants, profile=render_profile)
+            doc.close()
+
+        self.assertEqual([timer.page_number for timer in extract_profile.pages], [1, 2, 3])
+        self.assertEqual(extract_profile.columns(), ["load", "text", "layout", "write"])
+        self.assertEqual([timer.page_number for timer in render_profile.pages], [1, 2, 3])
+        self.assertEqual(render_profile.columns(), ["load", "render", "scale", "save"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,7 @@ CLI_DIR = SRC / "pytransformer" / "cli"
 
 sys.path.insert(0, str(SRC))
 
-from pytransformer.core import common, jpeg_metadata
+from pytransformer.core import common, jpeg_metadata, pdf_text
 
 COMMAND_MODULES = sorted(path.stem for path in CLI_DIR.glob("*.py") if path.name != "__init__.py")
 CONSOLE_COMMANDS = [module_name.replace("_", "-") for module_name in COMMAND_MODULES]
@@ -737,7 +737,7 @@ class StandardLibraryScriptTests(unittest.TestCase):
 
             (folder / "video.txt").unlink()
 
-            def fail_transcription(_path: Path, *, language: str) -> str:
+            def fail_transcription(_path: Path, *, language: str, **_kwargs: object) -> str:
                 raise common.ScriptError("transcription failed")
 
             with patch.object(script, "transcribe_mp4_to_text", side_effect=fail_transcription):
@@ -789,7 +789,7 @@ class StandardLibraryScriptTests(unittest.TestCase):
 
             (folder / "doc.txt").unlink()
 
-            def fail_open_pdf(_path: Path, _password: str) -> NoReturn:
+            def fail_open_pdf(_path: Path, _password: str, _engine: str) -> NoReturn:
                 raise common.ScriptError("pdf failed")
 
             with patch.object(script, "open_pdf_reader", side_effect=fail_open_pdf):
@@ -814,7 +814,7 @@ class StandardLibraryScriptTests(unittest.TestCase):
 
             with (
                 patch.object(script, "open_pdf_reader", return_value=reader),
-                patch.object(script, "extract_text", return_value=("text", 0)),
+                patch.object(pdf_text, "iter_page_text", return_value=iter(["text"])),
             ):
                 summary = script.process_folder(
                     folder,
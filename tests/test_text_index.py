@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2026 Paul Tocatlian
+
+from __future__ import annotations
+
+import pickle
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pytransformer.cli import pyt_pdf_extract_selectable_text_batch as script
+from pytransformer.core.common import ScriptError
+from pytransformer.core.text_index import TextIndex, quote_query
+
+
+def fake_reader(*texts: str) -> SimpleNamespace:
+    return SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda text=text: text) for text in texts])
+
+
+class TextIndexTests(unittest.TestCase):
+    def test_replacing_a_document_drops_its_old_pages_and_search_reports_page_numbers(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            pdf_path = Path(temp_dir) / "report.pdf"
+            with TextIndex.open(Path(temp_dir) / "pages.sqlite") as index:
+                index.replace_document(pdf_path, [(1, "Quarterly revenue grew"), (3, "Résumé of costs")], page_count=3)
+                self.assertEqual([hit.page_number for hit in index.search("resume")], [3])
+                index.replace_document(pdf_path, [(2, "Annual revenue")], page_count=2)
+
+                hits = index.search("REVENUE")
+                self.assertEqual(index.search("quarterly"), [])
+                self.assertEqual(index.search('"annual rev"*', raw=True)[0].page_number, 2)
+                self.assertEqual(index.remove_missing(Path(temp_dir)), 1)
+                self.assertEqual(index.document_count(), 0)
+
+        self.assertEqual(
+            [(hit.path, hit.page_number, hit.snippet) for hit in hits], [(str(pdf_path), 2, "Annual [revenue]")]
+        )
+
+    def test_plain_queries_are_quoted_and_raw_syntax_errors_are_reported(self) -> None:
+        self.assertEqual(quote_query('net "income" OR'), '"net" """income""" "OR"')
+        with TemporaryDirectory() as temp_dir:
+            with self.assertRaisesRegex(ScriptError, "not found"):
+                TextIndex.open(Path(temp_dir) / "missing.sqlite", create=False)
+            with TextIndex.open(Path(temp_dir) / "pages.sqlite") as index:
+                with self.assertRaisesRegex(ScriptError, "Invalid search query"):
+                    index.search('"unterminated', raw=True)
+                with self.assertRaisesRegex(ScriptError, "empty"):
+                    index.search("   ")
+
+    def test_batch_indexes_written_pdfs_with_page_numbers(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            (folder / "a.pdf").write_bytes(b"a")
+            (folder / "b.pdf").write_bytes(b"b")
+            readers = {"a.pdf": fake_reader("alpha page", "", "shared words"), "b.pdf": fake_reader("shared beta")}
+
+            with (
+                TextIndex.open(folder / "pages.sqlite") as index,
+                patch.object(script, "open_pdf_reader", side_effect=lambda path, *_args: readers[path.name]),
+            ):
+                summary = script.process_folder(
+                    folder, output_folder=None, overwrite=False, include_hidden=False, password="", jobs=1, index=index
+                )
+                hits = sorted((Path(hit.path).name, hit.page_number) for hit in index.search("shared"))
+
+            self.assertEqual(summary.written, 2)
+            self.assertEqual(hits, [("a.pdf", 3), ("b.pdf", 1)])
+            self.assertEqual((folder / "a.txt").read_text(encoding="utf-8"), "alpha page\n\n\n\nshared words\n")
+
+    def test_batch_workers_hand_indexed_pages_back_through_a_spool_file(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            pdf_path = Path(temp_dir) / "big.pdf"
+            pdf_path.write_bytes(b"pdf")
+            with patch.object(script, "open_pdf_reader", return_value=fake_reader("first page", "", "third page")):
+                outcome = script.process_pdf(
+                    pdf_path,
+                    output_folder=None,
+                    overwrite=False,
+                    password="",
+                    index_path=pdf_path.with_suffix(".sqlite"),
+                )
+            payload = pickle.dumps(outcome)
+            spool = outcome.index_spool
+            assert spool is not None
+            pages = list(pickle.loads(payload).index_spool)
+            spool.discard()
+
+        self.assertNotIn(b"third page", payload)
+        self.assertEqual(pages, [(1, "first page"), (3, "third page")])
+        self.assertEqual((spool.pages, spool.path.exists()), (2, False))
+
+    def test_batch_indexes_existing_outputs_the_index_does_not_have_yet(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            folder = Path(temp_dir)
+            for name in ("a", "b"):
+                (folder / f"{name}.pdf").write_bytes(name.encode())
+                (folder / f"{name}.txt").write_text("earlier text\n", encoding="utf-8")
+            opened: list[str] = []
+
+            def open_reader(pdf_path: Path, *_args: object) -> SimpleNamespace:
+                opened.append(pdf_path.name)
+                return fake_reader(f"{pdf_path.stem} page", "shared page")
+
+            def run(index: TextIndex) -> script.PdfBatchSummary:
+                with patch.object(script, "open_pdf_reader", side_effect=open_reader):
+                    return script.process_folder(
+                        folder, output_folder=None, overwrite=False, include_hidden=False, password="", index=index
+                    )
+
+            with TextIndex.open(folder / "pages.sqlite") as index:
+                first = run(index)
+                second = run(index)
+                hits = sorted((Path(hit.path).name, hit.page_number) for hit in index.search("shared"))
+            output = (folder / "a.txt").read_text(encoding="utf-8")
+
+        self.assertEqual(opened, ["a.pdf", "b.pdf"])
+        self.assertEqual((first.skipped, first.written, second.skipped), (2, 0, 2))
+        self.assertEqual(hits, [("a.pdf", 2), ("b.pdf", 2)])
+        self.assertEqual(output, "earlier text\n")
+
+
+if __name__ == "__main__":
+    unittest.main()